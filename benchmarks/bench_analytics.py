@@ -0,0 +1,82 @@
+"""MRR/отток/когорты на NumPy против цикла monthly_price_for по подпискам.
+
+Колонки генерируются сразу массивами (10M объектов Subscription не нужны);
+Python-цикл меряется на выборке --python-sample и экстраполируется.
+
+PYTHONPATH=src python benchmarks/bench_analytics.py --subs 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from billing_core.application.analytics import RevenueAnalytics
+from billing_core.application.repositories import SUBSCRIPTION_STATUSES
+from billing_core.domain.catalog import default_snapshot
+from billing_core.domain.subscription import SubscriptionStatus
+
+PLANS = ("FREE", "PRO", "TEAM")
+AS_OF = date(2026, 12, 31)
+
+
+def synthetic(n: int, seed: int = 42) -> RevenueAnalytics:
+    rnd = np.random.default_rng(seed)
+    start = date(2024, 1, 1).toordinal() + rnd.integers(0, 1_000, n)
+    canceled = np.where(rnd.random(n) < 0.2, start + rnd.integers(1, 400, n), 0)
+    status = np.where(canceled > 0, SUBSCRIPTION_STATUSES.index(SubscriptionStatus.CANCELED), 0)
+    status = np.where(status == 0, SUBSCRIPTION_STATUSES.index(SubscriptionStatus.ACTIVE), status)
+    return RevenueAnalytics(
+        plan_codes=PLANS,
+        plan=rnd.choice(3, n, p=(0.5, 0.3, 0.2)),
+        seats=rnd.integers(1, 50, n),
+        status=status.astype(np.uint8),
+        start=start,
+        canceled=canceled,
+    )
+
+
+def python_mrr(analytics: RevenueAnalytics, n: int) -> float:
+    """Секунд на n подписок при подсчёте по одной, как раньше."""
+    snap = default_snapshot()
+    plan, seats, status = analytics.plan[:n].tolist(), analytics.seats[:n].tolist(), analytics.status[:n].tolist()
+    active = SUBSCRIPTION_STATUSES.index(SubscriptionStatus.ACTIVE)
+    t0 = time.perf_counter()
+    totals: dict[str, object] = {}
+    for p, s, st in zip(plan, seats, status, strict=True):
+        if st != active:
+            continue
+        price = snap.price(PLANS[p]).monthly_price_for(seats=s)
+        prev = totals.get(PLANS[p])
+        totals[PLANS[p]] = price if prev is None else prev + price
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--subs", type=int, default=10_000_000)
+    ap.add_argument("--python-sample", type=int, default=200_000)
+    args = ap.parse_args()
+
+    analytics = synthetic(args.subs)
+    snap = default_snapshot()
+
+    for name, fn in (
+        ("mrr", lambda: analytics.mrr(snap, as_of=AS_OF)),
+        ("churn", lambda: analytics.churn(start=date(2025, 1, 1), end=date(2025, 2, 1))),
+        ("cohorts", lambda: analytics.cohorts(as_of=AS_OF, months=24)),
+    ):
+        t0 = time.perf_counter()
+        fn()
+        print(f"{name:<8} {time.perf_counter() - t0:>8.3f} s  ({args.subs:,} subs)")
+
+    sample = min(args.python_sample, args.subs)
+    per_sub = python_mrr(analytics, sample) / sample
+    print(f"python   {per_sub * args.subs:>8.3f} s  (extrapolated from {sample:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Байт на подписку и на инвойс: tracemalloc (факт) против оценки /debug/memory.
+
+Отдельно - только хранилище подписок: dict объектов против колоночного.
+
+PYTHONPATH=src python benchmarks/bench_memory.py --subs 100000 -o memory.json
+PYTHONPATH=src python benchmarks/bench_memory.py --subs 1000000 --customers 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+from billing_core.api.deps import build_service
+from billing_core.domain.subscription import Subscription
+from billing_core.infrastructure.columnar_repos import ColumnarSubscriptionRepo
+from billing_core.infrastructure.memory_repos import InMemorySubscriptionRepo
+
+
+def traced_store_bytes(store_cls: type, subs: int, customers: int) -> float:
+    """Байт на подписку в хранилище; сами Subscription создаются по одной и для колоночного не живут."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    repo = store_cls()
+    for i in range(subs):
+        repo.save(Subscription.create(customer_id=f"cust_{i % customers}", plan_code="PRO", start_date=date(2026, 1, 1)))
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del repo
+    return traced / subs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--subs", type=int, default=100_000)
+    ap.add_argument("--customers", type=int, help="число различных customer_id (по умолчанию = --subs)")
+    ap.add_argument("-o", "--output")
+    args = ap.parse_args()
+
+    svc = build_service()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    invoices = 0
+    for i in range(args.subs):
+        _, inv = svc.create_subscription(customer_id=f"cust_{i}", plan_code="PRO", start_date=date(2026, 1, 1))
+        invoices += inv is not None
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    (sub_stats,) = svc.subs.memory_usage()
+    (inv_stats,) = svc.invoices.memory_usage()
+    result = {
+        "subscriptions": args.subs,
+        "invoices": invoices,
+        "traced_bytes_per_subscription_with_invoice": traced / args.subs,
+        "estimated_bytes_per_subscription": sub_stats.total_bytes / args.subs,
+        "estimated_bytes_per_invoice": inv_stats.total_bytes / max(invoices, 1),
+    }
+    del svc
+    customers = args.customers or args.subs
+    dict_store = traced_store_bytes(InMemorySubscriptionRepo, args.subs, customers)
+    columnar_store = traced_store_bytes(ColumnarSubscriptionRepo, args.subs, customers)
+    result |= {
+        "store_bytes_per_subscription_dict": dict_store,
+        "store_bytes_per_subscription_columnar": columnar_store,
+        "store_reduction_x": dict_store / columnar_store,
+    }
+    for key, value in result.items():
+        print(f"{key:<45} {value:>12,.1f}" if isinstance(value, float) else f"{key:<45} {value:>12,}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
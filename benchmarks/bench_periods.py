@@ -0,0 +1,58 @@
+"""Границы месячных периодов: кэшированный калькулятор против календарной арифметики на каждый вызов.
+
+PYTHONPATH=src python benchmarks/bench_periods.py --calls 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from calendar import monthrange
+from datetime import date
+
+from billing_core.domain.periods import BillingCycle, anchor_day_for, month_period, period_end
+
+
+def _uncached_end(start: date, anchor_day: int) -> date:
+    year, month = (start.year + 1, 1) if start.month == 12 else (start.year, start.month + 1)
+    return date(year, month, min(anchor_day, monthrange(year, month)[1]))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=10_000_000)
+    ap.add_argument("--pool", type=int, default=100_000, help="различных (start, anchor) в наборе")
+    args = ap.parse_args()
+
+    rnd = random.Random(42)
+    first = date(2020, 1, 1).toordinal()
+    pool: list[tuple[BillingCycle, date, int]] = []
+    for _ in range(args.pool):
+        cycle = rnd.choice((BillingCycle.CALENDAR_MONTH, BillingCycle.ANNIVERSARY))
+        start = date.fromordinal(first + rnd.randrange(3_650))
+        pool.append((cycle, start, anchor_day_for(cycle, start)))
+    size = len(pool)
+
+    t0 = time.perf_counter()
+    for i in range(args.calls):
+        _, start, anchor = pool[i % size]
+        _uncached_end(start, anchor)
+    uncached = time.perf_counter() - t0
+
+    month_period.cache_clear()
+    t0 = time.perf_counter()
+    for i in range(args.calls):
+        cycle, start, anchor = pool[i % size]
+        period_end(cycle, start=start, anchor_day=anchor)
+    cached = time.perf_counter() - t0
+
+    info = month_period.cache_info()
+    print(f"calls={args.calls:,} pool={size:,}")
+    print(f"uncached {args.calls / uncached:>12,.0f} periods/s")
+    print(f"cached   {args.calls / cached:>12,.0f} periods/s  (x{uncached / cached:.2f})")
+    print(f"cache    size={info.currsize:,} hits={info.hits:,} misses={info.misses:,}")
+
+
+if __name__ == "__main__":
+    main()
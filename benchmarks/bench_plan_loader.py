@@ -0,0 +1,57 @@
+"""Загрузка большого каталога планов из файла.
+
+PYTHONPATH=src python benchmarks/bench_plan_loader.py --plans 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from billing_core.infrastructure.memory_repos import InMemoryPlanRepo
+from billing_core.infrastructure.plan_loader import load_plan_catalog
+
+
+def write_catalog(path: Path, n: int) -> None:
+    with path.open("w", encoding="utf-8") as fh:
+        for i in range(n):
+            match i % 4:
+                case 0:
+                    fh.write(f"free;FREE_{i};Free {i};EUR\n")
+                case 1:
+                    fh.write(f"flat;PRO_{i};Pro {i};USD;{20 + i % 50}\n")
+                case 2:
+                    fh.write(f"per_seat;TEAM_{i};Team {i};GBP;10;{5 + i % 7}\n")
+                case _:
+                    row = {
+                        "type": "flat",
+                        "code": f"P_{i}",
+                        "name": f"Partner {i}",
+                        "currency": "EUR",
+                        "monthly_price": f"{i % 90}.99",
+                    }
+                    fh.write(json.dumps(row) + "\n")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plans", type=int, default=100_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "plans.txt"
+        write_catalog(path, args.plans)
+
+        repo = InMemoryPlanRepo()
+        t0 = time.perf_counter()
+        loaded = load_plan_catalog(path, repo)
+        elapsed = time.perf_counter() - t0
+
+    print(f"loaded {loaded} plans in {elapsed:.3f}s ({loaded / elapsed:,.0f} plans/s)")
+
+
+if __name__ == "__main__":
+    main()
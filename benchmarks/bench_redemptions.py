@@ -0,0 +1,63 @@
+"""Память и скорость проверок погашений: RedemptionStore против множества кортежей (code, customer_id).
+
+Сценарий - массовые одноразовые коды: каждый код гасится ровно один раз.
+
+PYTHONPATH=src python benchmarks/bench_redemptions.py --codes 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from billing_core.infrastructure.redemptions import RedemptionStore
+
+
+class TupleSetRedemptions:
+    """Прежнее хранение из InMemoryPromoRepo: set[(code, customer_id)]."""
+
+    def __init__(self) -> None:
+        self._used: set[tuple[str, str]] = set()
+
+    def redeem(self, *, code: str, customer_id: str, once_per_customer: bool, max_uses: int | None) -> bool:
+        self._used.add((code, customer_id))
+        return True
+
+    def has_redeemed(self, *, code: str, customer_id: str) -> bool:
+        return (code, customer_id) in self._used
+
+
+def measure(name: str, factory: Callable[[], object], codes: list[str], customers: list[str], probes: list[tuple[str, str]]):
+    gc.collect()
+    tracemalloc.start()
+    store = factory()
+    for code, customer_id in zip(codes, customers, strict=True):
+        store.redeem(code=code, customer_id=customer_id, once_per_customer=True, max_uses=1)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    hits = sum(store.has_redeemed(code=code, customer_id=customer_id) for code, customer_id in probes)
+    lookup = time.perf_counter() - t0
+    print(f"{name:<12} {used / len(codes):>7.1f} B/redemption   {len(probes):,} lookups {lookup:.3f}s  hits={hits:,}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--codes", type=int, default=200_000)
+    args = ap.parse_args()
+
+    # Строки создаются заранее: они общие с промокодами и подписками и в замер не входят.
+    codes = [f"MASS{i:08d}" for i in range(args.codes)]
+    customers = [f"cust_{i}" for i in range(args.codes)]
+    probes = [(codes[i], customers[i] if i % 2 else customers[i - 1]) for i in range(args.codes)]
+
+    measure("tuple set", TupleSetRedemptions, codes, customers, probes)
+    measure("store", RedemptionStore, codes, customers, probes)
+
+
+if __name__ == "__main__":
+    main()
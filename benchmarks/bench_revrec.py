@@ -0,0 +1,68 @@
+"""График признания выручки для миллионов оплаченных инвойсов: expand + запись .npz.
+
+Строки генерируются сразу колонками (объекты Invoice не создаются).
+
+PYTHONPATH=src python benchmarks/bench_revrec.py --invoices 2000000 --granularity monthly
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from array import array
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from billing_core.application.revrec import Granularity, RecognitionLines, RecognitionSchedule, expand
+
+
+def synthetic(n: int, seed: int = 42) -> RecognitionLines:
+    rnd = np.random.default_rng(seed)
+    start = date(2026, 1, 1).toordinal() + rnd.integers(0, 365, n)
+    length = rnd.choice((28, 30, 31, 365), n, p=(0.2, 0.4, 0.3, 0.1))
+    return RecognitionLines(
+        invoice_ids=bytearray(rnd.bytes(16 * n)),
+        invoice_customer=array("I", (np.arange(n, dtype=np.uint32) % 100_000).tobytes()),
+        invoice_currency=array("B", bytes(n)),
+        customers=[f"cust_{i}" for i in range(100_000)],
+        currencies=["EUR"],
+        invoice=array("I", np.arange(n, dtype=np.uint32).tobytes()),
+        start=array("i", start.astype(np.int32).tobytes()),
+        end=array("i", (start + length).astype(np.int32).tobytes()),
+        cents=array("q", rnd.integers(100, 100_000, n).tobytes()),
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--invoices", type=int, default=2_000_000)
+    ap.add_argument("--granularity", choices=[g.value for g in Granularity], default="monthly")
+    args = ap.parse_args()
+
+    lines = synthetic(args.invoices)
+    t0 = time.perf_counter()
+    schedule = expand(lines, Granularity(args.granularity))
+    expanded = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "revrec.npz"
+        t0 = time.perf_counter()
+        schedule.write(path)
+        written = time.perf_counter() - t0
+        size = path.stat().st_size
+        t0 = time.perf_counter()
+        RecognitionSchedule.read(path)
+        read = time.perf_counter() - t0
+
+    rows = len(schedule)
+    print(f"invoices={args.invoices:,} rows={rows:,} ({args.granularity})")
+    print(f"expand   {expanded:>7.3f} s  {rows / expanded:>14,.0f} rows/s")
+    print(f"write    {written:>7.3f} s  {size / 2**20:>10.1f} MiB  {size / rows:.1f} B/row")
+    print(f"read     {read:>7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
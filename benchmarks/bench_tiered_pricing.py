@@ -0,0 +1,36 @@
+"""Цена tiered/volume планов на больших количествах мест.
+
+PYTHONPATH=src python benchmarks/bench_tiered_pricing.py --calls 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from billing_core.domain.plans import Plan
+
+TIERS = ",".join(f"{(i + 1) * 100}:{50 - i}" for i in range(40)) + ",*:5"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200_000)
+    ap.add_argument("--max-seats", type=int, default=100_000)
+    args = ap.parse_args()
+
+    rnd = random.Random(42)
+    seats = [rnd.randint(1, args.max_seats) for _ in range(args.calls)]
+
+    for plan_type in ("tiered", "volume"):
+        plan = Plan.from_config(f"{plan_type};BIG;Big;EUR;{TIERS}")
+        t0 = time.perf_counter()
+        for n in seats:
+            plan.monthly_price_for(seats=n)
+        elapsed = time.perf_counter() - t0
+        print(f"{plan_type:<7} {args.calls / elapsed:>12,.0f} prices/s  (41 tiers, seats <= {args.max_seats:,})")
+
+
+if __name__ == "__main__":
+    main()
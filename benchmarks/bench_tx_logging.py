@@ -0,0 +1,52 @@
+"""Пропускная способность create_subscription при разных режимах логирования.
+
+PYTHONPATH=src python benchmarks/bench_tx_logging.py --ops 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from datetime import date
+
+from billing_core.api.deps import build_service
+from billing_core.api.log_config import configure_logging, shutdown_logging
+
+
+def _run(ops: int) -> float:
+    svc = build_service()
+    t0 = time.perf_counter()
+    for i in range(ops):
+        svc.create_subscription(customer_id=f"cust_{i}", plan_code="PRO", start_date=date(2026, 1, 1))
+    return ops / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ops", type=int, default=50_000)
+    args = ap.parse_args()
+
+    pkg = logging.getLogger("billing_core")
+    devnull = open(os.devnull, "w")  # noqa: SIM115
+
+    pkg.setLevel(logging.WARNING)
+    print(f"{'logging off':<28} {_run(args.ops):>10,.0f} ops/s")
+
+    sync = logging.StreamHandler(devnull)
+    pkg.setLevel(logging.INFO)
+    pkg.addHandler(sync)
+    print(f"{'sync text, every tx':<28} {_run(args.ops):>10,.0f} ops/s")
+    pkg.removeHandler(sync)
+
+    for every in (1, 100):
+        configure_logging("info", sample_every=every, queue_size=1_000_000, stream_handler=logging.StreamHandler(devnull))
+        print(f"{f'queue json, 1/{every} tx':<28} {_run(args.ops):>10,.0f} ops/s")
+        shutdown_logging()
+
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
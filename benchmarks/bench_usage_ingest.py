@@ -0,0 +1,45 @@
+"""Пропускная способность BillingService.ingest_usage.
+
+PYTHONPATH=src python benchmarks/bench_usage_ingest.py --events 1000000 --batch 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import UTC, date, datetime, timedelta
+
+from billing_core.api.deps import build_service
+from billing_core.domain.usage import UsageEvent
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--batch", type=int, default=1_000)
+    ap.add_argument("--subs", type=int, default=1_000)
+    args = ap.parse_args()
+
+    svc = build_service()
+    sub_ids = [
+        svc.create_subscription(customer_id=f"cust_{i}", plan_code="FREE", start_date=date(2026, 1, 1))[0].id
+        for i in range(args.subs)
+    ]
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+    events = [
+        UsageEvent(sub_ids[i % args.subs], "api_calls", 1, t0 + timedelta(minutes=i % 43_200), idempotency_key=f"ev-{i}")
+        for i in range(args.events)
+    ]
+    batches = [events[i : i + args.batch] for i in range(0, len(events), args.batch)]
+
+    start = time.perf_counter()
+    for batch in batches:
+        svc.ingest_usage(batch)
+    svc.usage.flush()
+    elapsed = time.perf_counter() - start
+
+    print(f"ingested {args.events:,} events in {elapsed:.2f}s ({args.events / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Бенчмарки домена и сервиса.
+
+Каждый кейс - фабрика: получает размер набора n, делает подготовку и
+возвращает функцию без аргументов, которая выполняет ровно n операций.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from billing_core.api.deps import build_service
+from billing_core.domain.money import Money
+from billing_core.domain.promo import PromoTemplate
+from billing_core.domain.proration import proration_line_items
+from billing_core.domain.subscription import computed_properties
+
+from . import datasets
+
+BenchFn = Callable[[], object]
+CASES: dict[str, Callable[[int], BenchFn]] = {}
+
+
+def case(name: str) -> Callable[[Callable[[int], BenchFn]], Callable[[int], BenchFn]]:
+    def _wrap(factory: Callable[[int], BenchFn]) -> Callable[[int], BenchFn]:
+        CASES[name] = factory
+        return factory
+
+    return _wrap
+
+
+@case("money.add")
+def money_add(n: int) -> BenchFn:
+    values = datasets.subtotals(n)
+
+    def run() -> object:
+        total = Money.of("0", "EUR")
+        for m in values:
+            total = total + m
+        return total
+
+    return run
+
+
+@case("money.of")
+def money_of(n: int) -> BenchFn:
+    raw = [str(m.amount) for m in datasets.subtotals(n)]
+
+    def run() -> object:
+        return [Money.of(a, "EUR") for a in raw]
+
+    return run
+
+
+@case("proration.line_items")
+def proration(n: int) -> BenchFn:
+    cases = datasets.proration_cases(n)
+
+    def run() -> object:
+        for c in cases:
+            proration_line_items(
+                old_monthly=c.old_monthly,
+                new_monthly=c.new_monthly,
+                period_start=c.period_start,
+                period_end=c.period_end,
+                change_date=c.change_date,
+            )
+
+    return run
+
+
+@case("invoice.total")
+def invoice_total(n: int) -> BenchFn:
+    invs = datasets.invoices(n)
+
+    def run() -> object:
+        return [inv.total for inv in invs]
+
+    return run
+
+
+@case("subscription.computed")
+def subscription_computed(n: int) -> BenchFn:
+    subs = datasets.subscriptions(n)
+
+    def run() -> object:
+        return [(s.is_active, s.days_left_in_period) for s in subs]
+
+    return run
+
+
+@case("subscription.computed_bulk")
+def subscription_computed_bulk(n: int) -> BenchFn:
+    subs = datasets.subscriptions(n)
+
+    def run() -> object:
+        return computed_properties(subs)
+
+    return run
+
+
+@case("receivables.aging")
+def receivables_aging(n: int) -> BenchFn:
+    ledger = datasets.receivables(n)
+    as_of = datasets.START + timedelta(days=180)
+
+    def run() -> object:
+        return ledger.aging(as_of=as_of)
+
+    return run
+
+
+@case("fx.convert")
+def fx_convert(n: int) -> BenchFn:
+    rates = datasets.fx_rates()
+    ops = datasets.fx_conversions(n)
+
+    def run() -> object:
+        for money, day in ops:
+            rates.convert(money, "EUR", on=day)
+
+    return run
+
+
+@case("promo.apply")
+def promo_apply(n: int) -> BenchFn:
+    promos = datasets.promos()
+    values = datasets.subtotals(n)
+
+    def run() -> object:
+        for i, m in enumerate(values):
+            promos[i % len(promos)].apply(subtotal=m)
+
+    return run
+
+
+@case("service.generate_promos")
+def generate_promos(n: int) -> BenchFn:
+    template = PromoTemplate(kind="percent", percent=10, prefix="BENCH-")
+
+    def run() -> object:
+        return build_service().generate_promos(template, count=n)
+
+    return run
+
+
+@case("promo.apply_many")
+def promo_apply_many(n: int) -> BenchFn:
+    discounts = [p.compile() for p in datasets.promos()]
+    values = datasets.subtotals(n)
+    groups = [values[k :: len(discounts)] for k in range(len(discounts))]
+
+    def run() -> object:
+        return [d.apply_many(g) for d, g in zip(discounts, groups, strict=True)]
+
+    return run
+
+
+@case("promotions.applicable")
+def promotions_applicable(n: int) -> BenchFn:
+    engine = datasets.promotion_engine(2_000)
+    days = [date(2026, 1, 1) + timedelta(days=i % 365) for i in range(n)]
+
+    def run() -> object:
+        for day in days:
+            engine.applicable(plan_code="PRO", currency="EUR", on=day)
+
+    return run
+
+
+@case("service.create_subscription")
+def create_subscription(n: int) -> BenchFn:
+    subs = datasets.subscriptions(n)
+
+    def run() -> object:
+        svc = build_service()
+        for s in subs:
+            svc.create_subscription(
+                customer_id=s.customer_id,
+                plan_code=s.plan_code,
+                start_date=s.start_date,
+                seats=s.seats,
+                trial_days=s.full_period_days if s.status.value == "trialing" else 0,
+            )
+
+    return run
+
+
+@case("service.upgrade_subscription")
+def upgrade_subscription(n: int) -> BenchFn:
+    subs = datasets.subscriptions(n)
+
+    def run() -> object:
+        svc = build_service()
+        ids = [
+            (svc.create_subscription(customer_id=s.customer_id, plan_code="PRO", start_date=s.start_date, seats=s.seats)[0], s)
+            for s in subs
+        ]
+        for sub, s in ids:
+            svc.upgrade_subscription(sub_id=sub.id, new_plan_code="TEAM", change_date=s.start_date + timedelta(days=10))
+
+    return run
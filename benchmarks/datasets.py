@@ -0,0 +1,145 @@
+"""Детерминированные наборы данных на основе дефолтных планов FREE/PRO/TEAM."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from billing_core.application.fx import FxRates
+from billing_core.application.promotions import PromotionEngine
+from billing_core.application.receivables import ReceivablesLedger
+from billing_core.domain.catalog import default_snapshot
+from billing_core.domain.invoice import Invoice, LineItem
+from billing_core.domain.money import Money
+from billing_core.domain.promo import PromoCode
+from billing_core.domain.promotions import Promotion
+from billing_core.domain.subscription import Subscription
+
+PLAN_MIX = (("FREE", 0.5), ("PRO", 0.3), ("TEAM", 0.2))
+START = date(2026, 1, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class ProrationCase:
+    old_monthly: Money
+    new_monthly: Money
+    period_start: date
+    period_end: date
+    change_date: date
+
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)
+
+
+def plan_codes(n: int, seed: int = 1) -> list[str]:
+    codes, weights = zip(*PLAN_MIX, strict=True)
+    return _rng(seed).choices(codes, weights=weights, k=n)
+
+
+def subscriptions(n: int, seed: int = 1) -> list[Subscription]:
+    rnd = _rng(seed)
+    out = []
+    for i, code in enumerate(plan_codes(n, seed)):
+        out.append(
+            Subscription.create(
+                customer_id=f"cust_{i}",
+                plan_code=code,
+                start_date=START + timedelta(days=rnd.randrange(365)),
+                trial_days=14 if rnd.random() < 0.1 else 0,
+                seats=rnd.randint(1, 50) if code == "TEAM" else 1,
+            )
+        )
+    return out
+
+
+def proration_cases(n: int, seed: int = 1) -> list[ProrationCase]:
+    snap = default_snapshot()
+    rnd = _rng(seed)
+    out = []
+    for sub in subscriptions(n, seed):
+        old = snap.monthly_price_for(sub.plan_code, seats=sub.seats)
+        new = snap.monthly_price_for("TEAM", seats=sub.seats + rnd.randint(0, 5))
+        change = sub.current_period_start + timedelta(days=rnd.randrange(sub.full_period_days + 1))
+        out.append(ProrationCase(old, new, sub.current_period_start, sub.current_period_end, change))
+    return out
+
+
+def invoices(n: int, *, items: int = 5, seed: int = 1) -> list[Invoice]:
+    rnd = _rng(seed)
+    out = []
+    for i in range(n):
+        inv = Invoice(customer_id=f"cust_{i}", period_start=START, period_end=START + timedelta(days=30), currency="EUR")
+        for j in range(items):
+            inv.add_line_item(LineItem(f"item {j}", Money.of(f"{rnd.randint(-2000, 9000) / 100:.2f}", "EUR")))
+        out.append(inv)
+    return out
+
+
+def receivables(n: int, *, customers: int = 1_000, seed: int = 1) -> ReceivablesLedger:
+    """n выставленных инвойсов с датами за последние 180 дней до START + 180."""
+    rnd = _rng(seed)
+    ledger = ReceivablesLedger()
+    for i in range(n):
+        inv = Invoice(
+            customer_id=f"cust_{i % customers}", period_start=START, period_end=START + timedelta(days=30), currency="EUR"
+        )
+        inv.add_line_item(LineItem("charge", Money.of(f"{rnd.randint(100, 9000) / 100:.2f}", "EUR")))
+        inv.issue(on=START + timedelta(days=rnd.randrange(180)))
+        ledger.add(inv)
+    return ledger
+
+
+def fx_rates(days: int = 3 * 365, seed: int = 1) -> FxRates:
+    """Дневные курсы USD/GBP к EUR за days дней от START."""
+    rnd = _rng(seed)
+    rows = []
+    for quote, rate in (("USD", 1.08), ("GBP", 0.85)):
+        for d in range(days):
+            rate *= 1 + rnd.uniform(-0.005, 0.005)
+            rows.append((START + timedelta(days=d), "EUR", quote, Decimal(f"{rate:.6f}")))
+    return FxRates.from_rows(rows)
+
+
+def fx_conversions(n: int, seed: int = 1) -> list[tuple[Money, date]]:
+    """Суммы USD/GBP на 60 дат: типичный отчёт, повторные (пара, дата) идут из LRU."""
+    rnd = _rng(seed)
+    return [
+        (Money.of(rnd.randint(100, 90_000), rnd.choice(("USD", "GBP"))), START + timedelta(days=rnd.randrange(60)))
+        for _ in range(n)
+    ]
+
+
+def subtotals(n: int, seed: int = 1) -> list[Money]:
+    snap = default_snapshot()
+    rnd = _rng(seed)
+    return [snap.monthly_price_for(code, seats=rnd.randint(1, 50)) for code in plan_codes(n, seed)]
+
+
+def promos() -> list[PromoCode]:
+    return [
+        PromoCode(code="P10", kind="percent", percent=10),
+        PromoCode(code="P25", kind="percent", percent=25),
+        PromoCode(code="F5", kind="fixed", fixed_discount=Money.of("5", "EUR")),
+    ]
+
+
+def promotion_engine(n: int, seed: int = 1) -> PromotionEngine:
+    """n акций: большинство привязано к посторонним планам, часть - к PRO/валюте с окнами дат."""
+    rnd = _rng(seed)
+    engine = PromotionEngine()
+    for i in range(n):
+        plans = frozenset({"PRO"}) if i % 50 == 0 else frozenset({f"PLAN{i % 500}"})
+        starts = START + timedelta(days=rnd.randrange(365))
+        engine.add(
+            Promotion(
+                code=f"PROMO{i}",
+                discount=PromoCode(code=f"PROMO{i}", kind="percent", percent=rnd.randint(1, 20)).compile(),
+                plan_codes=plans,
+                starts_on=starts,
+                ends_on=starts + timedelta(days=rnd.randint(7, 90)),
+            )
+        )
+    return engine
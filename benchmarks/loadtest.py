@@ -0,0 +1,160 @@
+"""Нагрузочный прогон FastAPI-приложения в процессе, без сокетов (httpx.ASGITransport).
+
+    PYTHONPATH=src python -m benchmarks.loadtest --scenarios 2000 --concurrency 32 \\
+        --mix lifecycle=3,read=1 --profile run.collapsed
+
+Сценарий lifecycle: create subscription -> upgrade -> change seats -> issue -> pay.
+Сценарий read: create subscription -> 5 x GET subscription -> GET plans.
+Профиль пишется в формате collapsed stacks (flamegraph.pl / speedscope).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from billing_core.api.main import create_app
+from billing_core.infrastructure.profiling import StackSampler
+
+
+@dataclass(slots=True)
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kw) -> httpx.Response:
+        t0 = time.perf_counter()
+        resp = await client.request(method, url, **kw)
+        self.latencies[route].append(time.perf_counter() - t0)
+        if resp.status_code >= 400:
+            self.errors[route] += 1
+        return resp
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, int], Awaitable[None]]
+
+
+async def _create(client: httpx.AsyncClient, rec: Recorder, i: int, plan_code: str) -> str:
+    body = {"customer_id": f"cust_{i}", "plan_code": plan_code, "start_date": "2026-01-01", "seats": 2}
+    resp = await rec.call(client, "POST /subscriptions", "POST", "/subscriptions", json=body)
+    return resp.json()["subscription"]["id"]
+
+
+async def lifecycle(client: httpx.AsyncClient, rec: Recorder, i: int) -> None:
+    sub_id = await _create(client, rec, i, "PRO")
+    upgrade = {"new_plan_code": "TEAM", "change_date": "2026-01-11"}
+    await rec.call(client, "POST /subscriptions/{id}/upgrade", "POST", f"/subscriptions/{sub_id}/upgrade", json=upgrade)
+    seats = {"new_seats": 5, "change_date": "2026-01-16"}
+    resp = await rec.call(
+        client, "POST /subscriptions/{id}/change-seats", "POST", f"/subscriptions/{sub_id}/change-seats", json=seats
+    )
+    inv_id = resp.json()["invoice_id"]
+    if inv_id:
+        await rec.call(client, "POST /invoices/{id}/issue", "POST", f"/invoices/{inv_id}/issue")
+        await rec.call(client, "POST /invoices/{id}/pay", "POST", f"/invoices/{inv_id}/pay")
+
+
+async def read(client: httpx.AsyncClient, rec: Recorder, i: int) -> None:
+    sub_id = await _create(client, rec, i, "TEAM")
+    for _ in range(5):
+        await rec.call(client, "GET /subscriptions/{id}", "GET", f"/subscriptions/{sub_id}")
+    await rec.call(client, "GET /plans", "GET", "/plans")
+
+
+SCENARIOS: dict[str, Scenario] = {"lifecycle": lifecycle, "read": read}
+
+
+def parse_mix(raw: str) -> list[tuple[Scenario, int]]:
+    mix = []
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        mix.append((SCENARIOS[name.strip()], int(weight or 1)))
+    return mix
+
+
+async def drive(
+    total: int, concurrency: int, mix: list[tuple[Scenario, int]], seed: int, *, app_logs: bool = False
+) -> tuple[Recorder, float]:
+    app = create_app()
+    if not app_logs:
+        logging.getLogger("billing_core").setLevel(logging.WARNING)
+    rec = Recorder()
+    rnd = random.Random(seed)
+    scenarios, weights = zip(*mix, strict=True)
+    plan = rnd.choices(scenarios, weights=weights, k=total)
+    next_idx = iter(range(total))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+
+        async def worker() -> None:
+            for i in next_idx:
+                await plan[i](client, rec, i)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+    return rec, elapsed
+
+
+def _pct(sorted_values: list[float], q: float) -> float:
+    idx = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def report(rec: Recorder, elapsed: float) -> str:
+    total = sum(len(v) for v in rec.latencies.values())
+    lines = [
+        f"{total:,} requests in {elapsed:.2f}s -> {total / elapsed:,.0f} req/s",
+        f"{'route':<40} {'count':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    for route, values in sorted(rec.latencies.items()):
+        s = sorted(values)
+        lines.append(
+            f"{route:<40} {len(s):>7} {rec.errors.get(route, 0):>5} {len(s) / elapsed:>8,.0f}"
+            f" {statistics.median(s) * 1e3:>8.2f} {_pct(s, 0.9) * 1e3:>8.2f} {_pct(s, 0.99) * 1e3:>8.2f} {s[-1] * 1e3:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="benchmarks.loadtest")
+    ap.add_argument("--scenarios", type=int, default=1_000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--mix", default="lifecycle=3,read=1")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--profile", help="куда записать collapsed stacks")
+    ap.add_argument("--profile-interval", type=float, default=0.002)
+    ap.add_argument("--app-logs", action="store_true", help="не глушить логи billing_core")
+    args = ap.parse_args()
+
+    mix = parse_mix(args.mix)
+
+    sampler = StackSampler(interval=args.profile_interval) if args.profile else None
+    if sampler:
+        sampler.start()
+    try:
+        rec, elapsed = asyncio.run(drive(args.scenarios, args.concurrency, mix, args.seed, app_logs=args.app_logs))
+    finally:
+        if sampler:
+            sampler.stop()
+
+    print(report(rec, elapsed))
+    if sampler:
+        Path(args.profile).write_text(sampler.collapsed(), encoding="utf-8")
+        print(f"profile: {sampler.samples} samples -> {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Запуск набора бенчмарков и сравнение двух прогонов.
+
+    PYTHONPATH=src python -m benchmarks.run run --scale small -o before.json
+    PYTHONPATH=src python -m benchmarks.run run --scale small -o after.json
+    PYTHONPATH=src python -m benchmarks.run compare before.json after.json --threshold 0.10
+
+compare завершается с кодом 1, если хоть один кейс замедлился больше порога.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .cases import CASES
+
+SCALES = {
+    "small": (1_000,),
+    "medium": (1_000, 10_000),
+    "large": (1_000, 10_000, 100_000),
+}
+
+
+def measure(factory, n: int, rounds: int) -> dict[str, float]:
+    fn = factory(n)
+    fn()  # прогрев
+    samples = []
+    for _ in range(rounds):
+        gc.collect()
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - t0) / n)
+    return {
+        "n": n,
+        "rounds": rounds,
+        "ns_per_op_min": min(samples),
+        "ns_per_op_median": statistics.median(samples),
+    }
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    results = {}
+    for name, factory in CASES.items():
+        if args.filter and not fnmatch.fnmatch(name, args.filter):
+            continue
+        for n in SCALES[args.scale]:
+            key = f"{name}@{n}"
+            results[key] = measure(factory, n, args.rounds)
+            print(f"{key:<40} {results[key]['ns_per_op_median']:>12,.0f} ns/op")
+
+    payload = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "scale": args.scale,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return 0
+
+
+def compare(base: dict, new: dict) -> list[tuple[str, float, float, float]]:
+    """(case, base ns/op, new ns/op, относительное изменение) для общих кейсов."""
+    rows = []
+    for key, b in base["results"].items():
+        n = new["results"].get(key)
+        if n is None:
+            continue
+        before, after = b["ns_per_op_median"], n["ns_per_op_median"]
+        rows.append((key, before, after, after / before - 1))
+    return rows
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+
+    regressions = 0
+    for key, before, after, delta in compare(base, new):
+        flag = ""
+        if delta > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif delta < -args.threshold:
+            flag = "  faster"
+        print(f"{key:<40} {before:>12,.0f} -> {after:>12,.0f} ns/op  {delta:+7.1%}{flag}")
+
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="benchmarks.run")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run_p = sub.add_parser("run")
+    run_p.add_argument("--scale", choices=SCALES, default="small")
+    run_p.add_argument("--rounds", type=int, default=5)
+    run_p.add_argument("--filter", help="glob по имени кейса, например 'service.*'")
+    run_p.add_argument("-o", "--output")
+    run_p.set_defaults(func=cmd_run)
+
+    cmp_p = sub.add_parser("compare")
+    cmp_p.add_argument("base")
+    cmp_p.add_argument("new")
+    cmp_p.add_argument("--threshold", type=float, default=0.10)
+    cmp_p.set_defaults(func=cmd_compare)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,30 +2,52 @@ from __future__ import annotations
 
 from fastapi import Request
 
+from billing_core.application.metrics import BillingMetrics, TimedRepository
+from billing_core.application.promotions import PromotionEngine
 from billing_core.application.services import BillingService
-from billing_core.domain.plans import Plan
+from billing_core.application.usage import UsageAggregator
+from billing_core.domain.catalog import default_snapshot
+from billing_core.infrastructure.columnar_repos import ColumnarSubscriptionRepo
 from billing_core.infrastructure.memory_repos import (
     InMemoryInvoiceRepo,
     InMemoryPlanRepo,
     InMemoryPromoRepo,
     InMemorySubscriptionRepo,
+    InMemoryUsageRepo,
 )
+from billing_core.infrastructure.plan_loader import load_plan_catalog
 
 
-def build_service() -> BillingService:
-    plans = InMemoryPlanRepo()
-    for p in [
-        Plan.from_config("free;FREE;Free;EUR"),
-        Plan.from_config("flat;PRO;Pro;EUR;20"),
-        Plan.from_config("per_seat;TEAM;Team;EUR;10;5"),
-    ]:
-        plans.add(p)
+def build_service(
+    *,
+    plans_file: str | None = None,
+    metrics: BillingMetrics | None = None,
+    subscription_store: str = "memory",
+) -> BillingService:
+    if subscription_store not in {"memory", "columnar"}:
+        raise ValueError(f"unknown subscription_store {subscription_store!r}")
+    plans = InMemoryPlanRepo(default_snapshot())
+    if plans_file:
+        load_plan_catalog(plans_file, plans)
+
+    repos = {
+        "plans": plans,
+        "subs": ColumnarSubscriptionRepo() if subscription_store == "columnar" else InMemorySubscriptionRepo(),
+        "invoices": InMemoryInvoiceRepo(),
+        "promos": InMemoryPromoRepo(),
+        "usage": InMemoryUsageRepo(),
+    }
+    if metrics is not None and metrics.enabled:
+        repos = {name: TimedRepository(repo, name, metrics) for name, repo in repos.items()}
 
     return BillingService(
-        plans=plans,
-        subs=InMemorySubscriptionRepo(),
-        invoices=InMemoryInvoiceRepo(),
-        promos=InMemoryPromoRepo(),
+        plans=repos["plans"],
+        subs=repos["subs"],
+        invoices=repos["invoices"],
+        promos=repos["promos"],
+        usage=UsageAggregator(repos["usage"]),
+        promotions=PromotionEngine(),
+        metrics=metrics,
     )
 
 
@@ -3,8 +3,10 @@ from __future__ import annotations
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+from billing_core.api.idempotency import IdempotencyConflictError
 from billing_core.domain.errors import (
     BillingError,
+    InvalidPromoTermsError,
     InvalidStateTransitionError,
     InvoiceNotFoundError,
     PromoCodeNotFoundError,
@@ -12,9 +14,14 @@ from billing_core.domain.errors import (
     SubscriptionNotFoundError,
 )
 from billing_core.domain.plans import PlanNotFoundError
+from billing_core.infrastructure.profiling import ProfilerBusyError
 
 
 def billing_error_handler(_: Request, exc: BillingError) -> JSONResponse:
+    # 422: некорректные условия промокода при создании (до общей ветки PromoNotValidError -> 404)
+    if isinstance(exc, InvalidPromoTermsError):
+        return JSONResponse(status_code=422, content={"error": exc.__class__.__name__, "message": str(exc)})
+
     # 404
     if isinstance(
         exc, (PlanNotFoundError, SubscriptionNotFoundError, InvoiceNotFoundError, PromoCodeNotFoundError, PromoNotValidError)
@@ -22,7 +29,7 @@ def billing_error_handler(_: Request, exc: BillingError) -> JSONResponse:
         return JSONResponse(status_code=404, content={"error": exc.__class__.__name__, "message": str(exc)})
 
     # 409
-    if isinstance(exc, InvalidStateTransitionError):
+    if isinstance(exc, (InvalidStateTransitionError, IdempotencyConflictError, ProfilerBusyError)):
         return JSONResponse(status_code=409, content={"error": exc.__class__.__name__, "message": str(exc)})
 
     # 400
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Annotated, Any
+
+from fastapi import Depends, Header, Request
+
+from billing_core.domain.errors import BillingError
+
+
+class IdempotencyConflictError(BillingError):
+    def __init__(self, key: str, reason: str) -> None:
+        super().__init__(f"Idempotency-Key {key!r}: {reason}")
+        self.key = key
+        self.reason = reason
+
+
+@dataclass(slots=True)
+class _Entry:
+    fingerprint: str
+    value: Any
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _InFlight:
+    fingerprint: str
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass(slots=True)
+class IdempotencyCache:
+    """LRU + TTL кэш сериализованных ответов по ключу идемпотентности.
+
+    Повтор с тем же ключом, пока первый запрос ещё выполняется, ждёт его
+    завершения, а не выполняет use case второй раз. Если первый запрос упал,
+    результат не кэшируется и следующий ожидающий выполняет его заново.
+    """
+
+    capacity: int = 10_000
+    ttl_seconds: float = 24 * 3600
+    wait_timeout: float = 30.0
+
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict[str, _Entry] = field(default_factory=OrderedDict)
+    _inflight: dict[str, _InFlight] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def run(self, key: str, fingerprint: str, fn: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at <= time.monotonic():
+                    del self._entries[key]
+                    entry = None
+
+                if entry is not None:
+                    self._check_fingerprint(key, entry.fingerprint, fingerprint)
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _InFlight(fingerprint)
+                    self._inflight[key] = flight
+                    self.misses += 1
+                else:
+                    self._check_fingerprint(key, flight.fingerprint, fingerprint)
+
+            if leader:
+                return self._execute(key, flight, fn)
+
+            if not flight.done.wait(self.wait_timeout):
+                raise IdempotencyConflictError(key, "request with this key is still in progress")
+
+    def _execute(self, key: str, flight: _InFlight, fn: Callable[[], Any]) -> Any:
+        try:
+            value = fn()
+        except BaseException:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+            raise
+
+        with self._lock:
+            self._entries[key] = _Entry(flight.fingerprint, value, time.monotonic() + self.ttl_seconds)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        flight.done.set()
+        return value
+
+    @staticmethod
+    def _check_fingerprint(key: str, expected: str, actual: str) -> None:
+        if expected != actual:
+            raise IdempotencyConflictError(key, "reused with a different request body")
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotentCall:
+    """Выполняет fn не более одного раза на ключ; без ключа - просто вызывает fn."""
+
+    cache: IdempotencyCache
+    key: str | None
+    fingerprint: str
+
+    def __call__(self, fn: Callable[[], Any]) -> Any:
+        if self.key is None:
+            return fn()
+        return self.cache.run(self.key, self.fingerprint, fn)
+
+
+async def idempotency(
+    request: Request,
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
+) -> IdempotentCall:
+    cache: IdempotencyCache = request.app.state.idempotency
+    if not idempotency_key:
+        return IdempotentCall(cache, None, "")
+
+    body = await request.body()
+    scoped = f"{request.method} {request.url.path} {idempotency_key}"
+    return IdempotentCall(cache, scoped, hashlib.sha256(body).hexdigest())
+
+
+IdemDep = Annotated[IdempotentCall, Depends(idempotency)]
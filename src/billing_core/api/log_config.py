@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import queue
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+_STRUCTURED_FIELDS = ("use_case", "event", "duration_ms")
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in _STRUCTURED_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+_SAMPLED_EVENTS = frozenset({"begin", "commit"})
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Не блокирует запрос при переполненной очереди: запись отбрасывается и учитывается в dropped.
+
+    BEGIN/COMMIT пропускаются только для каждой sample_every-й транзакции (по tx_seq);
+    ROLLBACK и остальные записи - всегда. Частота своя у каждого обработчика.
+    """
+
+    def __init__(self, q: queue.Queue, *, sample_every: int = 1) -> None:
+        if sample_every < 1:
+            raise ValueError("sampling interval must be >= 1")
+        super().__init__(q)
+        self.sample_every = sample_every
+        self.dropped = 0
+        self.listener: QueueListener | None = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = self.sample_every
+        if every > 1 and getattr(record, "event", None) in _SAMPLED_EVENTS and getattr(record, "tx_seq", 0) % every:
+            return False
+        return super().filter(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # В потоке запроса - только подстановка аргументов; extra-поля сохраняются для JsonFormatter.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str,
+    *,
+    json_format: bool = True,
+    sample_every: int = 1,
+    queue_size: int = 10_000,
+    stream_handler: logging.Handler | None = None,
+) -> DroppingQueueHandler:
+    """Логи billing_core уходят в очередь, форматирование и запись - в отдельном потоке.
+
+    Стартует поток listener'а; вызывающий - владелец обработчика и останавливает его через
+    shutdown_logging(handler) (в приложении это lifespan). Повторный вызов снимает прежний
+    обработчик с логгера, но его listener не трогает.
+    """
+    pkg_logger = logging.getLogger("billing_core")
+    for old in _queue_handlers(pkg_logger):
+        pkg_logger.removeHandler(old)
+
+    target = stream_handler or logging.StreamHandler()
+    target.setFormatter(JsonFormatter() if json_format else logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size), sample_every=sample_every)
+    handler.listener = QueueListener(handler.queue, target, respect_handler_level=True)
+    handler.listener.start()
+
+    pkg_logger.setLevel(level.upper())
+    pkg_logger.addHandler(handler)
+    pkg_logger.propagate = False
+    return handler
+
+
+def _queue_handlers(logger: logging.Logger) -> list[DroppingQueueHandler]:
+    return [h for h in logger.handlers if isinstance(h, DroppingQueueHandler)]
+
+
+def shutdown_logging(handler: DroppingQueueHandler | None = None) -> None:
+    """Дописывает очередь handler и снимает его; без аргумента - все обработчики на логгере billing_core."""
+    pkg_logger = logging.getLogger("billing_core")
+    for h in [handler] if handler is not None else _queue_handlers(pkg_logger):
+        pkg_logger.removeHandler(h)
+        if h.listener is not None:
+            h.listener.stop()
+            h.listener = None
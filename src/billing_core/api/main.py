@@ -1,28 +1,104 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, Request
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import date
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 
 from billing_core.api.deps import build_service
 from billing_core.api.error_handlers import billing_error_handler
+from billing_core.api.idempotency import IdempotencyCache
+from billing_core.api.log_config import configure_logging, shutdown_logging
+from billing_core.api.settings import Settings, settings
+from billing_core.application.metrics import BillingMetrics
+from billing_core.domain.as_of import evaluated_as_of
 from billing_core.domain.errors import BillingError
+from billing_core.infrastructure.memory_stats import MemoryTracker
 
+from .routers.admin import router as admin_router
+from .routers.debug import router as debug_router
 from .routers.health import router as health_router
 from .routers.invoices import router as invoices_router
+from .routers.metrics import router as metrics_router
 from .routers.plans import router as plans_router
 from .routers.promos import router as promos_router
+from .routers.promotions import router as promotions_router
+from .routers.receivables import router as receivables_router
+from .routers.stats import router as stats_router
 from .routers.subscriptions import router as subs_router
+from .routers.usage import router as usage_router
+
+try:
+    from .routers.analytics import router as analytics_router
+except ImportError:  # numpy не установлен: pip install .[analytics]
+    analytics_router = None
+
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Поток listener'а живёт столько же, сколько запущенное приложение: create_app() его не стартует.
+    config: Settings = app.state.settings
+    app.state.log_handler = configure_logging(
+        config.log_level,
+        json_format=config.log_json,
+        sample_every=config.log_tx_sample_every,
+        queue_size=config.log_queue_size,
+    )
+    try:
+        yield
+    finally:
+        # Только свой listener: другое приложение в процессе могло настроить логи позже.
+        shutdown_logging(app.state.log_handler)
+        app.state.log_handler = None
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="Billing Core API", version="0.0.9")
 
-    app.state.service = build_service()
+def create_app(config: Settings = settings) -> FastAPI:
+    app = FastAPI(title="Billing Core API", version="0.0.9", lifespan=_lifespan)
+
+    app.state.settings = config
+    app.state.log_handler = None
+    app.state.metrics = BillingMetrics(enabled=config.metrics_enabled)
+    app.state.service = build_service(
+        plans_file=config.plans_file,
+        metrics=app.state.metrics,
+        subscription_store=config.subscription_store,
+    )
+    app.state.idempotency = IdempotencyCache(
+        capacity=config.idempotency_capacity,
+        ttl_seconds=config.idempotency_ttl_seconds,
+    )
+    app.state.memory_tracker = MemoryTracker()
 
     app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(plans_router)
     app.include_router(subs_router)
     app.include_router(invoices_router)
     app.include_router(promos_router)
+    app.include_router(promotions_router)
+    app.include_router(usage_router)
+    app.include_router(stats_router)
+    app.include_router(receivables_router)
+    if analytics_router is not None:
+        app.include_router(analytics_router)
+    if config.profiler_enabled:
+        # Диагностика обходит все репозитории - только при явном включении.
+        app.include_router(admin_router)
+        app.include_router(debug_router)
+
+    @app.middleware("http")
+    async def as_of_context(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        # X-As-Of влияет только на computed-свойства ответа (is_active, days_left_in_period);
+        # изменяющие операции всегда берут date.today().
+        raw = request.headers.get("x-as-of")
+        try:
+            day = date.fromisoformat(raw) if raw else None
+        except ValueError:
+            return JSONResponse(status_code=400, content={"error": "InvalidAsOf", "message": f"bad X-As-Of {raw!r}"})
+        with evaluated_as_of(day):
+            return await call_next(request)
 
     @app.exception_handler(BillingError)
     def handle_billing_error(request: Request, exc: BillingError):
@@ -0,0 +1,24 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from billing_core.infrastructure.profiling import profile_for
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/profile")
+def profile(
+    request: Request,
+    seconds: Annotated[float, Query(gt=0)] = 5.0,
+    interval: Annotated[float, Query(ge=0.001, le=1.0)] = 0.005,
+    fmt: Annotated[Literal["collapsed", "speedscope"], Query(alias="format")] = "collapsed",
+):
+    """Сэмплирует стеки всех потоков seconds секунд; корневой кадр - активная billing_transaction."""
+    seconds = min(seconds, request.app.state.settings.profiler_max_seconds)
+    sampler = profile_for(seconds, interval=interval)
+
+    if fmt == "speedscope":
+        return JSONResponse(sampler.speedscope(name=f"billing-core {seconds:g}s"))
+    return PlainTextResponse(sampler.collapsed())
@@ -0,0 +1,65 @@
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from billing_core.api.deps import get_service
+from billing_core.api.schemas import ChurnOut, CohortOut, MoneyOut, PlanRevenueOut, RevenueOut
+from billing_core.application.analytics import RevenueAnalytics
+from billing_core.application.services import BillingService
+from billing_core.domain.errors import BillingError
+from billing_core.domain.money import Money
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+SvcDep = Annotated[BillingService, Depends(get_service)]
+
+
+def _analytics(svc: BillingService) -> RevenueAnalytics:
+    return RevenueAnalytics.from_columns(svc.subs.columns())
+
+
+def _money(m: Money) -> MoneyOut:
+    return MoneyOut(amount=m.amount, currency=m.currency)
+
+
+@router.get("/mrr", response_model=RevenueOut)
+def revenue(svc: SvcDep, as_of: date | None = None):
+    report = _analytics(svc).mrr(svc.plans.snapshot(), as_of=as_of or date.today())
+    return RevenueOut(
+        as_of=report.as_of,
+        by_plan=[
+            PlanRevenueOut(
+                plan_code=row.plan_code,
+                currency=row.currency,
+                subscriptions=row.subscriptions,
+                seats=row.seats,
+                mrr=_money(row.mrr),
+                arr=_money(row.arr),
+            )
+            for row in report.by_plan
+        ],
+        mrr=[_money(m) for m in report.mrr.values()],
+        arr=[_money(m) for m in report.arr.values()],
+    )
+
+
+@router.get("/churn", response_model=ChurnOut)
+def churn(svc: SvcDep, start: date, end: date):
+    if end <= start:
+        raise BillingError("end must be after start")
+    report = _analytics(svc).churn(start=start, end=end)
+    return ChurnOut(
+        start=report.start,
+        end=report.end,
+        active_at_start=report.active_at_start,
+        churned=report.churned,
+        rate=report.rate,
+    )
+
+
+@router.get("/cohorts", response_model=list[CohortOut])
+def cohorts(svc: SvcDep, months: Annotated[int, Query(ge=1, le=120)] = 12, as_of: date | None = None):
+    return [
+        CohortOut(month=c.month, size=c.size, retained=list(c.retained), retention=list(c.retention))
+        for c in _analytics(svc).cohorts(as_of=as_of or date.today(), months=months)
+    ]
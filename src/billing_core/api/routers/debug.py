@@ -0,0 +1,37 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from billing_core.api.deps import get_service
+from billing_core.application.services import BillingService
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+SvcDep = Annotated[BillingService, Depends(get_service)]
+
+
+@router.get("/memory")
+def memory(request: Request, svc: SvcDep, sample: Annotated[int, Query(ge=1, le=100_000)] = 1_000):
+    """Оценка памяти in-memory репозиториев: число объектов, байт на объект (по выборке), рост между вызовами."""
+    repos = [svc.plans, svc.subs, svc.invoices, svc.promos]
+    if svc.usage is not None:
+        repos.append(svc.usage.repo)
+
+    stats = [s for repo in repos if hasattr(repo, "memory_usage") for s in repo.memory_usage(sample=sample)]
+    growth = request.app.state.memory_tracker.record(stats)
+
+    return {
+        "total_bytes": sum(s.total_bytes for s in stats),
+        "entities": [
+            {
+                "repo": s.repo,
+                "entity": s.entity,
+                "count": s.count,
+                "sampled": s.sampled,
+                "bytes_per_item": round(s.bytes_per_item, 1),
+                "container_bytes": s.container_bytes,
+                "total_bytes": s.total_bytes,
+            }
+            for s in stats
+        ],
+        "growth": growth,
+    }
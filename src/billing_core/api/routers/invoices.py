@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 
 from billing_core.api.deps import get_service
+from billing_core.api.idempotency import IdemDep
 from billing_core.api.schemas import InvoiceOut, LineItemOut, MoneyOut
 from billing_core.application.services import BillingService
 
@@ -45,6 +46,5 @@ def issue_invoice(invoice_id: str, svc: SvcDep):
 
 
 @router.post("/{invoice_id}/pay", response_model=InvoiceOut)
-def pay_invoice(invoice_id: str, svc: SvcDep):
-    inv = svc.pay_invoice(invoice_id=invoice_id)
-    return _to_invoice_out(inv)
+def pay_invoice(invoice_id: str, svc: SvcDep, idem: IdemDep):
+    return idem(lambda: _to_invoice_out(svc.pay_invoice(invoice_id=invoice_id)).model_dump(mode="json"))
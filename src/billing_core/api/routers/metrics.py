@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request):
+    idem = request.app.state.idempotency
+    lines = [
+        "# TYPE billing_idempotency_requests_total counter",
+        f'billing_idempotency_requests_total{{result="hit"}} {idem.hits}',
+        f'billing_idempotency_requests_total{{result="miss"}} {idem.misses}',
+        "# TYPE billing_idempotency_hit_ratio gauge",
+        f"billing_idempotency_hit_ratio {idem.hit_rate:.6f}",
+        "# TYPE billing_idempotency_entries gauge",
+        f"billing_idempotency_entries {len(idem)}",
+    ]
+    return "\n".join(lines) + "\n" + request.app.state.metrics.render_prometheus()
@@ -5,20 +5,21 @@ from fastapi import APIRouter, Depends
 from billing_core.api.deps import get_service
 from billing_core.api.schemas import MoneyOut, PlanCreate, PlanOut
 from billing_core.application.services import BillingService
+from billing_core.domain.catalog import PlanPrice
 from billing_core.domain.plans import Plan
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 SvcDep = Annotated[BillingService, Depends(get_service)]
 
 
-def _to_plan_out(p: Plan) -> PlanOut:
-    price = p.monthly_price
+def _to_plan_out(p: Plan, price: PlanPrice) -> PlanOut:
+    monthly = price.monthly_price
     return PlanOut(
         code=p.code,
         name=p.name,
         currency=p.currency,
-        monthly_price=MoneyOut(amount=price.amount, currency=price.currency),
-        requires_seats=p.requires_seats,
+        monthly_price=MoneyOut(amount=monthly.amount, currency=monthly.currency),
+        requires_seats=price.requires_seats,
     )
 
 
@@ -26,15 +27,16 @@ def _to_plan_out(p: Plan) -> PlanOut:
 def create_plan(payload: PlanCreate, svc: SvcDep):
     plan = Plan.from_config(payload.model_dump())
     svc.plans.add(plan)
-    return _to_plan_out(plan)
+    return _to_plan_out(plan, PlanPrice.from_plan(plan))
 
 
 @router.get("", response_model=list[PlanOut])
 def list_plans(svc: SvcDep):
-    return [_to_plan_out(p) for p in svc.plans.list()]
+    catalog = svc.plans.snapshot()
+    return [_to_plan_out(p, catalog.price(p.code)) for p in catalog]
 
 
 @router.get("/{code}", response_model=PlanOut)
 def get_plan(code: str, svc: SvcDep):
-    plan = svc.plans.get(code)
-    return _to_plan_out(plan)
+    catalog = svc.plans.snapshot()
+    return _to_plan_out(catalog.get(code), catalog.price(code))
@@ -1,12 +1,15 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends
+from fastapi.responses import StreamingResponse
 
 from billing_core.api.deps import get_service
-from billing_core.api.schemas import PromoCreate
+from billing_core.api.schemas import PromoCreate, PromoGenerateRequest, PromoImportOut
 from billing_core.application.services import BillingService
+from billing_core.domain.errors import BillingError
 from billing_core.domain.money import Money
-from billing_core.domain.promo import PromoCode
+from billing_core.domain.promo import PROMO_ALPHABET, PromoCode, PromoTemplate
+from billing_core.infrastructure.promo_csv import iter_promo_csv, parse_promo_csv
 
 router = APIRouter(prefix="/promos", tags=["promos"])
 SvcDep = Annotated[BillingService, Depends(get_service)]
@@ -27,6 +30,42 @@ def create_promo(payload: PromoCreate, svc: SvcDep):
         fixed_discount=fixed,
         valid_until=payload.valid_until,
         is_single_use=payload.is_single_use,
+        max_redemptions=payload.max_redemptions,
     )
     svc.promos.add(promo)
     return {"status": "created", "code": promo.code}
+
+
+@router.post(":generate", response_class=StreamingResponse)
+def generate_promos(payload: PromoGenerateRequest, svc: SvcDep):
+    """Генерирует count кодов по шаблону и отдаёт их CSV-потоком."""
+    fixed = None
+    if payload.kind == "fixed":
+        if not payload.fixed_amount or not payload.currency:
+            raise BillingError("fixed promo requires fixed_amount and currency")
+        fixed = Money.of(payload.fixed_amount, payload.currency)
+
+    template = PromoTemplate(
+        kind=payload.kind,
+        prefix=payload.prefix,
+        alphabet=payload.alphabet or PROMO_ALPHABET,
+        length=payload.length,
+        percent=payload.percent,
+        fixed_discount=fixed,
+        valid_until=payload.valid_until,
+        is_single_use=payload.is_single_use,
+        max_redemptions=payload.max_redemptions,
+    )
+    codes = svc.generate_promos(template, count=payload.count)
+    return StreamingResponse(
+        iter_promo_csv(template, codes),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="promos.csv"', "X-Promo-Count": str(len(codes))},
+    )
+
+
+@router.post(":import", response_model=PromoImportOut)
+def import_promos(svc: SvcDep, payload: Annotated[str, Body(media_type="text/csv")]):
+    """CSV в формате выгрузки :generate (обязательны колонки code и kind)."""
+    res = svc.import_promos(parse_promo_csv(payload.splitlines(), source="request"))
+    return PromoImportOut(created=res.created, duplicates=res.duplicates)
@@ -0,0 +1,69 @@
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from billing_core.api.deps import get_service
+from billing_core.api.schemas import AppliedPromotionOut, MoneyOut, PromotionCreate, PromotionQuoteOut
+from billing_core.application.promotions import PromotionEngine
+from billing_core.application.services import BillingService
+from billing_core.domain.errors import BillingError
+from billing_core.domain.money import Money
+from billing_core.domain.promo import PromoCode
+from billing_core.domain.promotions import Promotion
+
+router = APIRouter(prefix="/promotions", tags=["promotions"])
+SvcDep = Annotated[BillingService, Depends(get_service)]
+
+
+def _engine(svc: BillingService) -> PromotionEngine:
+    if svc.promotions is None:
+        raise BillingError("promotions engine is not configured")
+    return svc.promotions
+
+
+def _money(m: Money) -> MoneyOut:
+    return MoneyOut(amount=m.amount, currency=m.currency)
+
+
+@router.post("")
+def create_promotion(payload: PromotionCreate, svc: SvcDep):
+    fixed = None
+    if payload.kind == "fixed":
+        if not payload.fixed_amount or not payload.currency:
+            raise BillingError("fixed promotion requires fixed_amount and currency")
+        fixed = Money.of(payload.fixed_amount, payload.currency)
+
+    discount = PromoCode(code=payload.code, kind=payload.kind, percent=payload.percent, fixed_discount=fixed).compile()
+    promo = Promotion(
+        code=payload.code,
+        discount=discount,
+        plan_codes=frozenset(payload.plan_codes),
+        currency=payload.currency.upper() if payload.currency else None,
+        starts_on=payload.starts_on,
+        ends_on=payload.ends_on,
+        first_months=payload.first_months,
+        priority=payload.priority,
+        exclusive=payload.exclusive,
+    )
+    _engine(svc).add(promo)
+    return {"status": "created", "code": promo.code}
+
+
+@router.get("/quote", response_model=PromotionQuoteOut)
+def quote_promotions(
+    svc: SvcDep,
+    plan_code: str,
+    on: date,
+    seats: Annotated[int, Query(ge=1)] = 1,
+    start_date: date | None = None,
+):
+    engine = _engine(svc)
+    subtotal = svc.plans.snapshot().monthly_price_for(plan_code, seats=seats)
+    quote = engine.evaluate(plan_code=plan_code, seats=seats, subtotal=subtotal, on=on, start_date=start_date)
+    return PromotionQuoteOut(
+        subtotal=_money(quote.subtotal),
+        total=_money(quote.total),
+        applied=[AppliedPromotionOut(code=code, amount=_money(delta)) for code, delta in quote.applied],
+        cache_hit_rate=engine.hit_rate,
+    )
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from billing_core.api.deps import get_service
+from billing_core.api.schemas import AgingRowOut, MoneyOut
+from billing_core.application.receivables import AGING_BUCKETS
+from billing_core.application.services import BillingService
+from billing_core.infrastructure.ar_csv import iter_aging_csv
+
+router = APIRouter(prefix="/receivables", tags=["receivables"])
+SvcDep = Annotated[BillingService, Depends(get_service)]
+
+
+@router.get("/aging", response_model=list[AgingRowOut])
+def aging(svc: SvcDep, as_of: date | None = None):
+    """Выставленные неоплаченные инвойсы по клиенту/валюте и возрасту (0-30, 31-60, 61-90, 90+ дней)."""
+    return [
+        AgingRowOut(
+            customer_id=row.customer_id,
+            currency=row.currency,
+            buckets={
+                name: MoneyOut(amount=m.amount, currency=m.currency) for name, m in zip(AGING_BUCKETS, row.buckets, strict=True)
+            },
+            total=MoneyOut(amount=row.total.amount, currency=row.currency),
+        )
+        for row in svc.receivables.aging(as_of=as_of or date.today())
+    ]
+
+
+@router.get("/aging.csv", response_class=StreamingResponse)
+def aging_csv(svc: SvcDep, as_of: date | None = None):
+    rows = svc.receivables.aging(as_of=as_of or date.today())
+    return StreamingResponse(
+        iter_aging_csv(rows),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="ar_aging.csv"'},
+    )
@@ -0,0 +1,45 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from billing_core.api.deps import get_service
+from billing_core.api.schemas import MoneyOut, PlanStatsOut, ReconcileOut, StatsOut
+from billing_core.application.services import BillingService
+from billing_core.application.stats import PlanStats
+from billing_core.domain.money import Money
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+SvcDep = Annotated[BillingService, Depends(get_service)]
+
+
+def _money(m: Money) -> MoneyOut:
+    return MoneyOut(amount=m.amount, currency=m.currency)
+
+
+def _plan_out(row: PlanStats) -> PlanStatsOut:
+    return PlanStatsOut(
+        plan_code=row.plan_code,
+        currency=row.currency,
+        active=row.active,
+        trialing=row.trialing,
+        seats=row.seats,
+        mrr=_money(row.mrr),
+    )
+
+
+@router.get("", response_model=StatsOut)
+def stats(svc: SvcDep):
+    """Инкрементальные агрегаты: O(планов), без обхода подписок."""
+    return StatsOut(by_plan=[_plan_out(row) for row in svc.stats.snapshot()], mrr=[_money(m) for m in svc.stats.mrr().values()])
+
+
+@router.post("/reconcile", response_model=ReconcileOut)
+def reconcile(svc: SvcDep, fix: bool = False):
+    report = svc.reconcile_stats(fix=fix)
+    return ReconcileOut(
+        subscriptions=report.subscriptions,
+        ok=report.ok,
+        fixed=report.fixed,
+        stats=[_plan_out(got) for got, _ in report.mismatches.values() if got is not None],
+        expected=[_plan_out(want) for _, want in report.mismatches.values() if want is not None],
+    )
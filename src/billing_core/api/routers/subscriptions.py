@@ -1,15 +1,24 @@
 from datetime import date as dt_date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from billing_core.api.deps import get_service
+from billing_core.api.idempotency import IdemDep
 from billing_core.api.schemas import (
+    ApplyPromoRequest,
+    ChangeSeatsRequest,
     CreateSubscriptionResponse,
+    LineItemOut,
+    MoneyOut,
+    ProrationQuoteOut,
     SubscriptionCreate,
     SubscriptionOut,
+    UpgradeRequest,
 )
+from billing_core.application.quotes import ProrationQuote
 from billing_core.application.services import BillingService
+from billing_core.domain.money import Money
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 
@@ -28,27 +37,46 @@ def _to_sub_out(s) -> SubscriptionOut:
         current_period_end=s.current_period_end,
         seats=s.seats,
         promo_code=s.promo_code,
+        billing_cycle=s.billing_cycle.value,
         is_active=s.is_active,
         days_left_in_period=s.days_left_in_period,
     )
 
 
-@router.post("", response_model=CreateSubscriptionResponse)
-def create_subscription(payload: SubscriptionCreate, svc: SvcDep):
-    sub, inv = svc.create_subscription(
-        customer_id=payload.customer_id,
-        plan_code=payload.plan_code,
-        start_date=payload.start_date,
-        seats=payload.seats,
-        trial_days=payload.trial_days,
-        period_days=payload.period_days,
-    )
-    return CreateSubscriptionResponse(
-        subscription=_to_sub_out(sub),
-        invoice_id=inv.invoice_id if inv else None,
+def _money(m: Money) -> MoneyOut:
+    return MoneyOut(amount=m.amount, currency=m.currency)
+
+
+def _to_quote_out(quote: ProrationQuote, hit_rate: float) -> ProrationQuoteOut:
+    return ProrationQuoteOut(
+        old_monthly=_money(quote.old_monthly),
+        new_monthly=_money(quote.new_monthly),
+        items=[LineItemOut(description=li.description, amount=_money(li.amount)) for li in quote.items],
+        total=_money(quote.total),
+        cache_hit_rate=hit_rate,
     )
 
 
+@router.post("", response_model=CreateSubscriptionResponse)
+def create_subscription(payload: SubscriptionCreate, svc: SvcDep, idem: IdemDep):
+    def _run() -> dict:
+        sub, inv = svc.create_subscription(
+            customer_id=payload.customer_id,
+            plan_code=payload.plan_code,
+            start_date=payload.start_date,
+            seats=payload.seats,
+            trial_days=payload.trial_days,
+            period_days=payload.period_days,
+            billing_cycle=payload.billing_cycle,
+        )
+        return CreateSubscriptionResponse(
+            subscription=_to_sub_out(sub),
+            invoice_id=inv.invoice_id if inv else None,
+        ).model_dump(mode="json")
+
+    return idem(_run)
+
+
 @router.get("/{sub_id}", response_model=SubscriptionOut)
 def get_subscription(sub_id: str, svc: SvcDep):
     sub = svc.subs.get(sub_id)
@@ -62,26 +90,61 @@ def cancel_subscription(sub_id: str, svc: SvcDep):
 
 
 @router.post("/{sub_id}/upgrade")
-def upgrade_subscription(sub_id: str, payload: SubscriptionCreate, svc: SvcDep):
-    inv = svc.upgrade_subscription(
-        sub_id=sub_id,
-        new_plan_code=payload.new_plan_code,
-        change_date=payload.change_date,
-    )
-    return {"invoice_id": inv.invoice_id if inv else None}
+def upgrade_subscription(sub_id: str, payload: UpgradeRequest, svc: SvcDep, idem: IdemDep):
+    def _run() -> dict:
+        inv = svc.upgrade_subscription(
+            sub_id=sub_id,
+            new_plan_code=payload.new_plan_code,
+            change_date=payload.change_date,
+        )
+        return {"invoice_id": inv.invoice_id if inv else None}
+
+    return idem(_run)
+
+
+@router.get("/{sub_id}/upgrade/preview", response_model=ProrationQuoteOut)
+def preview_upgrade(sub_id: str, new_plan_code: str, change_date: dt_date, svc: SvcDep):
+    quote = svc.preview_upgrade(sub_id=sub_id, new_plan_code=new_plan_code, change_date=change_date)
+    return _to_quote_out(quote, svc.quotes.hit_rate)
 
 
 @router.post("/{sub_id}/change-seats")
-def change_seats(sub_id: str, payload: SubscriptionCreate, svc: SvcDep):
-    inv = svc.change_seats(
-        sub_id=sub_id,
-        new_seats=payload.new_seats,
-        change_date=payload.change_date,
-    )
-    return {"invoice_id": inv.invoice_id if inv else None}
+def change_seats(sub_id: str, payload: ChangeSeatsRequest, svc: SvcDep, idem: IdemDep):
+    def _run() -> dict:
+        inv = svc.change_seats(
+            sub_id=sub_id,
+            new_seats=payload.new_seats,
+            change_date=payload.change_date,
+        )
+        return {"invoice_id": inv.invoice_id if inv else None}
+
+    return idem(_run)
+
+
+@router.get("/{sub_id}/change-seats/preview", response_model=ProrationQuoteOut)
+def preview_seat_change(
+    sub_id: str,
+    new_seats: Annotated[int, Query(ge=1)],
+    change_date: dt_date,
+    svc: SvcDep,
+):
+    quote = svc.preview_seat_change(sub_id=sub_id, new_seats=new_seats, change_date=change_date)
+    return _to_quote_out(quote, svc.quotes.hit_rate)
 
 
 @router.post("/{sub_id}/apply-promo", response_model=SubscriptionOut)
-def apply_promo(sub_id: str, payload: SubscriptionCreate, svc: SvcDep):
+def apply_promo(sub_id: str, payload: ApplyPromoRequest, svc: SvcDep):
     sub = svc.apply_promo(sub_id=sub_id, promo_code=payload.promo_code, today=dt_date.today())
     return _to_sub_out(sub)
+
+
+@router.post("/{sub_id}/invoice-usage")
+def invoice_usage(sub_id: str, svc: SvcDep):
+    inv = svc.invoice_usage(sub_id=sub_id)
+    return {"invoice_id": inv.invoice_id if inv else None}
+
+
+@router.post("/{sub_id}/renew")
+def renew(sub_id: str, svc: SvcDep):
+    inv = svc.renew_subscription(sub_id=sub_id)
+    return {"invoice_id": inv.invoice_id if inv else None}
@@ -0,0 +1,27 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from billing_core.api.deps import get_service
+from billing_core.api.schemas import UsageBatchIn, UsageBatchOut
+from billing_core.application.services import BillingService
+from billing_core.domain.usage import UsageEvent
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+SvcDep = Annotated[BillingService, Depends(get_service)]
+
+
+@router.post(":batch", response_model=UsageBatchOut)
+def ingest_usage_batch(payload: UsageBatchIn, svc: SvcDep):
+    events = [
+        UsageEvent(
+            subscription_id=e.subscription_id,
+            metric=e.metric,
+            quantity=e.quantity,
+            timestamp=e.timestamp,
+            idempotency_key=e.idempotency_key,
+        )
+        for e in payload.events
+    ]
+    res = svc.ingest_usage(events)
+    return UsageBatchOut(accepted=res.accepted, duplicates=res.duplicates)
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Any
 
 from pydantic import BaseModel, Field
 
+from billing_core.domain.periods import BillingCycle
+
 
 class MoneyOut(BaseModel):
     amount: Decimal
@@ -12,13 +15,17 @@ class MoneyOut(BaseModel):
 
 
 class PlanCreate(BaseModel):
-    type: str = Field(..., description="free | flat | per_seat")
+    type: str = Field(..., description="free | flat | per_seat | tiered | volume | metered")
     code: str
     name: str
     currency: str
     monthly_price: str | None = None
     base: str | None = None
     per_seat: str | None = None
+    tiers: str | list[dict[str, Any]] | None = Field(
+        None, description='"10:5,50:4,*:3" или [{"up_to": 10, "unit_price": "5"}, ...]'
+    )
+    rates: str | dict[str, str] | None = Field(None, description='metered: "api_calls:0.01,gb:0.5" или {"api_calls": "0.01"}')
 
 
 class PlanOut(BaseModel):
@@ -36,6 +43,7 @@ class SubscriptionCreate(BaseModel):
     seats: int = 1
     trial_days: int = 0
     period_days: int = 30
+    billing_cycle: BillingCycle = BillingCycle.DAYS
 
 
 class SubscriptionOut(BaseModel):
@@ -49,6 +57,7 @@ class SubscriptionOut(BaseModel):
     current_period_end: date
     seats: int
     promo_code: str | None
+    billing_cycle: str
     is_active: bool
     days_left_in_period: int
 
@@ -77,6 +86,14 @@ class LineItemOut(BaseModel):
     amount: MoneyOut
 
 
+class ProrationQuoteOut(BaseModel):
+    old_monthly: MoneyOut
+    new_monthly: MoneyOut
+    items: list[LineItemOut]
+    total: MoneyOut
+    cache_hit_rate: float
+
+
 class InvoiceOut(BaseModel):
     invoice_id: str
     created_at: datetime
@@ -97,3 +114,126 @@ class PromoCreate(BaseModel):
     currency: str | None = None
     valid_until: date | None = None
     is_single_use: bool = False
+    max_redemptions: int | None = Field(None, ge=1)
+
+
+class PromoGenerateRequest(BaseModel):
+    count: int = Field(..., ge=1, le=5_000_000)
+    prefix: str = ""
+    alphabet: str | None = None
+    length: int = Field(10, ge=4, le=64)
+    kind: str
+    percent: int | None = None
+    fixed_amount: str | None = None
+    currency: str | None = None
+    valid_until: date | None = None
+    is_single_use: bool = True
+    max_redemptions: int | None = Field(None, ge=1)
+
+
+class PromoImportOut(BaseModel):
+    created: int
+    duplicates: int
+
+
+class PromotionCreate(BaseModel):
+    code: str
+    kind: str = Field(..., description="percent | fixed")
+    percent: int | None = None
+    fixed_amount: str | None = None
+    currency: str | None = None
+    plan_codes: list[str] = Field(default_factory=list)
+    starts_on: date | None = None
+    ends_on: date | None = None
+    first_months: int | None = Field(None, ge=1)
+    priority: int = 100
+    exclusive: bool = False
+
+
+class AppliedPromotionOut(BaseModel):
+    code: str
+    amount: MoneyOut
+
+
+class PromotionQuoteOut(BaseModel):
+    subtotal: MoneyOut
+    total: MoneyOut
+    applied: list[AppliedPromotionOut]
+    cache_hit_rate: float
+
+
+class UsageEventIn(BaseModel):
+    subscription_id: str
+    metric: str
+    quantity: int = Field(..., ge=0)
+    timestamp: datetime
+    idempotency_key: str | None = None
+
+
+class UsageBatchIn(BaseModel):
+    events: list[UsageEventIn]
+
+
+class UsageBatchOut(BaseModel):
+    accepted: int
+    duplicates: int
+
+
+class PlanRevenueOut(BaseModel):
+    plan_code: str
+    currency: str
+    subscriptions: int
+    seats: int
+    mrr: MoneyOut
+    arr: MoneyOut
+
+
+class RevenueOut(BaseModel):
+    as_of: date
+    by_plan: list[PlanRevenueOut]
+    mrr: list[MoneyOut]
+    arr: list[MoneyOut]
+
+
+class ChurnOut(BaseModel):
+    start: date
+    end: date
+    active_at_start: int
+    churned: int
+    rate: float
+
+
+class CohortOut(BaseModel):
+    month: date
+    size: int
+    retained: list[int]
+    retention: list[float]
+
+
+class PlanStatsOut(BaseModel):
+    plan_code: str
+    currency: str
+    active: int
+    trialing: int
+    seats: int
+    mrr: MoneyOut
+
+
+class StatsOut(BaseModel):
+    by_plan: list[PlanStatsOut]
+    mrr: list[MoneyOut]
+
+
+class ReconcileOut(BaseModel):
+    subscriptions: int
+    ok: bool
+    fixed: bool
+    stats: list[PlanStatsOut]  # расходящиеся строки агрегатов
+    expected: list[PlanStatsOut]  # те же ключи по полному пересчёту
+
+
+class AgingRowOut(BaseModel):
+    customer_id: str
+    currency: str
+    buckets: dict[str, MoneyOut]  # "0-30" | "31-60" | "61-90" | "90+"
+    total: MoneyOut
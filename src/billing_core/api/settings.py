@@ -9,6 +9,16 @@ class Settings:
     host: str = os.getenv("APP_HOST", "0.0.0.0")
     port: int = int(os.getenv("APP_PORT", "8080"))
     log_level: str = os.getenv("LOG_LEVEL", "info")
+    log_json: bool = os.getenv("LOG_JSON", "true").lower() in {"1", "true", "yes"}
+    log_tx_sample_every: int = int(os.getenv("LOG_TX_SAMPLE_EVERY", "100"))
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    plans_file: str | None = os.getenv("PLANS_FILE") or None
+    subscription_store: str = os.getenv("SUBSCRIPTION_STORE", "memory")  # memory | columnar
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() in {"1", "true", "yes"}
+    profiler_enabled: bool = os.getenv("PROFILER_ENABLED", "false").lower() in {"1", "true", "yes"}
+    profiler_max_seconds: float = float(os.getenv("PROFILER_MAX_SECONDS", "30"))
+    idempotency_capacity: int = int(os.getenv("IDEMPOTENCY_CAPACITY", "10000"))
+    idempotency_ttl_seconds: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
 
 
 settings = Settings()
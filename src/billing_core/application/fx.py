@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from billing_core.domain.errors import FxRateNotFoundError
+from billing_core.domain.money import Money
+
+# (base, quote, ordinal даты)
+_RateKey = tuple[str, str, int]
+_ONE = Decimal(1)
+
+
+@dataclass(slots=True)
+class FxRates:
+    """Курсы валют по датам: 1 base = rate quote, действует с даты до следующей котировки.
+
+    Ряд каждой пары - отсортированные ordinal дат и курсы, поиск курса на дату -
+    bisect. Обратная пара считается как 1/rate. Последние (пара, дата) лежат
+    в LRU. Конвертация только явная через convert(): Money по-прежнему не
+    складывает разные валюты.
+    """
+
+    capacity: int = 4096
+
+    hits: int = 0
+    misses: int = 0
+    _series: dict[tuple[str, str], tuple[list[int], list[Decimal]]] = field(default_factory=dict)
+    _entries: OrderedDict[_RateKey, Decimal] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[date, str, str, Decimal]], *, capacity: int = 4096) -> FxRates:
+        """Строки (дата, base, quote, rate) в любом порядке; повтор даты перезаписывает курс."""
+        points: dict[tuple[str, str], dict[int, Decimal]] = {}
+        for day, base, quote, rate in rows:
+            points.setdefault((base.upper(), quote.upper()), {})[day.toordinal()] = rate
+        rates = cls(capacity=capacity)
+        for pair, by_day in points.items():
+            days = sorted(by_day)
+            rates._series[pair] = (days, [by_day[d] for d in days])
+        return rates
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return sum(len(days) for days, _ in self._series.values())
+
+    @property
+    def pairs(self) -> list[tuple[str, str]]:
+        return sorted(self._series)
+
+    def pair_series(self, base: str, quote: str) -> tuple[list[int], list[Decimal], bool]:
+        """Ряд котировок для base -> quote: прямой, иначе обратной пары (inverted=True, курс = 1/rate)."""
+        series = self._series.get((base, quote))
+        if series is not None:
+            return (*series, False)
+        series = self._series.get((quote, base))
+        if series is not None:
+            return (*series, True)
+        return [], [], False
+
+    def rate(self, base: str, quote: str, *, on: date) -> Decimal:
+        """Курс base -> quote на дату: последняя котировка не позже on."""
+        if base == quote:
+            return _ONE
+        key = (base, quote, on.toordinal())
+        with self._lock:
+            rate = self._entries.get(key)
+            if rate is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return rate
+            self.misses += 1
+
+        days, rates, inverted = self.pair_series(base, quote)
+        i = bisect_right(days, key[2])
+        if not i:
+            raise FxRateNotFoundError(base, quote, on)
+        rate = _ONE / rates[i - 1] if inverted else rates[i - 1]
+        with self._lock:
+            self._entries[key] = rate
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return rate
+
+    def convert(self, money: Money, to: str, *, on: date) -> Money:
+        """Новая сумма в валюте to по курсу на дату (HALF_UP до цента)."""
+        to = to.upper()
+        if money.currency == to:
+            return money
+        return Money(money.amount * self.rate(money.currency, to, on=on), to)
+
+    def total(self, amounts: Iterable[Money], to: str, *, on: date) -> Money:
+        """Сумма в одной валюте: каждая сумма конвертируется и округляется отдельно."""
+        total = Money.of(0, to)
+        for money in amounts:
+            total = total + self.convert(money, to, on=on)
+        return total
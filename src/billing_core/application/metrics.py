@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+_SUB_BITS = 6
+_SUB = 1 << _SUB_BITS  # линейные ячейки до 64 мкс
+_HALF = _SUB >> 1  # далее 32 ячейки на каждую степень двойки (~3% точности)
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB:
+        return value
+    shift = value.bit_length() - _SUB_BITS
+    return (shift + 1) * _HALF + ((value >> shift) - _HALF)
+
+
+def _bucket_upper(idx: int) -> int:
+    if idx < _SUB:
+        return idx
+    shift = idx // _HALF - 1
+    top = idx % _HALF + _HALF
+    return ((top + 1) << shift) - 1
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """HDR-style гистограмма: лог-линейные ячейки по микросекундам, запись - O(1) без аллокаций."""
+
+    count: int = 0
+    total_us: int = 0
+    max_us: int = 0
+    _counts: list[int] = field(default_factory=list)
+
+    def record(self, micros: int) -> None:
+        idx = _bucket_index(micros)
+        counts = self._counts
+        if idx >= len(counts):
+            counts.extend([0] * (idx + 1 - len(counts)))
+        counts[idx] += 1
+        self.count += 1
+        self.total_us += micros
+        if micros > self.max_us:
+            self.max_us = micros
+
+    def percentile(self, q: float) -> int:
+        """Верхняя граница ячейки, в которую попал q-квантиль (мкс)."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for idx, c in enumerate(self._counts):
+            seen += c
+            if seen >= rank:
+                return min(_bucket_upper(idx), self.max_us)
+        return self.max_us
+
+
+@dataclass(slots=True)
+class CallStats:
+    count: int = 0
+    total_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class BillingMetrics:
+    """Метрики use case'ов: латентность, ошибки по классу исключения, вызовы репозиториев.
+
+    Реестр свой у каждого приложения (app.state.metrics) и передаётся сервису.
+    При enabled=False billing_transaction не снимает время вообще, а
+    build_service не оборачивает репозитории.
+    """
+
+    enabled: bool = True
+
+    latency: dict[str, LatencyHistogram] = field(default_factory=dict)
+    errors: dict[tuple[str, str], int] = field(default_factory=dict)
+    repo_calls: dict[tuple[str, str], CallStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.latency.get(name)
+            if hist is None:
+                hist = self.latency[name] = LatencyHistogram()
+            hist.record(int(seconds * 1_000_000))
+
+    def observe_error(self, name: str, exc: BaseException) -> None:
+        key = (name, type(exc).__name__)
+        with self._lock:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def observe_repo_call(self, repo: str, method: str, seconds: float) -> None:
+        key = (repo, method)
+        with self._lock:
+            stats = self.repo_calls.get(key)
+            if stats is None:
+                stats = self.repo_calls[key] = CallStats()
+            stats.count += 1
+            stats.total_seconds += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.errors.clear()
+            self.repo_calls.clear()
+
+    def render_prometheus(self) -> str:
+        return "".join(line + "\n" for line in self._prometheus_lines())
+
+    def _prometheus_lines(self) -> Iterator[str]:
+        with self._lock:
+            latency = {name: h for name, h in self.latency.items()}
+            rows = [(name, [h.percentile(q) for q in QUANTILES], h.total_us, h.count) for name, h in latency.items()]
+            errors = dict(self.errors)
+            repo_calls = {k: CallStats(v.count, v.total_seconds) for k, v in self.repo_calls.items()}
+
+        yield "# TYPE billing_use_case_duration_seconds summary"
+        for name, pcts, total_us, count in sorted(rows):
+            for q, us in zip(QUANTILES, pcts, strict=True):
+                yield f'billing_use_case_duration_seconds{{use_case="{name}",quantile="{q}"}} {us / 1e6:.6f}'
+            yield f'billing_use_case_duration_seconds_sum{{use_case="{name}"}} {total_us / 1e6:.6f}'
+            yield f'billing_use_case_duration_seconds_count{{use_case="{name}"}} {count}'
+
+        yield "# TYPE billing_use_case_errors_total counter"
+        for (name, exc_name), n in sorted(errors.items()):
+            yield f'billing_use_case_errors_total{{use_case="{name}",exception="{exc_name}"}} {n}'
+
+        yield "# TYPE billing_repository_calls_total counter"
+        for (repo, method), st in sorted(repo_calls.items()):
+            yield f'billing_repository_calls_total{{repository="{repo}",method="{method}"}} {st.count}'
+        yield "# TYPE billing_repository_call_seconds_total counter"
+        for (repo, method), st in sorted(repo_calls.items()):
+            yield f'billing_repository_call_seconds_total{{repository="{repo}",method="{method}"}} {st.total_seconds:.6f}'
+
+
+class TimedRepository:
+    """Прокси репозитория: считает вызовы и время каждого публичного метода.
+
+    Обёртка метода создаётся один раз на имя и кэшируется: вызов репозитория не аллоцирует замыкание.
+    """
+
+    __slots__ = ("_inner", "_name", "_metrics", "_wrapped")
+
+    def __init__(self, inner: Any, name: str, metrics: BillingMetrics) -> None:
+        self._inner = inner
+        self._name = name
+        self._metrics = metrics
+        self._wrapped: dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, attr: str) -> Any:
+        wrapped = self._wrapped.get(attr)
+        if wrapped is not None:
+            return wrapped
+        value = getattr(self._inner, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        wrapped = self._wrapped[attr] = self._timed(attr, value)
+        return wrapped
+
+    def _timed(self, method: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._metrics.observe_repo_call(self._name, method, time.perf_counter() - t0)
+
+        return call
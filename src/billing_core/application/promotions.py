@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from billing_core.domain.errors import BillingError
+from billing_core.domain.money import Money
+from billing_core.domain.promotions import Promotion, PromotionQuote, months_since, stack_promotions
+
+_Bucket = tuple[str | None, str | None]  # (plan_code | None, currency | None)
+_CacheKey = tuple[str, int, int, int, Decimal, str]
+_Window = tuple[int, int, Promotion]  # [начало, конец] в ordinal, открытые - date.min/date.max
+
+
+def _window(promo: Promotion) -> _Window:
+    return (promo.starts_on or date.min).toordinal(), (promo.ends_on or date.max).toordinal(), promo
+
+
+@dataclass(frozen=True, slots=True)
+class _IntervalNode:
+    """Центрированное дерево интервалов по окнам акций одного бакета.
+
+    В узле - акции, окно которых содержит center: по возрастанию начала и по
+    убыванию конца. Запрос на день проходит один путь от корня и читает из
+    узла только действующие акции, поэтому давно закончившиеся кампании не
+    просматриваются: O(log n + ответ).
+    """
+
+    center: int
+    starts: tuple[int, ...]  # по возрастанию
+    by_start: tuple[Promotion, ...]
+    neg_ends: tuple[int, ...]  # -конец по возрастанию, т.е. конец по убыванию
+    by_end: tuple[Promotion, ...]
+    left: _IntervalNode | None
+    right: _IntervalNode | None
+
+    @classmethod
+    def build(cls, windows: list[_Window]) -> _IntervalNode | None:
+        if not windows:
+            return None
+        points = sorted(p for start, end, _ in windows for p in (start, end))
+        center = points[len(points) // 2]
+        here: list[_Window] = []
+        left: list[_Window] = []
+        right: list[_Window] = []
+        for w in windows:
+            (left if w[1] < center else right if w[0] > center else here).append(w)
+        here_by_start = sorted(here, key=lambda w: w[0])
+        here_by_end = sorted(here, key=lambda w: -w[1])
+        return cls(
+            center=center,
+            starts=tuple(w[0] for w in here_by_start),
+            by_start=tuple(w[2] for w in here_by_start),
+            neg_ends=tuple(-w[1] for w in here_by_end),
+            by_end=tuple(w[2] for w in here_by_end),
+            left=cls.build(left),
+            right=cls.build(right),
+        )
+
+    def active_on(self, day: int) -> list[Promotion]:
+        out: list[Promotion] = []
+        node: _IntervalNode | None = self
+        while node is not None:
+            if day < node.center:
+                out += node.by_start[: bisect_right(node.starts, day)]
+                node = node.left
+            else:
+                out += node.by_end[: bisect_right(node.neg_ends, -day)]
+                node = node.right if day > node.center else None
+        return out
+
+
+@dataclass(slots=True)
+class PromotionEngine:
+    """Индекс автоматических акций по (plan_code, currency) и окну дат с кэшем результатов.
+
+    Акция попадает в один из четырёх бакетов: конкретный план и валюта,
+    только план, только валюта или без ограничений. Внутри бакета - дерево
+    интервалов по [starts_on, ends_on], так что поиск - четыре обращения
+    к dict и спуск по дереву, без прохода по закончившимся акциям.
+    add() только дописывает окно; дерево бакета и границы дат строятся
+    заново при первом поиске после изменений (загрузка n акций - O(n log n)).
+
+    Результаты кэшируются в LRU по (plan, seats, отрезок дат, месяц подписки,
+    сумма, валюта). Отрезок - промежуток между соседними началами/концами
+    окон всех акций: внутри него набор действующих акций один, поэтому дни
+    одного отрезка делят запись кэша. Месяц подписки ограничен
+    max(first_months) и для акций без first_months всегда 0. add() сбрасывает кэш.
+    """
+
+    cache_capacity: int = 50_000
+
+    hits: int = 0
+    misses: int = 0
+    _windows: dict[_Bucket, list[_Window]] = field(default_factory=dict)
+    _trees: dict[_Bucket, _IntervalNode | None] = field(default_factory=dict)
+    _bounds: tuple[int, ...] | None = None
+    _codes: set[str] = field(default_factory=set)
+    _max_first_months: int = 0
+    _version: int = 0
+    _cache: OrderedDict[_CacheKey, PromotionQuote] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def add(self, promo: Promotion) -> None:
+        with self._lock:
+            if promo.code in self._codes:
+                raise BillingError(f"promotion {promo.code!r} already exists")
+            window = _window(promo)
+            for plan_code in promo.plan_codes or (None,):
+                key = (plan_code, promo.currency)
+                self._windows.setdefault(key, []).append(window)
+                self._trees.pop(key, None)
+            self._bounds = None
+            self._codes.add(promo.code)
+            self._max_first_months = max(self._max_first_months, promo.first_months or 0)
+            self._version += 1
+            self._cache.clear()
+
+    def applicable(self, *, plan_code: str, currency: str, on: date, month: int = 0) -> list[Promotion]:
+        """Акции, действующие на дату on для плана/валюты, в порядке применения."""
+        day = on.toordinal()
+        found: dict[str, Promotion] = {}
+        for key in ((plan_code, currency), (plan_code, None), (None, currency), (None, None)):
+            tree = self._tree(key)
+            if tree is None:
+                continue
+            for promo in tree.active_on(day):
+                if promo.first_months is None or month < promo.first_months:
+                    found[promo.code] = promo
+        return sorted(found.values(), key=lambda p: p.order_key)
+
+    def evaluate(
+        self, *, plan_code: str, seats: int, subtotal: Money, on: date, start_date: date | None = None
+    ) -> PromotionQuote:
+        version = self._version
+        month = min(months_since(start_date, on), self._max_first_months) if start_date else 0
+        segment = bisect_right(self._date_bounds(), on.toordinal())
+        key = (plan_code, seats, segment, month, subtotal.amount, subtotal.currency)
+        with self._lock:
+            # Отрезок считан по границам версии version; после add() ключ мог сменить смысл.
+            quote = self._cache.get(key) if version == self._version else None
+            if quote is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return quote
+            self.misses += 1
+
+        promos = self.applicable(plan_code=plan_code, currency=subtotal.currency, on=on, month=month)
+        quote = stack_promotions(promos, subtotal)
+        with self._lock:
+            if version != self._version:  # параллельный add() - результат мог устареть
+                return quote
+            self._cache[key] = quote
+            while len(self._cache) > self.cache_capacity:
+                self._cache.popitem(last=False)
+        return quote
+
+    def _tree(self, key: _Bucket) -> _IntervalNode | None:
+        tree = self._trees.get(key)
+        if tree is not None or key not in self._windows:  # бакет без акций не кэшируем: ключи приходят из запросов
+            return tree
+        with self._lock:
+            if key not in self._trees:
+                self._trees[key] = _IntervalNode.build(list(self._windows[key]))
+            return self._trees[key]
+
+    def _date_bounds(self) -> tuple[int, ...]:
+        bounds = self._bounds
+        if bounds is None:
+            with self._lock:
+                if self._bounds is None:
+                    points = {p for windows in self._windows.values() for start, end, _ in windows for p in (start, end + 1)}
+                    self._bounds = tuple(sorted(points))
+                bounds = self._bounds
+        return bounds
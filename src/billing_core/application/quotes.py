@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date
+
+from billing_core.domain.invoice import LineItem
+from billing_core.domain.money import Money
+
+# (old plan, new plan, old seats, new seats, period start, period end, cycle days, change date, catalog version)
+QuoteKey = tuple[str, str, int, int, date, date, int, date, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ProrationQuote:
+    """Результат proration без побочных эффектов: строки будущего инвойса и их сумма."""
+
+    old_monthly: Money
+    new_monthly: Money
+    items: tuple[LineItem, ...]
+
+    @property
+    def total(self) -> Money:
+        total = Money.of("0", self.old_monthly.currency)
+        for li in self.items:
+            total = total + li.amount
+        return total
+
+
+@dataclass(slots=True)
+class ProrationQuoteCache:
+    """LRU результатов proration_line_items.
+
+    Ключ включает версию снимка каталога, поэтому смена цен не отдаёт
+    устаревшие котировки. Котировки неизменяемы и делятся между вызовами.
+    """
+
+    capacity: int = 10_000
+
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict[QuoteKey, ProrationQuote] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: QuoteKey, compute: Callable[[], ProrationQuote]) -> ProrationQuote:
+        with self._lock:
+            quote = self._entries.get(key)
+            if quote is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return quote
+            self.misses += 1
+
+        quote = compute()
+        with self._lock:
+            self._entries[key] = quote
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return quote
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from itertools import pairwise
+
+from billing_core.domain.errors import BillingError
+from billing_core.domain.invoice import Invoice, InvoiceStatus
+from billing_core.domain.money import Money
+
+AGING_BUCKETS = ("0-30", "31-60", "61-90", "90+")
+_CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True, slots=True)
+class OpenInvoice:
+    """Выставленный неоплаченный инвойс; сумма посчитана один раз при выставлении."""
+
+    invoice_id: str
+    customer_id: str
+    issued_on: date
+    currency: str
+    cents: int
+
+
+@dataclass(frozen=True, slots=True)
+class AgingRow:
+    customer_id: str
+    currency: str
+    buckets: tuple[Money, Money, Money, Money]  # по AGING_BUCKETS
+
+    @property
+    def total(self) -> Money:
+        return Money(sum(m.amount for m in self.buckets), self.currency)
+
+
+@dataclass(slots=True)
+class ReceivablesLedger:
+    """Открытая дебиторка: выставленные неоплаченные инвойсы по дате выставления.
+
+    Ключи (ordinal даты, invoice_id) лежат в отсортированном списке, поэтому
+    границы корзин aging - три bisect, а отчёт проходит только открытые
+    инвойсы. Инвойс после issue() не меняется, так что сумма кэшируется.
+    """
+
+    _keys: list[tuple[int, str]] = field(default_factory=list)
+    _open: dict[str, OpenInvoice] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def add(self, inv: Invoice) -> None:
+        if inv.status != InvoiceStatus.ISSUED or inv.issued_on is None:
+            raise BillingError(f"invoice {inv.invoice_id} is not issued")
+        entry = OpenInvoice(
+            invoice_id=inv.invoice_id,
+            customer_id=inv.customer_id,
+            issued_on=inv.issued_on,
+            currency=inv.currency,
+            cents=int(inv.total.amount / _CENT),
+        )
+        with self._lock:
+            if entry.invoice_id in self._open:
+                return
+            self._open[entry.invoice_id] = entry
+            insort(self._keys, (entry.issued_on.toordinal(), entry.invoice_id))
+
+    def remove(self, invoice_id: str) -> bool:
+        with self._lock:
+            entry = self._open.pop(invoice_id, None)
+            if entry is None:
+                return False
+            key = (entry.issued_on.toordinal(), invoice_id)
+            del self._keys[bisect_left(self._keys, key)]
+            return True
+
+    def open_invoices(self) -> Iterator[OpenInvoice]:
+        """Открытые инвойсы от самого старого."""
+        with self._lock:
+            entries = [self._open[invoice_id] for _, invoice_id in self._keys]
+        return iter(entries)
+
+    def aging(self, *, as_of: date) -> list[AgingRow]:
+        """Суммы по клиенту и валюте в корзинах возраста (as_of - дата выставления, в днях)."""
+        day = as_of.toordinal()
+        sums: dict[tuple[str, str], list[int]] = {}
+        with self._lock:
+            keys, entries = self._keys, self._open
+            # Старше 90, 60, 30 дней: ключи левее соответствующей границы.
+            cuts = [0, *(bisect_left(keys, (day - days,)) for days in (90, 60, 30)), len(keys)]
+            for bucket, (lo, hi) in enumerate(pairwise(cuts)):
+                idx = len(AGING_BUCKETS) - 1 - bucket
+                for _, invoice_id in keys[lo:hi]:
+                    e = entries[invoice_id]
+                    row = sums.get((e.customer_id, e.currency))
+                    if row is None:
+                        row = sums[(e.customer_id, e.currency)] = [0, 0, 0, 0]
+                    row[idx] += e.cents
+
+        return [
+            AgingRow(
+                customer_id=customer_id,
+                currency=currency,
+                buckets=tuple(Money(Decimal(c) * _CENT, currency) for c in row),
+            )
+            for (customer_id, currency), row in sorted(sums.items())
+        ]
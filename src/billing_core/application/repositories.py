@@ -1,44 +1,157 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from array import array
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date
 
+from billing_core.domain.catalog import CatalogSnapshot
 from billing_core.domain.invoice import Invoice
 from billing_core.domain.plans import Plan
-from billing_core.domain.promo import PromoCode
-from billing_core.domain.subscription import Subscription
+from billing_core.domain.promo import PromoCode, PromoDiscount, PromoTemplate
+from billing_core.domain.subscription import Subscription, SubscriptionStatus
+
+SUBSCRIPTION_STATUSES = tuple(SubscriptionStatus)
+
+
+@dataclass(slots=True)
+class SubscriptionColumns:
+    """Снимок подписок по колонкам для аналитики.
+
+    plan[i] - индекс в plan_codes, status[i] - индекс в SUBSCRIPTION_STATUSES,
+    даты - ordinal, canceled[i] == 0 - подписка не отменялась.
+    """
+
+    plan_codes: list[str | None] = field(default_factory=list)
+    plan: array = field(default_factory=lambda: array("I"))
+    seats: array = field(default_factory=lambda: array("I"))
+    status: array = field(default_factory=lambda: array("B"))
+    start: array = field(default_factory=lambda: array("i"))
+    canceled: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @classmethod
+    def from_subscriptions(cls, subs: Iterable[Subscription]) -> SubscriptionColumns:
+        cols = cls()
+        plan_index: dict[str, int] = {}
+        status_index = {s: i for i, s in enumerate(SUBSCRIPTION_STATUSES)}
+        for sub in subs:
+            code = plan_index.get(sub.plan_code)
+            if code is None:
+                code = plan_index[sub.plan_code] = len(cols.plan_codes)
+                cols.plan_codes.append(sub.plan_code)
+            cols.plan.append(code)
+            cols.seats.append(sub.seats)
+            cols.status.append(status_index[sub.status])
+            cols.start.append(sub.start_date.toordinal())
+            cols.canceled.append(sub.canceled_on.toordinal() if sub.canceled_on else 0)
+        return cols
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodBilling:
+    """Что уже выставлено подписке за открытый период.
+
+    usage - выставленное потребление по метрикам; fixed_discount - фиксированная
+    скидка промокода уже вычтена (не больше раза за период).
+    """
+
+    usage: Mapping[str, int] = field(default_factory=dict)
+    fixed_discount: bool = False
 
 
 class PlanRepository(ABC):
     @abstractmethod
     def add(self, plan: Plan) -> None: ...
 
+    @abstractmethod
+    def add_many(self, plans: Iterable[Plan]) -> None: ...
+
     @abstractmethod
     def get(self, code: str) -> Plan: ...
 
     @abstractmethod
     def list(self) -> Iterable[Plan]: ...
 
+    @abstractmethod
+    def snapshot(self) -> CatalogSnapshot: ...
+
 
 class SubscriptionRepository(ABC):
     @abstractmethod
-    def save(self, sub_id: str) -> Subscription: ...
+    def save(self, sub: Subscription) -> None: ...
+
+    @abstractmethod
+    def get(self, sub_id: str) -> Subscription: ...
+
+    @abstractmethod
+    def columns(self) -> SubscriptionColumns:
+        """Копия полей, нужных аналитике, без сборки объектов там, где хранилище позволяет."""
 
 
 class InvoiceRepository(ABC):
     @abstractmethod
     def get(self, invoice_id: str) -> Invoice: ...
 
+    @abstractmethod
+    def list(self) -> Iterable[Invoice]: ...
+
+    @abstractmethod
+    def period_billing(self, *, sub_id: str, period_start: date) -> PeriodBilling:
+        """Учёт открытого периода; пустой, если за период ещё ничего не выставлялось."""
+
+    @abstractmethod
+    def save_period_billing(self, *, sub_id: str, period_start: date, billing: PeriodBilling) -> None: ...
+
+    @abstractmethod
+    def close_period(self, *, sub_id: str, period_start: date) -> None:
+        """Период продлён и выставлен полностью: учёт по нему удаляется."""
+
 
 class PromoRepository(ABC):
     @abstractmethod
-    def add(self, promo: PromoCode) -> PromoCode: ...
+    def add(self, promo: PromoCode) -> None:
+        """Промокод компилируется при добавлении; некорректные условия отклоняются сразу."""
+
+    @abstractmethod
+    def add_many(self, promos: Iterable[PromoCode]) -> None: ...
+
+    @abstractmethod
+    def add_generated(self, template: PromoTemplate, codes: Iterable[str]) -> set[str]:
+        """Коды с общими условиями: хранится ссылка на шаблон, PromoCode собирается в get().
+
+        Занятость проверяется атомарно с записью; уже занятые коды не добавляются и возвращаются.
+        """
+
+    @abstractmethod
+    def existing_codes(self, codes: Iterable[str]) -> set[str]:
+        """Какие из codes уже заняты."""
 
     @abstractmethod
     def get(self, code: str) -> PromoCode: ...
 
+    @abstractmethod
+    def get_discount(self, code: str) -> PromoDiscount: ...
+
     @abstractmethod
     def is_used_by_customer(self, *, code: str, customer_id: str) -> bool: ...
 
     @abstractmethod
-    def mark_used(self, *, code: str, customer_id: str) -> bool: ...
+    def mark_used(self, *, code: str, customer_id: str) -> bool:
+        """Атомарно записывает погашение.
+
+        False - single-use код уже погашен этим клиентом;
+        PromoNotValidError - исчерпан max_redemptions.
+        """
+
+
+class UsageRepository(ABC):
+    @abstractmethod
+    def add_totals(self, deltas: Mapping[tuple[str, str, int], int]) -> None:
+        """deltas: (sub_id, metric, day ordinal) -> quantity."""
+
+    @abstractmethod
+    def totals_for(self, *, sub_id: str, period_start: date, period_end: date) -> dict[str, int]: ...
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from enum import StrEnum
+from pathlib import Path
+
+import numpy as np
+
+from billing_core.domain.invoice import Invoice, InvoiceStatus
+from billing_core.domain.money import Money
+
+from .analytics import month_numbers
+
+_CENT = Decimal("0.01")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class Granularity(StrEnum):
+    DAILY = "daily"
+    MONTHLY = "monthly"
+
+
+def _month_start_ordinals(months: np.ndarray) -> np.ndarray:
+    return months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+
+
+def _month_date(month: int) -> date:
+    year, month0 = divmod(month, 12)
+    return date(1970 + year, month0 + 1, 1)
+
+
+@dataclass(slots=True)
+class RecognitionLines:
+    """Строки оплаченных инвойсов к распределению: [start, end) в ordinal и сумма в центах.
+
+    Период строки - service_start/service_end (proration: от даты изменения
+    до конца периода), иначе период инвойса. Кредиты - отрицательные суммы.
+    id инвойсов (uuid4 hex) хранятся по 16 байт, клиенты и валюты - кодами словаря.
+    """
+
+    invoice_ids: bytearray = field(default_factory=bytearray)
+    invoice_customer: array = field(default_factory=lambda: array("I"))
+    invoice_currency: array = field(default_factory=lambda: array("B"))
+    customers: list[str] = field(default_factory=list)
+    currencies: list[str] = field(default_factory=list)
+    invoice: array = field(default_factory=lambda: array("I"))
+    start: array = field(default_factory=lambda: array("i"))
+    end: array = field(default_factory=lambda: array("i"))
+    cents: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    @classmethod
+    def from_invoices(cls, invoices: Iterable[Invoice]) -> RecognitionLines:
+        lines = cls()
+        customers: dict[str, int] = {}
+        currencies: dict[str, int] = {}
+        for inv in invoices:
+            if inv.status != InvoiceStatus.PAID:
+                continue
+            idx = len(lines.invoice_customer)
+            lines.invoice_ids += bytes.fromhex(inv.invoice_id)
+            lines.invoice_customer.append(_code(customers, lines.customers, inv.customer_id))
+            lines.invoice_currency.append(_code(currencies, lines.currencies, inv.currency))
+            for li in inv:
+                cents = int(li.amount.amount / _CENT)
+                start = (li.service_start or inv.period_start).toordinal()
+                end = (li.service_end or inv.period_end).toordinal()
+                if not cents or end <= start:
+                    continue
+                lines.invoice.append(idx)
+                lines.start.append(start)
+                lines.end.append(end)
+                lines.cents.append(cents)
+        return lines
+
+
+def _code(index: dict[str, int], values: list[str], value: str) -> int:
+    code = index.get(value)
+    if code is None:
+        code = index[value] = len(values)
+        values.append(value)
+    return code
+
+
+@dataclass(frozen=True, slots=True)
+class RecognitionSchedule:
+    """Признанная выручка по колонкам: строка = (инвойс, день или месяц, сумма в центах).
+
+    period - ordinal дня (DAILY) или номер месяца от 1970-01 (MONTHLY).
+    Суммы по строке инвойса распределены пропорционально дням и в сумме
+    дают её до цента.
+    """
+
+    granularity: Granularity
+    invoice_ids: np.ndarray  # S16, uuid4 в байтах
+    invoice_customer: np.ndarray  # индекс в customers
+    customers: np.ndarray  # S, utf-8
+    invoice_currency: np.ndarray  # индекс в currencies
+    currencies: np.ndarray  # S3
+    invoice: np.ndarray
+    period: np.ndarray
+    cents: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def invoice_id(self, invoice: int) -> str:
+        return self.invoice_ids[invoice].ljust(16, b"\0").hex()
+
+    def period_date(self, period: int) -> date:
+        return date.fromordinal(period) if self.granularity is Granularity.DAILY else _month_date(period)
+
+    def totals(self) -> dict[tuple[date, str], Money]:
+        """Признанная выручка по (день/месяц, валюта)."""
+        currency = self.invoice_currency[self.invoice]
+        keys, inverse = np.unique(np.stack([self.period, currency]), axis=1, return_inverse=True)
+        sums = np.zeros(keys.shape[1], dtype=np.int64)
+        np.add.at(sums, inverse.ravel(), self.cents)
+        out: dict[tuple[date, str], Money] = {}
+        for (period, cur), cents in zip(keys.T.tolist(), sums.tolist(), strict=True):
+            code = self.currencies[cur].decode()
+            out[(self.period_date(period), code)] = Money(Decimal(cents) * _CENT, code)
+        return out
+
+    def write(self, path: str | Path) -> None:
+        """Колонки в сжатый .npz: без Python-объектов на строку."""
+        np.savez_compressed(
+            path,
+            granularity=np.array(self.granularity.value),
+            invoice_ids=self.invoice_ids,
+            invoice_customer=self.invoice_customer,
+            customers=self.customers,
+            invoice_currency=self.invoice_currency,
+            currencies=self.currencies,
+            invoice=self.invoice,
+            period=self.period,
+            cents=self.cents,
+        )
+
+    @classmethod
+    def read(cls, path: str | Path) -> RecognitionSchedule:
+        with np.load(path) as f:
+            return cls(granularity=Granularity(str(f["granularity"])), **{k: f[k] for k in f.files if k != "granularity"})
+
+
+def expand(lines: RecognitionLines, granularity: Granularity = Granularity.MONTHLY) -> RecognitionSchedule:
+    """Разворачивает строки в дни/месяцы векторно: np.repeat по числу периодов на строку.
+
+    На периоде [lo, hi) дней от начала строки признаётся
+    floor(c*hi/L) - floor(c*lo/L): суммы целые и сходятся до цента.
+    """
+    start = np.array(lines.start, dtype=np.int64)
+    end = np.array(lines.end, dtype=np.int64)
+    cents = np.array(lines.cents, dtype=np.int64)
+    length = end - start
+
+    if granularity is Granularity.DAILY:
+        counts = length
+    else:
+        first = month_numbers(start)
+        counts = month_numbers(end - 1) - first + 1
+
+    row = np.repeat(np.arange(len(cents)), counts)
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts)
+    line_start = start[row]
+
+    if granularity is Granularity.DAILY:
+        period = line_start + offset
+        lo, hi = offset, offset + 1
+    else:
+        period = first[row] + offset
+        # Начала месяцев - таблицей на диапазон, а не приведением datetime64 на строку.
+        base = int(first.min()) if len(first) else 0
+        starts = _month_start_ordinals(np.arange(base, int(period.max(initial=base)) + 2))
+        lo = np.maximum(starts[period - base], line_start) - line_start
+        hi = np.minimum(starts[period - base + 1], end[row]) - line_start
+
+    c, n = cents[row], length[row]
+    amount = (c * hi) // n - (c * lo) // n
+
+    return RecognitionSchedule(
+        granularity=granularity,
+        invoice_ids=np.frombuffer(bytes(lines.invoice_ids), dtype="S16"),
+        invoice_customer=np.array(lines.invoice_customer, dtype=np.uint32),
+        customers=np.array([c.encode() for c in lines.customers], dtype="S"),
+        invoice_currency=np.array(lines.invoice_currency, dtype=np.uint8),
+        currencies=np.array(lines.currencies, dtype="S3"),
+        invoice=np.array(lines.invoice, dtype=np.uint32)[row],
+        period=period.astype(np.int32),
+        cents=amount,
+    )
+
+
+def recognize(invoices: Iterable[Invoice], granularity: Granularity = Granularity.MONTHLY) -> RecognitionSchedule:
+    """График признания выручки по оплаченным инвойсам."""
+    return expand(RecognitionLines.from_invoices(invoices), granularity)
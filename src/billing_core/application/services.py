@@ -1,15 +1,39 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
 from datetime import date
 
-from billing_core.domain.errors import PromoCodeNotFoundError
+from billing_core.domain.errors import BillingError, PromoCodeNotFoundError, PromoNotValidError
 from billing_core.domain.invoice import Invoice, LineItem
-from billing_core.domain.proration import proration_line_items
-from billing_core.domain.subscription import Subscription
-
-from .repositories import InvoiceRepository, PlanRepository, PromoRepository, SubscriptionRepository
+from billing_core.domain.money import Money
+from billing_core.domain.periods import BillingCycle
+from billing_core.domain.plans import MeteredPlan, Plan
+from billing_core.domain.promo import PromoCode, PromoDiscount, PromoTemplate, generate_promo_codes
+from billing_core.domain.proration import prorate, proration_line_items
+from billing_core.domain.subscription import Subscription, SubscriptionStatus
+from billing_core.domain.usage import UsageEvent
+
+from .metrics import BillingMetrics
+from .promotions import PromotionEngine
+from .quotes import ProrationQuote, ProrationQuoteCache
+from .receivables import ReceivablesLedger
+from .repositories import InvoiceRepository, PeriodBilling, PlanRepository, PromoRepository, SubscriptionRepository
+from .stats import Contribution, ReconcileReport, RevenueStats
 from .tx import billing_transaction
+from .usage import UsageAggregator, UsageIngestResult
+
+
+@dataclass(frozen=True, slots=True)
+class PromoImportResult:
+    created: int
+    duplicates: int
+
+
+def _contribution(sub: Subscription, monthly: Money) -> Contribution | None:
+    if sub.status == SubscriptionStatus.CANCELED:
+        return None
+    return Contribution(sub.plan_code, sub.seats, monthly, trialing=sub.status == SubscriptionStatus.TRIALING)
 
 
 @dataclass(slots=True)
@@ -20,6 +44,12 @@ class BillingService:
     subs: SubscriptionRepository
     invoices: InvoiceRepository
     promos: PromoRepository
+    usage: UsageAggregator | None = None
+    promotions: PromotionEngine | None = None
+    quotes: ProrationQuoteCache = field(default_factory=ProrationQuoteCache)
+    stats: RevenueStats = field(default_factory=RevenueStats)
+    receivables: ReceivablesLedger = field(default_factory=ReceivablesLedger)
+    metrics: BillingMetrics | None = None
 
     def create_subscription(
         self,
@@ -30,9 +60,10 @@ class BillingService:
         seats: int = 1,
         trial_days: int = 0,
         period_days: int = 30,
+        billing_cycle: BillingCycle = BillingCycle.DAYS,
     ) -> tuple[Subscription, Invoice | None]:
-        with billing_transaction("create_subscription"):
-            plan = self.plans.get(plan_code)
+        with billing_transaction("create_subscription", self.metrics):
+            price = self.plans.snapshot().price(plan_code)
 
             sub = Subscription.create(
                 customer_id=customer_id,
@@ -41,13 +72,16 @@ class BillingService:
                 period_days=period_days,
                 trial_days=trial_days,
                 seats=seats,
+                billing_cycle=billing_cycle,
             )
             self.subs.save(sub)
+            list_monthly = price.monthly_price_for(seats=sub.seats)
+            self.stats.move(None, _contribution(sub, list_monthly))
 
             if trial_days > 0:
                 return sub, None
 
-            monthly = plan.monthly_price_for(seats=sub.seats)
+            monthly = prorate(list_monthly, sub.full_period_days, sub.full_cycle_days)
 
             if not monthly:
                 return sub, None
@@ -59,15 +93,19 @@ class BillingService:
                 currency=monthly.currency,
             )
             inv.add_line_item(LineItem("Subscription charge", monthly))
+            for li in self._promotion_lines(sub, monthly):
+                inv.add_line_item(li)
 
             self.invoices.save(inv)
             return sub, inv
 
-    def cancel_subscription(self, *, sub_id: str) -> Subscription:
-        with billing_transaction("cancel_subscription"):
+    def cancel_subscription(self, *, sub_id: str, on: date | None = None) -> Subscription:
+        with billing_transaction("cancel_subscription", self.metrics):
             sub = self.subs.get(sub_id)
-            sub.cancel()
+            before = _contribution(sub, self.plans.snapshot().monthly_price_for(sub.plan_code, seats=sub.seats))
+            sub.cancel(on=on)
             self.subs.save(sub)
+            self.stats.move(before, None)
             return sub
 
     def upgrade_subscription(
@@ -77,40 +115,17 @@ class BillingService:
         new_plan_code: str,
         change_date: date,
     ) -> Invoice | None:
-        with billing_transaction("upgrade_subscription"):
+        with billing_transaction("upgrade_subscription", self.metrics):
             sub = self.subs.get(sub_id)
+            quote = self._proration_quote(sub, new_plan_code=new_plan_code, new_seats=sub.seats, change_date=change_date)
 
-            old_plan = self.plans.get(sub.plan_code)
-            new_plan = self.plans.get(new_plan_code)
-
-            old_monthly = old_plan.monthly_price_for(seats=sub.seats)
-            new_monthly = new_plan.monthly_price_for(seats=sub.seats)
-
-            items = proration_line_items(
-                old_monthly=old_monthly,
-                new_monthly=new_monthly,
-                period_start=sub.current_period_start,
-                period_end=sub.current_period_end,
-                change_date=change_date,
-            )
+            quote, discount = self._discounted_quote(sub, quote)
 
+            before = _contribution(sub, quote.old_monthly)
             sub.change_plan(new_plan_code)
             self.subs.save(sub)
-
-            if not items:
-                return None
-
-            inv = Invoice(
-                customer_id=sub.customer_id,
-                period_start=sub.current_period_start,
-                period_end=sub.current_period_end,
-                currency=old_monthly.currency,
-            )
-            for li in items:
-                inv.add_line_item(li)
-
-            self.invoices.save(inv)
-            return inv
+            self.stats.move(before, _contribution(sub, quote.new_monthly))
+            return self._proration_invoice(sub, quote, discount)
 
     def change_seats(
         self,
@@ -119,51 +134,123 @@ class BillingService:
         new_seats: int,
         change_date: date,
     ) -> Invoice | None:
-        with billing_transaction("change_seats"):
+        with billing_transaction("change_seats", self.metrics):
             sub = self.subs.get(sub_id)
-            plan = self.plans.get(sub.plan_code)
+            sub.ensure_changeable("change_seats")
+            if new_seats < 1:
+                raise BillingError("new_seats must be >= 1")
+            quote = self._proration_quote(sub, new_plan_code=sub.plan_code, new_seats=new_seats, change_date=change_date)
+
+            quote, discount = self._discounted_quote(sub, quote)
 
-            old_monthly = plan.monthly_price_for(seats=sub.seats)
+            before = _contribution(sub, quote.old_monthly)
             sub.change_seats(new_seats)
             self.subs.save(sub)
+            self.stats.move(before, _contribution(sub, quote.new_monthly))
+            return self._proration_invoice(sub, quote, discount)
 
-            new_monthly = plan.monthly_price_for(seats=sub.seats)
+    def preview_upgrade(self, *, sub_id: str, new_plan_code: str, change_date: date) -> ProrationQuote:
+        """Что выставит upgrade_subscription, без изменения подписки и без инвойса."""
+        with billing_transaction("preview_upgrade", self.metrics):
+            sub = self.subs.get(sub_id)
+            sub.ensure_changeable("change_plan")
+            quote = self._proration_quote(sub, new_plan_code=new_plan_code, new_seats=sub.seats, change_date=change_date)
+            return self._discounted_quote(sub, quote)[0]
 
+    def preview_seat_change(self, *, sub_id: str, new_seats: int, change_date: date) -> ProrationQuote:
+        """Что выставит change_seats, без изменения подписки и без инвойса."""
+        with billing_transaction("preview_seat_change", self.metrics):
+            sub = self.subs.get(sub_id)
+            sub.ensure_changeable("change_seats")
+            if new_seats < 1:
+                raise BillingError("new_seats must be >= 1")
+            quote = self._proration_quote(sub, new_plan_code=sub.plan_code, new_seats=new_seats, change_date=change_date)
+            return self._discounted_quote(sub, quote)[0]
+
+    def _proration_quote(self, sub: Subscription, *, new_plan_code: str, new_seats: int, change_date: date) -> ProrationQuote:
+        """proration_line_items через кэш: ключ - планы, места, период и длина цикла, дата и версия каталога."""
+        catalog = self.plans.snapshot()
+        key = (
+            sub.plan_code,
+            new_plan_code,
+            sub.seats,
+            new_seats,
+            sub.current_period_start,
+            sub.current_period_end,
+            sub.full_cycle_days,
+            change_date,
+            catalog.version,
+        )
+        old_plan, old_seats = sub.plan_code, sub.seats
+        period_start, period_end, full_days = sub.current_period_start, sub.current_period_end, sub.full_cycle_days
+
+        def compute() -> ProrationQuote:
+            old_monthly = catalog.monthly_price_for(old_plan, seats=old_seats)
+            new_monthly = catalog.monthly_price_for(new_plan_code, seats=new_seats)
             items = proration_line_items(
                 old_monthly=old_monthly,
                 new_monthly=new_monthly,
-                period_start=sub.current_period_start,
-                period_end=sub.current_period_end,
+                period_start=period_start,
+                period_end=period_end,
                 change_date=change_date,
+                full_days=full_days,
             )
-
-            if not items:
-                return None
-
-            inv = Invoice(
-                customer_id=sub.customer_id,
-                period_start=sub.current_period_start,
-                period_end=sub.current_period_end,
-                currency=old_monthly.currency,
-            )
-            for li in items:
-                inv.add_line_item(li)
-
-            self.invoices.save(inv)
-            return inv
-
-    def issue_invoice(self, *, invoice_id: str) -> Invoice:
-        with billing_transaction("issue_invoice"):
+            return ProrationQuote(old_monthly=old_monthly, new_monthly=new_monthly, items=tuple(items))
+
+        return self.quotes.get_or_compute(key, compute)
+
+    def _discounted_quote(self, sub: Subscription, quote: ProrationQuote) -> tuple[ProrationQuote, PromoDiscount | None]:
+        """Котировка со строкой скидки промокода подписки; кэш хранит котировки по прайсу.
+
+        Процентная скидка применяется к кредиту и к доплате: обе считаются от цены,
+        которую клиент платит за период. Фиксированная - один раз за период и только
+        к доплате (итог > 0), как в invoice_usage.
+        """
+        discount = self._discount_for(sub)
+        if discount is None or not quote.items:
+            return quote, None
+        if discount.factor is not None:
+            discounted = [discount.apply(li.amount) for li in quote.items]
+            delta = sum(discounted[1:], discounted[0]) - quote.total
+        elif quote.total.amount > 0:
+            delta = discount.apply(quote.total) - quote.total
+        else:
+            return quote, None
+        if not delta:
+            return quote, None
+        line = LineItem(f"Promo {discount.code}", delta, quote.items[0].service_start, sub.current_period_end)
+        return replace(quote, items=(*quote.items, line)), discount
+
+    def _proration_invoice(self, sub: Subscription, quote: ProrationQuote, discount: PromoDiscount | None) -> Invoice | None:
+        if not quote.items:
+            return None
+
+        inv = Invoice(
+            customer_id=sub.customer_id,
+            period_start=sub.current_period_start,
+            period_end=sub.current_period_end,
+            currency=quote.old_monthly.currency,
+            items=list(quote.items),
+        )
+        self.invoices.save(inv)
+        if discount is not None and discount.fixed is not None:
+            self._mark_fixed_discount(sub)
+        return inv
+
+    def issue_invoice(self, *, invoice_id: str, on: date | None = None) -> Invoice:
+        with billing_transaction("issue_invoice", self.metrics):
             inv = self.invoices.get(invoice_id)
-            inv.issue()
+            inv.issue(on=on)
             self.invoices.save(inv)
+            self.receivables.add(inv)
             return inv
 
     def pay_invoice(self, *, invoice_id: str) -> Invoice:
-        with billing_transaction("pay_invoice"):
+        with billing_transaction("pay_invoice", self.metrics):
             inv = self.invoices.get(invoice_id)
             inv.pay()
             self.invoices.save(inv)
+            self.receivables.remove(inv.invoice_id)
             return inv
 
     def apply_promo(
@@ -173,7 +260,7 @@ class BillingService:
         promo_code: str,
         today: date,
     ) -> Subscription:
-        with billing_transaction("apply_promo"):
+        with billing_transaction("apply_promo", self.metrics):
             sub = self.subs.get(sub_id)
 
             try:
@@ -183,11 +270,243 @@ class BillingService:
 
             already_used = self.promos.is_used_by_customer(code=promo_code, customer_id=sub.customer_id)
             promo.validate_for(today=today, customer_id=sub.customer_id, already_used=already_used)
+            fixed = promo.fixed_discount
+            if fixed is not None and fixed.currency != self.plans.snapshot().price(sub.plan_code).currency:
+                raise PromoNotValidError(promo_code, "currency mismatch with plan")
 
+            previous = sub.promo_code
             sub.apply_promo(promo_code)
+            # Лимит погашений проверяется атомарно в репозитории; при отказе промокод откатывается.
+            try:
+                if promo.tracks_redemptions and not self.promos.mark_used(code=promo_code, customer_id=sub.customer_id):
+                    raise PromoNotValidError(promo_code, "already used")
+            except PromoNotValidError:
+                sub.apply_promo(previous)
+                raise
+
             self.subs.save(sub)
+            return sub
 
-            if promo.is_single_use:
-                self.promos.mark_used(code=promo_code, customer_id=sub.customer_id)
+    def generate_promos(self, template: PromoTemplate, *, count: int) -> list[str]:
+        """count новых уникальных кодов по шаблону; коллизии с репозиторием отсеиваются пачками."""
+        with billing_transaction("generate_promos", self.metrics):
+            codes = generate_promo_codes(template, count, taken=self.promos.existing_codes)
+            # Между проверкой и записью код мог занять параллельный add/import: такие заменяются новыми.
+            clashed = self.promos.add_generated(template, codes)
+            while clashed:
+                codes = [code for code in codes if code not in clashed]
+                extra = generate_promo_codes(template, len(clashed), taken=self.promos.existing_codes)
+                clashed = self.promos.add_generated(template, extra)
+                codes += [code for code in extra if code not in clashed]
+            return codes
+
+    def import_promos(self, promos: Sequence[PromoCode]) -> PromoImportResult:
+        """Добавляет промокоды пачкой; коды, уже существующие в репозитории или повторённые в пачке, пропускаются."""
+        with billing_transaction("import_promos", self.metrics):
+            taken = self.promos.existing_codes(p.code for p in promos)
+            fresh: dict[str, PromoCode] = {}
+            for promo in promos:
+                if promo.code not in taken:
+                    promo.check_terms()
+                    fresh.setdefault(promo.code, promo)
+            self.promos.add_many(fresh.values())
+            return PromoImportResult(created=len(fresh), duplicates=len(promos) - len(fresh))
+
+    def ingest_usage(self, events: Sequence[UsageEvent]) -> UsageIngestResult:
+        """Принимает пачку событий целиком: сначала проверяет подписки, потом агрегирует."""
+        with billing_transaction("ingest_usage", self.metrics):
+            meter = self._meter()
+            for sub_id in {ev.subscription_id for ev in events}:
+                self.subs.get(sub_id)
+            return meter.record(events)
+
+    def invoice_usage(self, *, sub_id: str) -> Invoice | None:
+        """Инвойс за потребление текущего периода, ещё не выставленное (для metered-планов).
+
+        Повторный вызов выставляет только потребление, принятое после прошлого инвойса;
+        остаток периода выставляется при продлении.
+        """
+        with billing_transaction("invoice_usage", self.metrics):
+            self._meter()
+            sub = self.subs.get(sub_id)
+            charge = self._usage_charge(sub, self.plans.get(sub.plan_code))
+            if charge is None:
+                return None
+            items, billing = charge
 
-            return sub
+            inv = Invoice(
+                customer_id=sub.customer_id,
+                period_start=sub.current_period_start,
+                period_end=sub.current_period_end,
+                currency=items[0].amount.currency,
+                items=items,
+            )
+            self.invoices.save(inv)
+            self.invoices.save_period_billing(sub_id=sub.id, period_start=sub.current_period_start, billing=billing)
+            return inv
+
+    def renew_subscription(self, *, sub_id: str, period_days: int = 30) -> Invoice | None:
+        """Переводит подписку в следующий период и выставляет инвойс за него (со скидкой промокода)."""
+        with billing_transaction("renew_subscription", self.metrics):
+            invoices = self._renew([self.subs.get(sub_id)], period_days=period_days)
+            return invoices[0] if invoices else None
+
+    def renew_subscriptions(self, *, sub_ids: Sequence[str], period_days: int = 30) -> list[Invoice]:
+        """Пакетное продление: скидки применяются одним apply_many на каждый промокод."""
+        with billing_transaction("renew_subscriptions", self.metrics):
+            return self._renew([self.subs.get(sub_id) for sub_id in sub_ids], period_days=period_days)
+
+    def _renew(self, subs: Sequence[Subscription], *, period_days: int) -> list[Invoice]:
+        """Сначала все суммы считаются по продлённым копиям, потом подписки меняются и сохраняются.
+
+        Ошибка в расчёте (например, скидка не в валюте плана) не оставляет
+        ни одну подписку пачки в новом периоде без инвойса. Невыставленное
+        потребление закрываемого периода попадает в инвойс продления.
+        """
+        snapshot = self.plans.snapshot()
+        renewed = [sub.renewed(period_days=period_days) for sub in subs]
+        list_prices = [snapshot.price(nxt.plan_code).monthly_price_for(seats=nxt.seats) for nxt in renewed]
+        charges: list[tuple[int, Money, list[LineItem]]] = []
+        for i, (nxt, list_monthly) in enumerate(zip(renewed, list_prices, strict=True)):
+            # Неполный период после пробного (до якорного дня) оплачивается пропорционально, как при создании.
+            monthly = prorate(list_monthly, nxt.full_period_days, nxt.full_cycle_days)
+            if monthly:
+                charges.append((i, monthly, self._promotion_lines(nxt, monthly)))
+
+        by_promo: dict[str, list[int]] = {}
+        for j, (i, _, _) in enumerate(charges):
+            if renewed[i].promo_code is not None:
+                by_promo.setdefault(renewed[i].promo_code, []).append(j)
+
+        discounted: dict[int, tuple[PromoDiscount, Money]] = {}
+        for code, idx in by_promo.items():
+            discount = self.promos.get_discount(code)
+            idx = [
+                j
+                for j in idx
+                if discount.is_valid_on(renewed[charges[j][0]].current_period_start)
+                and not self._fixed_discount_used(renewed[charges[j][0]], discount)
+            ]
+            # Промокод применяется к сумме после автоматических акций.
+            totals = discount.apply_many([sum((li.amount for li in charges[j][2]), charges[j][1]) for j in idx])
+            discounted.update((j, (discount, total)) for j, total in zip(idx, totals, strict=True))
+
+        usage: dict[int, list[LineItem]] = {}
+        if self.usage is not None:
+            for i, sub in enumerate(subs):
+                charge = self._usage_charge(sub, snapshot.get(sub.plan_code))
+                if charge is not None:
+                    usage[i] = charge[0]
+
+        closed = [sub.current_period_start for sub in subs]
+        for sub, monthly in zip(subs, list_prices, strict=True):
+            was_trialing = sub.status == SubscriptionStatus.TRIALING
+            sub.renew(period_days=period_days)
+            self.subs.save(sub)
+            if was_trialing:
+                self.stats.move(Contribution(sub.plan_code, sub.seats, monthly, trialing=True), _contribution(sub, monthly))
+
+        invoices: list[Invoice] = []
+        charge_of = {i: j for j, (i, _, _) in enumerate(charges)}
+        for i, sub in enumerate(subs):
+            j = charge_of.get(i)
+            if j is not None or i in usage:
+                inv = Invoice(
+                    customer_id=sub.customer_id,
+                    period_start=sub.current_period_start,
+                    period_end=sub.current_period_end,
+                    currency=list_prices[i].currency,
+                )
+                if j is not None:
+                    _, monthly, promotion_lines = charges[j]
+                    inv.add_line_item(LineItem("Subscription charge", monthly))
+                    for li in promotion_lines:
+                        inv.add_line_item(li)
+                    if j in discounted:
+                        discount, total = discounted[j]
+                        self._add_discount_line(inv, discount, total)
+                        if discount.fixed is not None:
+                            self._mark_fixed_discount(sub)
+                for li in usage.get(i, ()):
+                    inv.add_line_item(li)
+                self.invoices.save(inv)
+                invoices.append(inv)
+            self.invoices.close_period(sub_id=sub.id, period_start=closed[i])
+        return invoices
+
+    def reconcile_stats(self, *, fix: bool = False) -> ReconcileReport:
+        """Сверка инкрементальных агрегатов с полным пересчётом; fix=True заменяет их пересчётом."""
+        with billing_transaction("reconcile_stats", self.metrics):
+            return self.stats.reconcile(self.subs.columns(), self.plans.snapshot(), fix=fix)
+
+    def _promotion_lines(self, sub: Subscription, monthly: Money) -> list[LineItem]:
+        if self.promotions is None:
+            return []
+        quote = self.promotions.evaluate(
+            plan_code=sub.plan_code,
+            seats=sub.seats,
+            subtotal=monthly,
+            on=sub.current_period_start,
+            start_date=sub.start_date,
+        )
+        return quote.line_items()
+
+    def _usage_charge(self, sub: Subscription, plan: Plan) -> tuple[list[LineItem], PeriodBilling] | None:
+        """Строки за ещё не выставленное потребление периода sub (со скидкой промокода) и новый учёт периода."""
+        if not isinstance(plan, MeteredPlan):
+            return None
+        meter = self._meter()
+        meter.flush()
+        totals = meter.repo.totals_for(
+            sub_id=sub.id,
+            period_start=sub.current_period_start,
+            period_end=sub.current_period_end,
+        )
+        billed = self.invoices.period_billing(sub_id=sub.id, period_start=sub.current_period_start)
+        unbilled = {metric: quantity - billed.usage.get(metric, 0) for metric, quantity in totals.items()}
+        items = [
+            replace(li, service_start=sub.current_period_start, service_end=sub.current_period_end)
+            for li in plan.usage_line_items(unbilled)
+        ]
+        if not items:
+            return None
+
+        fixed_used = billed.fixed_discount
+        discount = self._discount_for(sub)
+        if discount is not None:
+            subtotal = sum((li.amount for li in items[1:]), items[0].amount)
+            delta = discount.apply(subtotal) - subtotal
+            if delta:
+                items.append(LineItem(f"Promo {discount.code}", delta, sub.current_period_start, sub.current_period_end))
+            fixed_used = fixed_used or discount.fixed is not None
+        return items, PeriodBilling(usage=dict(totals), fixed_discount=fixed_used)
+
+    def _discount_for(self, sub: Subscription) -> PromoDiscount | None:
+        if sub.promo_code is None:
+            return None
+        discount = self.promos.get_discount(sub.promo_code)
+        if not discount.is_valid_on(sub.current_period_start) or self._fixed_discount_used(sub, discount):
+            return None
+        return discount
+
+    def _fixed_discount_used(self, sub: Subscription, discount: PromoDiscount) -> bool:
+        if discount.fixed is None:
+            return False
+        return self.invoices.period_billing(sub_id=sub.id, period_start=sub.current_period_start).fixed_discount
+
+    def _mark_fixed_discount(self, sub: Subscription) -> None:
+        billing = self.invoices.period_billing(sub_id=sub.id, period_start=sub.current_period_start)
+        self.invoices.save_period_billing(
+            sub_id=sub.id, period_start=sub.current_period_start, billing=replace(billing, fixed_discount=True)
+        )
+
+    @staticmethod
+    def _add_discount_line(inv: Invoice, discount: PromoDiscount, discounted_total: Money) -> None:
+        delta = discounted_total - inv.total
+        if delta:
+            inv.add_line_item(LineItem(f"Promo {discount.code}", delta))
+
+    def _meter(self) -> UsageAggregator:
+        if self.usage is None:
+            raise BillingError("usage metering is not configured")
+        return self.usage
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from billing_core.domain.catalog import CatalogSnapshot
+from billing_core.domain.money import Money
+from billing_core.domain.subscription import SubscriptionStatus
+
+from .repositories import SUBSCRIPTION_STATUSES, SubscriptionColumns
+
+_CENT = Decimal("0.01")
+_ACTIVE = SUBSCRIPTION_STATUSES.index(SubscriptionStatus.ACTIVE)
+_TRIALING = SUBSCRIPTION_STATUSES.index(SubscriptionStatus.TRIALING)
+
+
+@dataclass(frozen=True, slots=True)
+class Contribution:
+    """Вклад одной подписки в агрегаты: платная - в MRR и места, trial - только в счётчик."""
+
+    plan_code: str
+    seats: int
+    monthly: Money
+    trialing: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PlanStats:
+    plan_code: str
+    currency: str
+    active: int
+    trialing: int
+    seats: int
+    mrr: Money
+
+
+@dataclass(frozen=True, slots=True)
+class ReconcileReport:
+    """Расхождения (plan, currency) -> (агрегат, пересчёт); fixed - агрегаты заменены пересчётом."""
+
+    subscriptions: int
+    mismatches: dict[tuple[str, str], tuple[PlanStats | None, PlanStats | None]]
+    fixed: bool
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+# (active, trialing, seats, mrr в центах)
+_Row = list[int]
+
+
+@dataclass(slots=True)
+class RevenueStats:
+    """Текущие MRR, места и trial-подписки по (plan_code, currency), обновляются за O(1).
+
+    BillingService передаёт вклад подписки до и после изменения (move);
+    цены берутся те же, что сервис уже посчитал для инвойса/proration.
+    Суммы хранятся в центах. reconcile() сверяет с полным пересчётом.
+    """
+
+    _rows: dict[tuple[str, str], _Row] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def move(self, before: Contribution | None, after: Contribution | None) -> None:
+        with self._lock:
+            if before is not None:
+                self._apply(before, -1)
+            if after is not None:
+                self._apply(after, 1)
+
+    def _apply(self, c: Contribution, sign: int) -> None:
+        row = self._rows.get((c.plan_code, c.monthly.currency))
+        if row is None:
+            row = self._rows[(c.plan_code, c.monthly.currency)] = [0, 0, 0, 0]
+        if c.trialing:
+            row[1] += sign
+            return
+        row[0] += sign
+        row[2] += sign * c.seats
+        row[3] += sign * int(c.monthly.amount / _CENT)
+
+    def snapshot(self) -> list[PlanStats]:
+        with self._lock:
+            rows = {key: tuple(row) for key, row in self._rows.items()}
+        return _to_stats(rows)
+
+    def mrr(self) -> dict[str, Money]:
+        totals: dict[str, int] = {}
+        with self._lock:
+            for (_, currency), row in self._rows.items():
+                totals[currency] = totals.get(currency, 0) + row[3]
+        return {currency: Money(Decimal(cents) * _CENT, currency) for currency, cents in sorted(totals.items())}
+
+    def reconcile(self, columns: SubscriptionColumns, snapshot: CatalogSnapshot, *, fix: bool = False) -> ReconcileReport:
+        """Полный пересчёт по колонкам подписок и сравнение с агрегатами (O(подписок))."""
+        expected = recompute(columns, snapshot)
+        with self._lock:
+            actual = {key: tuple(row) for key, row in self._rows.items() if any(row)}
+            if fix:
+                self._rows = {key: list(row) for key, row in expected.items()}
+
+        mismatches: dict[tuple[str, str], tuple[PlanStats | None, PlanStats | None]] = {}
+        for key in actual.keys() | expected.keys():
+            if actual.get(key) != expected.get(key):
+                got = _to_stats({key: actual[key]})[0] if key in actual else None
+                want = _to_stats({key: expected[key]})[0] if key in expected else None
+                mismatches[key] = (got, want)
+        return ReconcileReport(subscriptions=len(columns), mismatches=mismatches, fixed=fix and bool(mismatches))
+
+
+def recompute(columns: SubscriptionColumns, snapshot: CatalogSnapshot) -> dict[tuple[str, str], tuple[int, ...]]:
+    """Агрегаты с нуля; цена считается один раз на пару (plan, seats)."""
+    rows: dict[tuple[str, str], list[int]] = {}
+    prices: dict[tuple[int, int], tuple[str, int]] = {}
+    codes = columns.plan_codes
+    for plan, seats, status in zip(columns.plan, columns.seats, columns.status, strict=True):
+        if status != _ACTIVE and status != _TRIALING:
+            continue
+        priced = prices.get((plan, seats))
+        if priced is None:
+            monthly = snapshot.monthly_price_for(codes[plan], seats=seats)
+            priced = prices[(plan, seats)] = (monthly.currency, int(monthly.amount / _CENT))
+        currency, cents = priced
+        row = rows.get((codes[plan], currency))
+        if row is None:
+            row = rows[(codes[plan], currency)] = [0, 0, 0, 0]
+        if status == _TRIALING:
+            row[1] += 1
+        else:
+            row[0] += 1
+            row[2] += seats
+            row[3] += cents
+    return {key: tuple(row) for key, row in rows.items()}
+
+
+def _to_stats(rows: dict[tuple[str, str], tuple[int, ...]]) -> list[PlanStats]:
+    return [
+        PlanStats(
+            plan_code=plan,
+            currency=currency,
+            active=row[0],
+            trialing=row[1],
+            seats=row[2],
+            mrr=Money(Decimal(row[3]) * _CENT, currency),
+        )
+        for (plan, currency), row in sorted(rows.items())
+        if any(row)
+    ]
@@ -1,18 +1,84 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import threading
+import time
 from contextlib import contextmanager
+from typing import Any
+
+from .metrics import BillingMetrics
 
 logger = logging.getLogger(__name__)
 
+_tx_counter = itertools.count()
+_active: dict[int, str] | None = None  # thread id -> имя текущей транзакции, пока включено отслеживание
+
+
+def track_active_transactions(enabled: bool) -> None:
+    """Включает учёт активной транзакции по потокам (нужен профайлеру); выключено - ноль работы."""
+    global _active
+    _active = {} if enabled else None
+
+
+def active_transaction(thread_id: int) -> str | None:
+    active = _active
+    return active.get(thread_id) if active is not None else None
+
+
+def _wanted(seq: int) -> bool:
+    """Нужны ли BEGIN/COMMIT транзакции seq хоть одному обработчику.
+
+    Частоту задаёт обработчик (атрибут sample_every, см. DroppingQueueHandler); проверка до
+    создания записи, чтобы несэмплированные транзакции не платили за LogRecord.
+    """
+    lg: logging.Logger | None = logger
+    while lg is not None:
+        for h in lg.handlers:
+            if seq % getattr(h, "sample_every", 1) == 0:
+                return True
+        lg = lg.parent if lg.propagate else None
+    return False
+
+
+def _log_extra(name: str, event: str, seq: int, t0: float) -> dict[str, Any]:
+    extra: dict[str, Any] = {"use_case": name, "event": event, "tx_seq": seq}
+    if t0:
+        extra["duration_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return extra
+
 
 @contextmanager
-def billing_transaction(name: str = "billing") -> None:
-    logger.info("BEGIN %s", name)
+def billing_transaction(name: str = "billing", metrics: BillingMetrics | None = None) -> None:
+    """Логирует BEGIN/COMMIT/ROLLBACK; с включённым metrics снимает латентность и ошибки use case'а."""
+    timed = metrics is not None and metrics.enabled
+    seq = next(_tx_counter)
+    sampled = logger.isEnabledFor(logging.INFO) and _wanted(seq)
+    if sampled:
+        logger.info("BEGIN %s", name, extra={"use_case": name, "event": "begin", "tx_seq": seq})
+
+    active = _active
+    if active is not None:
+        tid = threading.get_ident()
+        outer = active.get(tid)
+        active[tid] = name
+
+    t0 = time.perf_counter() if sampled or timed else 0.0
     try:
         yield
-    except Exception:
-        logger.exception("ROLLBACK %s", name)
+    except Exception as e:
+        if timed:
+            metrics.observe_error(name, e)
+        logger.exception("ROLLBACK %s", name, extra=_log_extra(name, "rollback", seq, t0))
         raise
     else:
-        logger.info("COMMIT %s", name)
+        if sampled:
+            logger.info("COMMIT %s", name, extra=_log_extra(name, "commit", seq, t0))
+    finally:
+        if timed:
+            metrics.observe(name, time.perf_counter() - t0)
+        if active is not None:
+            if outer is None:
+                active.pop(tid, None)
+            else:
+                active[tid] = outer
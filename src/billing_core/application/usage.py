@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from billing_core.domain.usage import UsageEvent
+
+from .repositories import UsageRepository
+
+
+@dataclass(frozen=True, slots=True)
+class UsageIngestResult:
+    accepted: int
+    duplicates: int
+
+
+@dataclass(slots=True)
+class UsageAggregator:
+    """Агрегирует события потребления в памяти и периодически сбрасывает их в UsageRepository.
+
+    Счётчики ключуются (sub_id, metric, день), поэтому их число ограничено
+    flush_every, а не количеством событий. Ключи идемпотентности хранятся
+    в LRU на dedup_capacity записей.
+    """
+
+    repo: UsageRepository
+    flush_every: int = 10_000
+    flush_interval: float = 1.0
+    dedup_capacity: int = 1_000_000
+
+    _pending: dict[tuple[str, str, int], int] = field(default_factory=dict)
+    _seen: OrderedDict[str, None] = field(default_factory=OrderedDict)
+    _last_flush: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, events: Iterable[UsageEvent]) -> UsageIngestResult:
+        accepted = duplicates = 0
+
+        with self._lock:
+            pending = self._pending
+            seen = self._seen
+            for ev in events:
+                key = ev.idempotency_key
+                if key is not None:
+                    if key in seen:
+                        seen.move_to_end(key)
+                        duplicates += 1
+                        continue
+                    seen[key] = None
+                    if len(seen) > self.dedup_capacity:
+                        seen.popitem(last=False)
+
+                counter = (ev.subscription_id, ev.metric, ev.day)
+                pending[counter] = pending.get(counter, 0) + ev.quantity
+                accepted += 1
+
+            if len(pending) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+        return UsageIngestResult(accepted=accepted, duplicates=duplicates)
+
+    def flush(self) -> int:
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        flushed = len(self._pending)
+        if flushed:
+            self.repo.add_totals(self._pending)
+            self._pending = {}
+        self._last_flush = time.monotonic()
+        return flushed
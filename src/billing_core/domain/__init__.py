@@ -1,8 +1,10 @@
-from .catalog import PlanCatalog
+from .catalog import CatalogSnapshot, PlanCatalog, PlanPrice
 from .invoice import Invoice, InvoiceStatus, LineItem
 from .money import Money
-from .plans import FlatMonthlyPlan, FreePlan, PerSeatMonthlyPlan, Plan
-from .promo import PromoCode
+from .periods import BillingCycle
+from .plans import FlatMonthlyPlan, FreePlan, PerSeatMonthlyPlan, Plan, PriceTier, TieredSeatPlan, VolumeSeatPlan
+from .promo import PromoCode, PromoDiscount, PromoTemplate
+from .promotions import Promotion, PromotionQuote
 from .subscription import Subscription, SubscriptionStatus
 
 __all__ = [
@@ -11,11 +13,21 @@ __all__ = [
     "FreePlan",
     "FlatMonthlyPlan",
     "PerSeatMonthlyPlan",
+    "TieredSeatPlan",
+    "VolumeSeatPlan",
+    "PriceTier",
     "PlanCatalog",
+    "CatalogSnapshot",
+    "PlanPrice",
     "Subscription",
     "SubscriptionStatus",
+    "BillingCycle",
     "Invoice",
     "InvoiceStatus",
     "LineItem",
     "PromoCode",
+    "PromoDiscount",
+    "PromoTemplate",
+    "Promotion",
+    "PromotionQuote",
 ]
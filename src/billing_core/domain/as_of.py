@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+
+_AS_OF: ContextVar[date | None] = ContextVar("billing_as_of", default=None)
+
+
+def as_of_date() -> date:
+    """Дата, на которую считаются computed-свойства: из контекста или сегодня."""
+    day = _AS_OF.get()
+    return day if day is not None else date.today()
+
+
+@contextmanager
+def evaluated_as_of(day: date | None = None) -> Iterator[date]:
+    """Фиксирует дату на запрос или пакетную задачу; None - сегодняшняя дата, взятая один раз.
+
+    Вложенный контекст перекрывает внешний и восстанавливает его на выходе.
+    """
+    fixed = day if day is not None else date.today()
+    token = _AS_OF.set(fixed)
+    try:
+        yield fixed
+    finally:
+        _AS_OF.reset(token)
@@ -1,18 +1,98 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from types import MappingProxyType
 
+from .errors import BillingError
+from .money import Money
 from .plans import Plan, PlanNotFoundError
 
+DEFAULT_PLAN_CONFIGS: tuple[str, ...] = (
+    "free;FREE;Free;EUR",
+    "flat;PRO;Pro;EUR;20",
+    "per_seat;TEAM;Team;EUR;10;5",
+)
 
-@dataclass(slots=True)
-class PlanCatalog:
-    """Каталог планов."""
 
-    _plans: dict[str, Plan] = field(default_factory=dict)
+@dataclass(frozen=True, slots=True)
+class PlanPrice:
+    """Предрасчитанные цены плана: валюта, requires_seats и линейные коэффициенты."""
 
-    def add(self, plan: Plan) -> None:
-        self._plans[plan.code] = plan
+    code: str
+    currency: str
+    requires_seats: bool
+    monthly_price: Money
+    base: Decimal
+    per_seat: Decimal
+    plan: Plan | None = None  # только для нелинейных планов
+
+    @classmethod
+    def from_plan(cls, plan: Plan) -> PlanPrice:
+        monthly = plan.monthly_price
+        terms = plan.price_terms
+        if terms is None:
+            return cls(
+                code=plan.code,
+                currency=monthly.currency,
+                requires_seats=plan.requires_seats,
+                monthly_price=monthly,
+                base=Decimal("0"),
+                per_seat=Decimal("0"),
+                plan=plan,
+            )
+
+        base, per_seat = terms
+        return cls(
+            code=plan.code,
+            currency=monthly.currency,
+            requires_seats=plan.requires_seats,
+            monthly_price=monthly,
+            base=base.amount,
+            per_seat=per_seat.amount,
+        )
+
+    def monthly_price_for(self, *, seats: int = 1) -> Money:
+        """O(1): без цикла по местам и без обращения к стратегии плана."""
+        if self.plan is not None:
+            return self.plan.monthly_price_for(seats=seats)
+        if self.requires_seats and seats < 1:
+            raise BillingError("seats must be >= 1")
+        if seats == 1 or not self.per_seat:
+            return self.monthly_price
+        return Money(self.base + self.per_seat * seats, self.currency)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogSnapshot:
+    """Неизменяемый снимок каталога планов.
+
+    Изменения делаются copy-on-write через with_plan(): старый снимок остаётся
+    валидным, поэтому читатели могут держать ссылку на него без блокировок.
+    """
+
+    _plans: Mapping[str, Plan] = field(default_factory=lambda: MappingProxyType({}))
+    _prices: Mapping[str, PlanPrice] = field(default_factory=lambda: MappingProxyType({}))
+    version: int = 0
+
+    @classmethod
+    def from_plans(cls, plans: Iterable[Plan]) -> CatalogSnapshot:
+        by_code = {p.code: p for p in plans}
+        prices = {code: PlanPrice.from_plan(p) for code, p in by_code.items()}
+        return cls(MappingProxyType(by_code), MappingProxyType(prices))
+
+    def with_plan(self, plan: Plan) -> CatalogSnapshot:
+        return self.with_plans((plan,))
+
+    def with_plans(self, plans: Iterable[Plan]) -> CatalogSnapshot:
+        by_code = dict(self._plans)
+        prices = dict(self._prices)
+        for p in plans:
+            by_code[p.code] = p
+            prices[p.code] = PlanPrice.from_plan(p)
+        return CatalogSnapshot(MappingProxyType(by_code), MappingProxyType(prices), self.version + 1)
 
     def get(self, code: str) -> Plan:
         plan = self._plans.get(code)
@@ -20,21 +100,58 @@ class PlanCatalog:
             raise PlanNotFoundError(code)
         return plan
 
+    def price(self, code: str) -> PlanPrice:
+        price = self._prices.get(code)
+        if price is None:
+            raise PlanNotFoundError(code)
+        return price
+
+    def monthly_price_for(self, code: str, *, seats: int = 1) -> Money:
+        return self.price(code).monthly_price_for(seats=seats)
+
     def __getitem__(self, code: str) -> Plan:
         return self.get(code)
 
-    def __iter__(self):
+    def __contains__(self, code: object) -> bool:
+        return code in self._plans
+
+    def __iter__(self) -> Iterator[Plan]:
         return iter(self._plans.values())
 
     def __len__(self) -> int:
         return len(self._plans)
 
-    @classmethod
-    def load_defaults(cls) -> PlanCatalog:
-        catalog = cls()
 
-        catalog.add(Plan.from_config("free;FREE;Free;EUR"))
-        catalog.add(Plan.from_config("flat;PRO;Pro;EUR;20"))
-        catalog.add(Plan.from_config("per_seat;TEAM;Team;EUR;10;5"))
+@lru_cache(maxsize=1)
+def default_snapshot() -> CatalogSnapshot:
+    """Снимок дефолтных планов FREE/PRO/TEAM; DSL разбирается один раз на процесс."""
+    return CatalogSnapshot.from_plans(Plan.from_config(c) for c in DEFAULT_PLAN_CONFIGS)
+
+
+@dataclass(slots=True)
+class PlanCatalog:
+    """Каталог планов."""
+
+    _snapshot: CatalogSnapshot = field(default_factory=CatalogSnapshot)
+
+    def add(self, plan: Plan) -> None:
+        self._snapshot = self._snapshot.with_plan(plan)
+
+    def get(self, code: str) -> Plan:
+        return self._snapshot.get(code)
 
-        return catalog
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def __getitem__(self, code: str) -> Plan:
+        return self.get(code)
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    @classmethod
+    def load_defaults(cls) -> PlanCatalog:
+        return cls(default_snapshot())
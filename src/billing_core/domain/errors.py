@@ -44,6 +44,10 @@ class PromoNotValidError(BillingError):
         self.reason = reason
 
 
+class InvalidPromoTermsError(PromoNotValidError):
+    """Raised when promo terms are invalid on creation (percent range, kind, limits), not on redemption."""
+
+
 class SubscriptionNotFoundError(BillingError):
     def __init__(self, sub_id: str) -> None:
         super().__init__(f"Subscription not found: {sub_id!r}")
@@ -60,3 +64,11 @@ class PromoCodeNotFoundError(BillingError):
     def __init__(self, code: str) -> None:
         super().__init__(f"Promo code not found: {code!r}")
         self.code = code
+
+
+class FxRateNotFoundError(BillingError):
+    def __init__(self, base: str, quote: str, on: object) -> None:
+        super().__init__(f"No FX rate {base}/{quote} on or before {on}")
+        self.base = base
+        self.quote = quote
+        self.on = on
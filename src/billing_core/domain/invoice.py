@@ -26,6 +26,9 @@ class InvalidInvoiceLineItemError(BillingError):
 class LineItem:
     description: str
     amount: Money
+    # Период оказания услуги, если он уже периода инвойса (proration - от даты изменения).
+    service_start: date | None = None
+    service_end: date | None = None
 
 
 class Invoice(AuditMixin, TimestampMixin):
@@ -38,6 +41,7 @@ class Invoice(AuditMixin, TimestampMixin):
         "_currency",
         "_status",
         "_items",
+        "_issued_on",
     )
 
     def __init__(
@@ -66,6 +70,7 @@ class Invoice(AuditMixin, TimestampMixin):
         self._currency = currency_norm
         self._status = status
         self._items: list[LineItem] = []
+        self._issued_on: date | None = None
 
         if items:
             for li in items:
@@ -73,7 +78,7 @@ class Invoice(AuditMixin, TimestampMixin):
 
     @property
     def invoice_id(self) -> str:
-        return self._customer_id
+        return self._id
 
     @property
     def customer_id(self) -> str:
@@ -95,6 +100,10 @@ class Invoice(AuditMixin, TimestampMixin):
     def status(self) -> InvoiceStatus:
         return self._status
 
+    @property
+    def issued_on(self) -> date | None:
+        return self._issued_on
+
     def __len__(self) -> int:
         return len(self._items)
 
@@ -119,10 +128,12 @@ class Invoice(AuditMixin, TimestampMixin):
             total = total + li.amount
         return total
 
-    def issue(self) -> None:
+    def issue(self, *, on: date | None = None) -> None:
+        """Выставление; дата (по умолчанию сегодня, не X-As-Of) - точка отсчёта для aging."""
         if self._status != InvoiceStatus.DRAFT:
             raise InvalidStateTransitionError("Invoice", self._status.value, "issued")
         self._status = InvoiceStatus.ISSUED
+        self._issued_on = on or date.today()
 
     def pay(self) -> None:
         if self._status != InvoiceStatus.ISSUED:
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import date, timedelta
+from enum import StrEnum
+from functools import lru_cache
+
+from .errors import BillingError
+
+
+class BillingCycle(StrEnum):
+    DAYS = "days"  # фиксированные period_days (поведение по умолчанию)
+    CALENDAR_MONTH = "calendar_month"  # с 1-го числа; первый период неполный
+    ANNIVERSARY = "anniversary"  # в день старта каждого месяца
+
+
+def month_index(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def anchor_day_for(cycle: BillingCycle, first_paid_day: date) -> int:
+    """День месяца, к которому привязываются границы периодов."""
+    return 1 if cycle is BillingCycle.CALENDAR_MONTH else first_paid_day.day
+
+
+def _anchored(anchor_day: int, index: int) -> date:
+    year, month0 = divmod(index, 12)
+    # 31 -> 30/29/28 в коротких месяцах; следующий месяц снова берёт исходный день.
+    return date(year, month0 + 1, min(anchor_day, monthrange(year, month0 + 1)[1]))
+
+
+# 31 день привязки x ~80 лет - кэш держит все реально встречающиеся границы.
+@lru_cache(maxsize=32_768)
+def month_period(anchor_day: int, index: int) -> tuple[date, date]:
+    """Границы месячного периода, начинающегося в месяце index (year*12 + month-1) в день anchor_day."""
+    if not 1 <= anchor_day <= 31:
+        raise BillingError("anchor_day must be within 1..31")
+    return _anchored(anchor_day, index), _anchored(anchor_day, index + 1)
+
+
+def period_end(cycle: BillingCycle, *, start: date, anchor_day: int, period_days: int = 30) -> date:
+    """Конец периода, начинающегося в start.
+
+    Для месячных циклов start - граница предыдущего периода (или дата
+    старта подписки), конец - ближайшая граница в следующем месяце.
+    """
+    if cycle is BillingCycle.DAYS:
+        if period_days < 1:
+            raise BillingError("period_days must be >= 1")
+        return start + timedelta(days=period_days)
+    return month_period(anchor_day, month_index(start))[1]
+
+
+def cycle_days(cycle: BillingCycle, *, start: date, anchor_day: int, period_days: int = 30) -> int:
+    """Длина полного периода, в который попадает start (база для неполного первого периода)."""
+    if cycle is BillingCycle.DAYS:
+        return period_days
+    period_start, end = month_period(anchor_day, month_index(start))
+    return (end - period_start).days
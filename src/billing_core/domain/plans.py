@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
-from dataclasses import dataclass
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
 from typing import Any, ClassVar
 
 from .errors import BillingError, InvalidAmountError
+from .invoice import LineItem
 from .money import Money
 
 
@@ -28,6 +31,7 @@ class Plan(ABC):
     currency: str
 
     _REGISTRY: ClassVar[dict[str, type[Plan]]] = {}
+    _DSL_FIELDS: ClassVar[tuple[str, ...]] = ()
 
     @property
     def requires_seats(self) -> bool:
@@ -41,6 +45,14 @@ class Plan(ABC):
     def monthly_price(self) -> Money:
         return self.monthly_price_for(seats=1)
 
+    @property
+    def price_terms(self) -> tuple[Money, Money] | None:
+        """(base, per_seat) для линейных планов: цена = base + per_seat * seats.
+
+        None - план нелинейный, цену нужно считать через monthly_price_for.
+        """
+        return None
+
     @classmethod
     def register(cls, plan_type: str) -> Any:
         def _wrap(subcls: type[Plan]) -> type[Plan]:
@@ -72,43 +84,30 @@ class Plan(ABC):
 
         return plan_cls._from_mapping(data)
 
-    @staticmethod
-    def _parse_dsl(raw: str) -> Mapping[str, Any]:
+    @classmethod
+    def dsl_layout(cls, plan_type: str) -> tuple[type[Plan], tuple[str, ...]]:
+        """Класс плана и имена полей DSL после type;CODE;NAME;CUR."""
+        plan_cls = cls._REGISTRY.get(plan_type)
+        if plan_cls is None:
+            raise InvalidPlanConfigError(f"Unknown DSL plan type: {plan_type!r}")
+        return plan_cls, plan_cls._DSL_FIELDS
+
+    @classmethod
+    def _parse_dsl(cls, raw: str) -> Mapping[str, Any]:
         parts = [p.strip() for p in raw.split(";")]
         if not parts or not parts[0]:
             raise InvalidPlanConfigError("Empty plan config string")
 
         t = parts[0].lower()
+        _, fields = cls.dsl_layout(t)
+
+        if len(parts) != 4 + len(fields):
+            usage = ";".join([t, "CODE", "NAME", "CUR", *(f.upper() for f in fields)])
+            raise InvalidPlanConfigError(f"{t} DSL: {usage}")
 
-        if t == "free":
-            if len(parts) != 4:
-                raise InvalidPlanConfigError("free DSL: free;CODE;NAME;CUR")
-            return {"type": "free", "code": parts[1], "name": parts[2], "currency": parts[3]}
-
-        if t == "flat":
-            if len(parts) != 5:
-                raise InvalidPlanConfigError("flat DSL: flat;CODE;NAME;CUR;MONTHLY_PRICE")
-            return {
-                "type": "flat",
-                "code": parts[1],
-                "name": parts[2],
-                "currency": parts[3],
-                "monthly_price": parts[4],
-            }
-
-        if t == "per_seat":
-            if len(parts) != 6:
-                raise InvalidPlanConfigError("per_seat DSL: per_seat;CODE;NAME;CUR;BASE;PER_SEAT")
-            return {
-                "type": "per_seat",
-                "code": parts[1],
-                "name": parts[2],
-                "currency": parts[3],
-                "base": parts[4],
-                "per_seat": parts[5],
-            }
-
-        raise InvalidPlanConfigError(f"Unknown DSL plan type: {t!r}")
+        data = {"type": t, "code": parts[1], "name": parts[2], "currency": parts[3]}
+        data.update(zip(fields, parts[4:], strict=True))
+        return data
 
     @classmethod
     @abstractmethod
@@ -122,6 +121,11 @@ class FreePlan(Plan):
     def monthly_price_for(self, *, seats: int = 1) -> Money:
         return Money.of("0", self.currency)
 
+    @property
+    def price_terms(self) -> tuple[Money, Money]:
+        zero = Money.of("0", self.currency)
+        return zero, zero
+
     @classmethod
     def _from_mapping(cls, data: Mapping[str, Any]) -> FreePlan:
         return cls(
@@ -136,6 +140,8 @@ class FreePlan(Plan):
 class FlatMonthlyPlan(Plan):
     monthly: Money
 
+    _DSL_FIELDS: ClassVar[tuple[str, ...]] = ("monthly_price",)
+
     def monthly_price_for(self, *, seats: int = 1) -> Money:
         return self.monthly
 
@@ -143,6 +149,10 @@ class FlatMonthlyPlan(Plan):
     def monthly_price(self) -> Money:
         return self.monthly
 
+    @property
+    def price_terms(self) -> tuple[Money, Money]:
+        return self.monthly, Money.of("0", self.currency)
+
     @classmethod
     def _from_mapping(cls, data: Mapping[str, Any]) -> FlatMonthlyPlan:
         cur = str(data["currency"])
@@ -168,6 +178,8 @@ class PerSeatMonthlyPlan(Plan):
     base: Money
     per_seat: Money
 
+    _DSL_FIELDS: ClassVar[tuple[str, ...]] = ("base", "per_seat")
+
     @property
     def requires_seats(self) -> bool:
         return True
@@ -175,10 +187,11 @@ class PerSeatMonthlyPlan(Plan):
     def monthly_price_for(self, *, seats: int = 1) -> Money:
         if seats < 1:
             raise BillingError("seats must be >= 1")
-        total = self.base
-        for _ in range(seats):
-            total = total + self.per_seat
-        return total
+        return Money(self.base.amount + self.per_seat.amount * seats, self.currency)
+
+    @property
+    def price_terms(self) -> tuple[Money, Money]:
+        return self.base, self.per_seat
 
     @classmethod
     def _from_mapping(cls, data: Mapping[str, Any]) -> PerSeatMonthlyPlan:
@@ -201,3 +214,201 @@ class PerSeatMonthlyPlan(Plan):
             base=base_m,
             per_seat=per_seat_m,
         )
+
+
+@dataclass(frozen=True, slots=True)
+class PriceTier:
+    """Ступень цены: места до up_to включительно (None - без верхней границы)."""
+
+    up_to: int | None
+    unit_price: Money
+
+
+@dataclass(frozen=True, slots=True)
+class SeatTiersPlan(Plan):
+    """Общая часть tiered/volume: валидация ступеней и предрасчёт границ для бинарного поиска."""
+
+    tiers: tuple[PriceTier, ...]
+
+    _bounds: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _unit_prices: tuple[Decimal, ...] = field(init=False, repr=False, compare=False)
+    _cumulative: tuple[Decimal, ...] = field(init=False, repr=False, compare=False)
+
+    _DSL_FIELDS: ClassVar[tuple[str, ...]] = ("tiers",)
+
+    def __post_init__(self) -> None:
+        if not self.tiers:
+            raise InvalidPlanConfigError("tiers must not be empty")
+        if self.tiers[-1].up_to is not None:
+            raise InvalidPlanConfigError("last tier must be unbounded")
+        if any(tier.up_to is None for tier in self.tiers[:-1]):
+            raise InvalidPlanConfigError("only the last tier may be unbounded")
+
+        bounds: list[int] = []
+        prices: list[Decimal] = []
+        cumulative: list[Decimal] = []
+        prev = 0
+        total = Decimal("0")
+        for tier in self.tiers:
+            if tier.unit_price.currency != self.currency.strip().upper():
+                raise InvalidPlanConfigError("tier currency must match plan currency")
+            if tier.unit_price.amount < 0:
+                raise InvalidPlanConfigError("tier unit_price must be >= 0")
+            if tier.up_to is not None:
+                if tier.up_to <= prev:
+                    raise InvalidPlanConfigError("tier bounds must be strictly increasing")
+                total += tier.unit_price.amount * (tier.up_to - prev)
+                prev = tier.up_to
+                bounds.append(tier.up_to)
+                cumulative.append(total)
+            prices.append(tier.unit_price.amount)
+
+        object.__setattr__(self, "_bounds", tuple(bounds))
+        object.__setattr__(self, "_unit_prices", tuple(prices))
+        object.__setattr__(self, "_cumulative", tuple(cumulative))
+
+    @property
+    def requires_seats(self) -> bool:
+        return True
+
+    def monthly_price_for(self, *, seats: int = 1) -> Money:
+        if seats < 1:
+            raise BillingError("seats must be >= 1")
+        return Money(self._amount_for(seats, bisect_left(self._bounds, seats)), self.currency)
+
+    @abstractmethod
+    def _amount_for(self, seats: int, tier_idx: int) -> Decimal:
+        raise NotImplementedError
+
+    @classmethod
+    def _from_mapping(cls, data: Mapping[str, Any]) -> SeatTiersPlan:
+        cur = str(data["currency"])
+        raw = data.get("tiers")
+        if raw is None:
+            raise InvalidPlanConfigError(f"{cls.__name__} requires 'tiers'")
+
+        try:
+            tiers = tuple(_parse_tier(t, cur) for t in _split_tiers(raw))
+        except (InvalidAmountError, ValueError, KeyError, TypeError) as e:
+            raise InvalidPlanConfigError(f"Invalid tiers: {raw!r}") from e
+
+        return cls(
+            code=str(data["code"]),
+            name=str(data["name"]),
+            currency=cur,
+            tiers=tiers,
+        )
+
+
+def _split_tiers(raw: str | Sequence[Any]) -> Sequence[Any]:
+    """DSL: "10:5,50:4,*:3"; JSON: [{"up_to": 10, "unit_price": "5"}, ..., {"up_to": null, ...}]."""
+    if isinstance(raw, str):
+        return [part.split(":") for part in raw.split(",") if part.strip()]
+    return raw
+
+
+def _parse_tier(raw: Any, currency: str) -> PriceTier:
+    if isinstance(raw, Mapping):
+        up_to, price = raw.get("up_to"), raw["unit_price"]
+    else:
+        up_to, price = raw
+
+    if isinstance(up_to, str):
+        up_to = up_to.strip()
+        up_to = None if up_to in {"*", ""} else int(up_to)
+    elif up_to is not None:
+        up_to = int(up_to)
+
+    return PriceTier(up_to=up_to, unit_price=Money.of(str(price).strip(), currency))
+
+
+@Plan.register("tiered")
+@dataclass(frozen=True, slots=True)
+class TieredSeatPlan(SeatTiersPlan):
+    """Graduated: каждое место оплачивается по цене своей ступени."""
+
+    def _amount_for(self, seats: int, tier_idx: int) -> Decimal:
+        if tier_idx == 0:
+            return self._unit_prices[0] * seats
+        prev_bound = self._bounds[tier_idx - 1]
+        return self._cumulative[tier_idx - 1] + self._unit_prices[tier_idx] * (seats - prev_bound)
+
+
+@Plan.register("volume")
+@dataclass(frozen=True, slots=True)
+class VolumeSeatPlan(SeatTiersPlan):
+    """Volume: все места по цене ступени, в которую попало их количество."""
+
+    def _amount_for(self, seats: int, tier_idx: int) -> Decimal:
+        return self._unit_prices[tier_idx] * seats
+
+
+@Plan.register("metered")
+@dataclass(frozen=True, slots=True)
+class MeteredPlan(Plan):
+    """Абонплата base + оплата потребления по ставкам rates (metric -> цена за единицу)."""
+
+    base: Money
+    rates: tuple[tuple[str, Decimal], ...]
+
+    _DSL_FIELDS: ClassVar[tuple[str, ...]] = ("base", "rates")
+
+    def monthly_price_for(self, *, seats: int = 1) -> Money:
+        return self.base
+
+    @property
+    def price_terms(self) -> tuple[Money, Money]:
+        return self.base, Money.of("0", self.currency)
+
+    def usage_line_items(self, totals: Mapping[str, int]) -> list[LineItem]:
+        """Строки инвойса за потребление; метрики без ставки не тарифицируются."""
+        items: list[LineItem] = []
+        for metric, rate in self.rates:
+            quantity = totals.get(metric, 0)
+            if not quantity:
+                continue
+            amount = Money(rate * quantity, self.currency)
+            if amount:
+                items.append(LineItem(f"Usage {metric}: {quantity} x {rate}", amount))
+        return items
+
+    @classmethod
+    def _from_mapping(cls, data: Mapping[str, Any]) -> MeteredPlan:
+        cur = str(data["currency"])
+        base = data.get("base")
+        if base is None:
+            base = "0"
+        raw = data.get("rates")
+        if not raw:
+            raise InvalidPlanConfigError("metered plan requires 'rates'")
+
+        if isinstance(raw, str):
+            pairs = [part.split(":") for part in raw.split(",") if part.strip()]
+        elif isinstance(raw, Mapping):
+            pairs = list(raw.items())
+        else:
+            raise InvalidPlanConfigError(f"metered rates must be 'metric:price,...' or an object, got {raw!r}")
+
+        try:
+            base_m = Money.of(str(base), cur)
+            rates = tuple((str(metric).strip(), _parse_rate(rate)) for metric, rate in pairs)
+        except (InvalidAmountError, InvalidOperation, ValueError) as e:
+            raise InvalidPlanConfigError(f"Invalid metered base/rates: {raw!r}") from e
+
+        if any(not metric or rate < 0 for metric, rate in rates):
+            raise InvalidPlanConfigError("metered rates must be metric:non-negative price")
+
+        return cls(
+            code=str(data["code"]),
+            name=str(data["name"]),
+            currency=cur,
+            base=base_m,
+            rates=rates,
+        )
+
+
+def _parse_rate(raw: Any) -> Decimal:
+    rate = Decimal(str(raw).strip())
+    if not rate.is_finite():
+        raise ValueError(f"rate must be finite: {raw!r}")
+    return rate
@@ -1,12 +1,52 @@
 from __future__ import annotations
 
+import secrets
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
+from itertools import islice
 
-from .errors import BillingError, PromoNotValidError
+from .errors import BillingError, InvalidPromoTermsError, PromoNotValidError
 from .money import Money
 
+_PERCENT_FACTORS = tuple(Decimal(100 - p) / Decimal(100) for p in range(101))
+
+
+@dataclass(frozen=True, slots=True)
+class PromoDiscount:
+    """Скомпилированная скидка: условия проверены один раз, множитель посчитан заранее.
+
+    Результат apply() совпадает с PromoCode.apply() до копейки.
+    """
+
+    code: str
+    kind: str
+    factor: Decimal | None = None
+    fixed: Money | None = None
+    valid_until: date | None = None
+
+    def is_valid_on(self, day: date) -> bool:
+        return self.valid_until is None or day <= self.valid_until
+
+    def apply(self, subtotal: Money) -> Money:
+        if self.factor is not None:
+            return Money(Money.round(subtotal.amount * self.factor), subtotal.currency)
+
+        assert self.fixed is not None
+        if self.fixed.currency != subtotal.currency:
+            raise PromoNotValidError(self.code, "currency mismatch with subtotal")
+        raw = subtotal.amount - self.fixed.amount
+        return Money(raw if raw > 0 else Decimal(0), subtotal.currency)
+
+    def apply_many(self, subtotals: Sequence[Money]) -> list[Money]:
+        """Скидка для пачки сумм одним вызовом (прогон инвойсов)."""
+        factor = self.factor
+        if factor is None:
+            return [self.apply(m) for m in subtotals]
+        rnd = Money.round
+        return [Money(rnd(m.amount * factor), m.currency) for m in subtotals]
+
 
 @dataclass(frozen=True, slots=True)
 class PromoCode:
@@ -16,6 +56,7 @@ class PromoCode:
     fixed_discount: Money | None = None
     valid_until: date | None = None
     is_single_use: bool = False
+    max_redemptions: int | None = None  # лимит погашений кода всеми клиентами
 
     def validate_for(self, *, today: date, customer_id: str, already_used: bool) -> None:
         if not self.code:
@@ -29,22 +70,29 @@ class PromoCode:
         if self.is_single_use and already_used:
             raise PromoNotValidError(self.code, "already used")
 
+        self.check_terms()
+
+    def check_terms(self) -> None:
+        """Проверка условий скидки без привязки к клиенту и дате."""
+        if self.max_redemptions is not None and self.max_redemptions < 1:
+            raise InvalidPromoTermsError(self.code, "max_redemptions must be positive")
+
         if self.kind == "percent":
             if self.percent is None:
-                raise PromoNotValidError(self.code, "missing percent")
+                raise InvalidPromoTermsError(self.code, "missing percent")
             if not (0 <= self.percent <= 100):
-                raise PromoNotValidError(self.code, "percent must be between 0 and 100")
+                raise InvalidPromoTermsError(self.code, "percent must be between 0 and 100")
 
         if self.kind == "fixed":
             if self.fixed_discount is None:
-                raise PromoNotValidError(self.code, "missing fixed discount")
+                raise InvalidPromoTermsError(self.code, "missing fixed discount")
 
     def apply(self, *, subtotal: Money) -> Money:
         """Возвращает новую сумму после скидки"""
 
         if self.kind == "percent":
             assert self.percent is not None
-            factor = Decimal(100 - self.percent) / Decimal(100)
+            factor = _PERCENT_FACTORS[self.percent]
             new_amount = Money.round(subtotal.amount * factor)
             result = Money(new_amount, subtotal.currency)
             return result
@@ -60,3 +108,90 @@ class PromoCode:
             return raw
 
         raise PromoNotValidError(self.code, "unknown kind")
+
+    def compile(self) -> PromoDiscount:
+        """Проверяет условия и возвращает неизменяемую скидку для многократного применения."""
+        self.check_terms()
+        if self.kind == "percent":
+            assert self.percent is not None
+            return PromoDiscount(self.code, self.kind, factor=_PERCENT_FACTORS[self.percent], valid_until=self.valid_until)
+        if self.kind == "fixed":
+            return PromoDiscount(self.code, self.kind, fixed=self.fixed_discount, valid_until=self.valid_until)
+        raise InvalidPromoTermsError(self.code, "unknown kind")
+
+    @property
+    def tracks_redemptions(self) -> bool:
+        return self.is_single_use or self.max_redemptions is not None
+
+
+PROMO_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # без 0/O и 1/I
+
+
+@dataclass(frozen=True, slots=True)
+class PromoTemplate:
+    """Шаблон массовой генерации: код = prefix + length случайных символов alphabet."""
+
+    kind: str
+    prefix: str = ""
+    alphabet: str = PROMO_ALPHABET
+    length: int = 10
+    percent: int | None = None
+    fixed_discount: Money | None = None
+    valid_until: date | None = None
+    is_single_use: bool = True
+    max_redemptions: int | None = None
+
+    def validate(self, count: int) -> None:
+        if self.kind not in {"percent", "fixed"}:
+            raise InvalidPromoTermsError(self.prefix, f"unknown kind {self.kind!r}")
+        if not (2 <= len(self.alphabet) <= 256) or len(set(self.alphabet)) != len(self.alphabet):
+            raise BillingError("alphabet must have 2..256 distinct characters")
+        if not self.alphabet.isascii() or not self.prefix.isascii():
+            raise BillingError("alphabet and prefix must be ASCII")
+        if self.length < 4:
+            raise BillingError("code length must be at least 4")
+        # Не больше половины пространства кодов, иначе генерация упирается в коллизии.
+        if count < 0 or count * 2 > len(self.alphabet) ** self.length:
+            raise BillingError(f"cannot generate {count} unique codes of length {self.length}")
+        self.build(self.prefix).check_terms()
+
+    def build(self, code: str) -> PromoCode:
+        return PromoCode(
+            code=code,
+            kind=self.kind,
+            percent=self.percent,
+            fixed_discount=self.fixed_discount,
+            valid_until=self.valid_until,
+            is_single_use=self.is_single_use,
+            max_redemptions=self.max_redemptions,
+        )
+
+
+def generate_promo_codes(
+    template: PromoTemplate,
+    count: int,
+    *,
+    taken: Callable[[Iterable[str]], set[str]] = lambda codes: set(),
+) -> list[str]:
+    """count уникальных кодов по шаблону; taken(кандидаты) возвращает уже занятые из них.
+
+    Случайные байты превращаются в символы одним bytes.translate: байты
+    выше кратного len(alphabet) порога отбрасываются, поэтому распределение
+    символов равномерное. Кандидаты проверяются пачками.
+    """
+    template.validate(count)
+    n, length, prefix = len(template.alphabet), template.length, template.prefix
+    cutoff = 256 - 256 % n
+    table = bytes(template.alphabet.encode("ascii")[i % n] for i in range(256))
+    rejected = bytes(range(cutoff, 256))
+
+    codes: set[str] = set()
+    while len(codes) < count:
+        need = count - len(codes)
+        raw_len = (need * length * 256 // cutoff) + length * 8
+        chars = secrets.token_bytes(raw_len).translate(table, rejected).decode("ascii")
+        batch = {prefix + chars[i : i + length] for i in range(0, len(chars) - length + 1, length)}
+        batch -= codes
+        batch -= taken(batch)
+        codes.update(islice(batch, need))
+    return list(codes)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from .errors import BillingError
+from .invoice import LineItem
+from .money import Money
+from .promo import PromoDiscount
+
+
+def months_since(start: date, day: date) -> int:
+    """Число полных календарных месяцев от start до day (0 - первый месяц подписки)."""
+    months = (day.year - start.year) * 12 + day.month - start.month
+    return months - (day.day < start.day)
+
+
+@dataclass(frozen=True, slots=True)
+class Promotion:
+    """Автоматическая акция: скидка по плану/валюте/окну дат без ввода промокода.
+
+    Пустой plan_codes и currency=None - без ограничения. first_months
+    ограничивает акцию первыми N месяцами подписки. Порядок применения -
+    (priority, code); exclusive-акция применяется только первой и
+    останавливает остальные.
+    """
+
+    code: str
+    discount: PromoDiscount
+    plan_codes: frozenset[str] = frozenset()
+    currency: str | None = None
+    starts_on: date | None = None
+    ends_on: date | None = None
+    first_months: int | None = None
+    priority: int = 100
+    exclusive: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.code:
+            raise BillingError("promotion code must not be empty")
+        if self.starts_on and self.ends_on and self.ends_on < self.starts_on:
+            raise BillingError("promotion ends_on must not be before starts_on")
+        if self.first_months is not None and self.first_months < 1:
+            raise BillingError("first_months must be >= 1")
+        if self.discount.fixed is not None and self.currency not in {None, self.discount.fixed.currency}:
+            raise BillingError("fixed promotion currency mismatch")
+
+    @property
+    def order_key(self) -> tuple[int, str]:
+        return (self.priority, self.code)
+
+    def is_active_on(self, day: date) -> bool:
+        return (self.starts_on is None or self.starts_on <= day) and (self.ends_on is None or day <= self.ends_on)
+
+
+@dataclass(frozen=True, slots=True)
+class PromotionQuote:
+    subtotal: Money
+    total: Money
+    applied: tuple[tuple[str, Money], ...] = ()  # (code, изменение суммы)
+
+    def line_items(self) -> list[LineItem]:
+        return [LineItem(f"Promotion {code}", delta) for code, delta in self.applied]
+
+
+def stack_promotions(promotions: Iterable[Promotion], subtotal: Money) -> PromotionQuote:
+    """Применяет акции последовательно к нарастающему итогу в порядке order_key."""
+    total = subtotal
+    applied: list[tuple[str, Money]] = []
+    for promo in sorted(promotions, key=lambda p: p.order_key):
+        if promo.exclusive and applied:
+            continue
+        if promo.discount.fixed is not None and promo.discount.fixed.currency != subtotal.currency:
+            continue
+        new_total = promo.discount.apply(total)
+        if new_total != total:
+            applied.append((promo.code, new_total - total))
+            total = new_total
+        if promo.exclusive:
+            break
+    return PromotionQuote(subtotal=subtotal, total=total, applied=tuple(applied))
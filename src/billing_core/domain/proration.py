@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
+from functools import lru_cache
 
 from .errors import BillingError, CurrencyMismatchError
 from .invoice import LineItem
@@ -20,6 +21,21 @@ class ChangeDateInPeriodRule:
 
 _RULE = ChangeDateInPeriodRule()
 
+# Периоды по 28..31 дню (календарные месяцы и 30-дневный дефолт), недели и годы.
+# Значения посчитаны тем же выражением, что и запасной путь, поэтому округление совпадает.
+_TABLE_PERIODS = (*range(1, 32), 365, 366)
+_FRACTIONS: dict[tuple[int, int], Decimal] = {
+    (remaining, full): Decimal(remaining) / Decimal(full) for full in _TABLE_PERIODS for remaining in range(1, full + 1)
+}
+
+
+def proration_fraction(remaining_days: int, full_days: int) -> Decimal:
+    """remaining/full: из таблицы для типичных длин периода, иначе точное деление."""
+    fraction = _FRACTIONS.get((remaining_days, full_days))
+    if fraction is None:
+        fraction = Decimal(remaining_days) / Decimal(full_days)
+    return fraction
+
 
 def proration_line_items(
     *,
@@ -28,35 +44,58 @@ def proration_line_items(
     period_start: date,
     period_end: date,
     change_date: date,
+    full_days: int | None = None,
 ) -> list[LineItem]:
+    """Кредит за остаток старого плана и доплата за остаток нового.
+
+    full_days - длина полного периода цикла (Subscription.full_cycle_days); по умолчанию
+    длина [period_start, period_end). В неполном первом календарном месяце они различаются.
+    """
     _RULE(period_start=period_start, period_end=period_end, change_date=change_date)
 
     if old_monthly.currency != new_monthly.currency:
         raise CurrencyMismatchError(old_monthly.currency, new_monthly.currency)
 
-    full_days = (period_end - period_start).days
+    if full_days is None:
+        full_days = (period_end - period_start).days
     remaining_days = (period_end - change_date).days
 
     if remaining_days <= 0:
         return []
 
-    fraction = Decimal(remaining_days) / Decimal(full_days)
-
-    credit_amount = _pro_rate(old_monthly, fraction)
-    charge_amount = _pro_rate(new_monthly, fraction)
-
-    credit = Money(Decimal("0") - credit_amount.amount, credit_amount.currency)
+    credit = _prorated_credit(old_monthly, remaining_days, full_days)
+    charge_amount = _prorated(new_monthly, remaining_days, full_days)
 
     items: list[LineItem] = []
     if credit:
-        items.append(LineItem("Proration credit (unused old plan)", credit))
+        items.append(LineItem("Proration credit (unused old plan)", credit, change_date, period_end))
     if charge_amount:
-        items.append(LineItem("Proration charge (remaining new plan)", charge_amount))
+        items.append(LineItem("Proration charge (remaining new plan)", charge_amount, change_date, period_end))
 
     return items
 
 
+def prorate(monthly: Money, days: int, full_days: int) -> Money:
+    """Доля месячной цены за days из full_days (неполный первый календарный месяц)."""
+    if days >= full_days:
+        return monthly
+    return _prorated(monthly, days, full_days)
+
+
 def _pro_rate(monthly: Money, fraction: Decimal) -> Money:
     amount = monthly.amount * fraction
     amount = Money.round(amount)
     return Money(amount, monthly.currency)
+
+
+# Money неизменяем, поэтому готовые суммы по (цена плана, остаток дней, длина периода)
+# можно отдавать повторно: цен в каталоге немного, а пар дней - сотни.
+@lru_cache(maxsize=65_536)
+def _prorated(monthly: Money, remaining_days: int, full_days: int) -> Money:
+    return _pro_rate(monthly, proration_fraction(remaining_days, full_days))
+
+
+@lru_cache(maxsize=65_536)
+def _prorated_credit(monthly: Money, remaining_days: int, full_days: int) -> Money:
+    amount = _prorated(monthly, remaining_days, full_days)
+    return Money(Decimal("0") - amount.amount, amount.currency)
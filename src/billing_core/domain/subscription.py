@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
+import copy
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, timedelta
 from enum import Enum
 
+from .as_of import as_of_date
 from .errors import BillingError, InvalidStateTransitionError
 from .mixins import AuditMixin, TimestampMixin
+from .periods import BillingCycle, anchor_day_for, cycle_days, period_end
 
 
 class SubscriptionStatus(str, Enum):
@@ -13,6 +17,9 @@ class SubscriptionStatus(str, Enum):
     CANCELED = "canceled"
 
 
+_LIVE_STATUSES = frozenset({SubscriptionStatus.TRIALING, SubscriptionStatus.ACTIVE})
+
+
 class Subscription(AuditMixin, TimestampMixin):
     __slots__ = (
         "_id",
@@ -25,6 +32,9 @@ class Subscription(AuditMixin, TimestampMixin):
         "_current_period_end",
         "_seats",
         "_promo_code",
+        "_billing_cycle",
+        "_anchor_day",
+        "_canceled_on",
     )
 
     def __init__(
@@ -38,6 +48,8 @@ class Subscription(AuditMixin, TimestampMixin):
         status: SubscriptionStatus,
         seats: int = 1,
         promo_code: str | None = None,
+        billing_cycle: BillingCycle = BillingCycle.DAYS,
+        anchor_day: int | None = None,
     ) -> None:
         super().__init__()
 
@@ -61,6 +73,10 @@ class Subscription(AuditMixin, TimestampMixin):
         self._seats = seats
         self._promo_code = promo_code
 
+        self._billing_cycle = billing_cycle
+        self._anchor_day = anchor_day if anchor_day is not None else anchor_day_for(billing_cycle, current_period_start)
+        self._canceled_on = None
+
     @classmethod
     def create(
         cls,
@@ -71,6 +87,7 @@ class Subscription(AuditMixin, TimestampMixin):
         period_days: int = 30,
         trial_days: int = 0,
         seats: int = 1,
+        billing_cycle: BillingCycle = BillingCycle.DAYS,
     ) -> Subscription:
         if period_days < 1:
             raise BillingError("period_days must be >= 1")
@@ -79,7 +96,13 @@ class Subscription(AuditMixin, TimestampMixin):
 
         status = SubscriptionStatus.TRIALING if trial_days > 0 else SubscriptionStatus.ACTIVE
         current_start = start_date
-        current_end = start_date + timedelta(days=trial_days or period_days)
+        # Пробный период всегда в днях; месячные границы считаются от первого платного дня.
+        first_paid = start_date + timedelta(days=trial_days)
+        anchor_day = anchor_day_for(billing_cycle, first_paid)
+        if trial_days:
+            current_end = first_paid
+        else:
+            current_end = period_end(billing_cycle, start=start_date, anchor_day=anchor_day, period_days=period_days)
 
         return cls(
             customer_id=customer_id,
@@ -89,8 +112,45 @@ class Subscription(AuditMixin, TimestampMixin):
             current_period_end=current_end,
             status=status,
             seats=seats,
+            billing_cycle=billing_cycle,
+            anchor_day=anchor_day,
         )
 
+    @classmethod
+    def restore(
+        cls,
+        *,
+        sub_id: str,
+        created_at: datetime,
+        customer_id: str,
+        plan_code: str,
+        status: SubscriptionStatus,
+        start_date: date,
+        current_period_start: date,
+        current_period_end: date,
+        seats: int,
+        promo_code: str | None,
+        billing_cycle: BillingCycle = BillingCycle.DAYS,
+        anchor_day: int = 1,
+        canceled_on: date | None = None,
+    ) -> Subscription:
+        """Восстановление из хранилища с исходными id/created_at (без повторной генерации и валидации)."""
+        sub = cls.__new__(cls)
+        sub._id = sub_id
+        sub._created_at = created_at
+        sub._customer_id = customer_id
+        sub._plan_code = plan_code
+        sub._status = status
+        sub._start_date = start_date
+        sub._current_period_start = current_period_start
+        sub._current_period_end = current_period_end
+        sub._seats = seats
+        sub._promo_code = promo_code
+        sub._billing_cycle = billing_cycle
+        sub._anchor_day = anchor_day
+        sub._canceled_on = canceled_on
+        return sub
+
     @property
     def customer_id(self) -> str:
         return self._customer_id
@@ -123,33 +183,58 @@ class Subscription(AuditMixin, TimestampMixin):
     def promo_code(self) -> str | None:
         return self._promo_code
 
+    @property
+    def billing_cycle(self) -> BillingCycle:
+        return self._billing_cycle
+
+    @property
+    def anchor_day(self) -> int:
+        return self._anchor_day
+
+    @property
+    def canceled_on(self) -> date | None:
+        return self._canceled_on
+
     @property
     def is_active(self) -> bool:
-        return self._status in {SubscriptionStatus.TRIALING, SubscriptionStatus.ACTIVE}
+        return self._status in _LIVE_STATUSES
 
     @property
     def full_period_days(self) -> int:
         return (self._current_period_end - self._current_period_start).days
 
+    @property
+    def full_cycle_days(self) -> int:
+        """Длина полного периода цикла; больше full_period_days только у неполного первого месяца."""
+        if self._billing_cycle is BillingCycle.DAYS or self._status == SubscriptionStatus.TRIALING:
+            return self.full_period_days
+        return cycle_days(self._billing_cycle, start=self._current_period_start, anchor_day=self._anchor_day)
+
     @property
     def days_left_in_period(self) -> int:
-        today = date.today()
-        left = (self._current_period_end - today).days
+        """Дней до конца периода на дату из evaluated_as_of (без контекста - сегодня)."""
+        left = (self._current_period_end - as_of_date()).days
         return max(0, left)
 
-    def cancel(self) -> None:
+    def cancel(self, *, on: date | None = None) -> None:
+        """Отмена; дата отмены (по умолчанию сегодня, не X-As-Of) нужна для расчёта оттока."""
         if self._status == SubscriptionStatus.CANCELED:
             raise InvalidStateTransitionError("Subscription", self._status.value, "canceled")
         self._status = SubscriptionStatus.CANCELED
+        self._canceled_on = on or date.today()
 
     def activate(self) -> None:
         if self._status != SubscriptionStatus.TRIALING:
             raise InvalidStateTransitionError("Subscription", self._status.value, "active")
         self._status = SubscriptionStatus.ACTIVE
 
-    def change_plan(self, new_plan_code: str) -> str:
+    def ensure_changeable(self, action: str) -> None:
+        """Проверка без изменения состояния (для превью изменений)."""
         if self._status == SubscriptionStatus.CANCELED:
-            raise InvalidStateTransitionError("Subscription", self._status.value, "change_plan")
+            raise InvalidStateTransitionError("Subscription", self._status.value, action)
+
+    def change_plan(self, new_plan_code: str) -> str:
+        self.ensure_changeable("change_plan")
         if not new_plan_code:
             raise BillingError("new_plan_code must be non-empty")
 
@@ -158,8 +243,7 @@ class Subscription(AuditMixin, TimestampMixin):
         return old
 
     def change_seats(self, new_seats: int) -> int:
-        if self._status == SubscriptionStatus.CANCELED:
-            raise InvalidStateTransitionError("Subscription", self._status.value, "change_seats")
+        self.ensure_changeable("change_seats")
         if new_seats < 1:
             raise BillingError("new_seats must be >= 1")
 
@@ -167,7 +251,41 @@ class Subscription(AuditMixin, TimestampMixin):
         self._seats = new_seats
         return old
 
-    def apply_promo(self, promo_code: str | None) -> None:
+    def renew(self, *, period_days: int = 30) -> None:
+        """Переход к следующему периоду; пробный период по окончании становится платным.
+
+        period_days учитывается только для цикла DAYS.
+        """
         if self._status == SubscriptionStatus.CANCELED:
-            raise InvalidStateTransitionError("Subscription", self._status.value, "apply_promo")
+            raise InvalidStateTransitionError("Subscription", self._status.value, "renew")
+        if period_days < 1:
+            raise BillingError("period_days must be >= 1")
+
+        start = self._current_period_end
+        self._current_period_end = period_end(
+            self._billing_cycle, start=start, anchor_day=self._anchor_day, period_days=period_days
+        )
+        self._current_period_start = start
+        self._status = SubscriptionStatus.ACTIVE
+
+    def renewed(self, *, period_days: int = 30) -> Subscription:
+        """Копия в следующем периоде, self не меняется: инвойс считается до изменения подписки."""
+        nxt = copy.copy(self)
+        nxt.renew(period_days=period_days)
+        return nxt
+
+    def apply_promo(self, promo_code: str | None) -> None:
+        self.ensure_changeable("apply_promo")
         self._promo_code = promo_code
+
+
+def days_left_bulk(period_end_ordinals: Iterable[int], *, as_of: date | None = None) -> list[int]:
+    """days_left_in_period для многих подписок по ordinal конца периода; дата берётся один раз."""
+    today = (as_of or as_of_date()).toordinal()
+    return [end - today if end > today else 0 for end in period_end_ordinals]
+
+
+def computed_properties(subs: Sequence[Subscription], *, as_of: date | None = None) -> list[tuple[bool, int]]:
+    """(is_active, days_left_in_period) для пачки подписок на одну дату."""
+    days_left = days_left_bulk((s._current_period_end.toordinal() for s in subs), as_of=as_of)
+    return [(s._status in _LIVE_STATUSES, left) for s, left in zip(subs, days_left, strict=True)]
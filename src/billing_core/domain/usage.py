@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .errors import BillingError
+
+
+@dataclass(frozen=True, slots=True)
+class UsageEvent:
+    """Факт потребления метрики подпиской."""
+
+    subscription_id: str
+    metric: str
+    quantity: int
+    timestamp: datetime
+    idempotency_key: str | None = None
+
+    def __post_init__(self) -> None:
+        if not self.subscription_id:
+            raise BillingError("subscription_id must be non-empty")
+        if not self.metric:
+            raise BillingError("metric must be non-empty")
+        if self.quantity < 0:
+            raise BillingError("usage quantity must be >= 0")
+
+    @property
+    def day(self) -> int:
+        """Дневной бакет (ordinal даты события)."""
+        return self.timestamp.toordinal()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from billing_core.application.receivables import AGING_BUCKETS, AgingRow
+
+AGING_CSV_FIELDS = ("customer_id", "currency", *AGING_BUCKETS, "total")
+
+
+def iter_aging_csv(rows: Iterable[AgingRow], *, chunk_size: int = 10_000) -> Iterator[str]:
+    """Отчёт aging CSV-кусками по chunk_size строк (для StreamingResponse)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(AGING_CSV_FIELDS)
+
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        writer.writerows(
+            (row.customer_id, row.currency, *(str(m.amount) for m in row.buckets), str(row.total.amount)) for row in chunk
+        )
+        out = buf.getvalue()
+        if out:
+            yield out
+        if len(chunk) < chunk_size:
+            return
+        buf.seek(0)
+        buf.truncate()
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import sys
+import threading
+from array import array
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+
+from billing_core.application.repositories import SubscriptionColumns, SubscriptionRepository
+from billing_core.domain.errors import BillingError, SubscriptionNotFoundError
+from billing_core.domain.periods import BillingCycle
+from billing_core.domain.subscription import Subscription, SubscriptionStatus
+
+from .memory_stats import EntityMemory
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_STATUSES = tuple(SubscriptionStatus)
+_STATUS_CODE = {s: i for i, s in enumerate(_STATUSES)}
+_CYCLES = tuple(BillingCycle)
+_CYCLE_CODE = {c: i for i, c in enumerate(_CYCLES)}
+
+
+def _array_bytes(arr: array | bytearray) -> int:
+    return sys.getsizeof(arr)
+
+
+@dataclass(slots=True)
+class StringDictionary:
+    """Словарное кодирование строк: код 0 зарезервирован под None."""
+
+    _values: list[str | None] = field(default_factory=lambda: [None])
+    _codes: dict[str, int] = field(default_factory=dict)
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def decode(self, code: int) -> str | None:
+        return self._values[code]
+
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+    def values(self) -> list[str | None]:
+        """Копия словаря: values()[code] == decode(code)."""
+        return list(self._values)
+
+    def nbytes(self) -> int:
+        strings = sum(sys.getsizeof(v) for v in self._values if v is not None)
+        return sys.getsizeof(self._values) + sys.getsizeof(self._codes) + strings
+
+
+@dataclass(slots=True)
+class ColumnarSubscriptionRepo(SubscriptionRepository):
+    """Подписки хранятся по колонкам в array/bytearray, а не объектами.
+
+    id (uuid4 hex) - 16 байт в bytearray, индекс - открытая адресация в
+    array('i') вместо dict; даты - ordinal в array('i'); статус, цикл и день
+    привязки - uint8;
+    plan_code, customer_id и promo_code кодируются словарями.
+    get() собирает короткоживущий Subscription из строки, save() пишет его обратно.
+    Колонки параллельны по номеру строки, поэтому запись и чтение строки - под одним локом.
+    """
+
+    _ids: bytearray = field(default_factory=bytearray)
+    _created_us: array = field(default_factory=lambda: array("q"))
+    _customer: array = field(default_factory=lambda: array("I"))
+    _plan: array = field(default_factory=lambda: array("I"))
+    _status: array = field(default_factory=lambda: array("B"))
+    _start: array = field(default_factory=lambda: array("i"))
+    _period_start: array = field(default_factory=lambda: array("i"))
+    _period_end: array = field(default_factory=lambda: array("i"))
+    _seats: array = field(default_factory=lambda: array("I"))
+    _promo: array = field(default_factory=lambda: array("I"))
+    _cycle: array = field(default_factory=lambda: array("B"))
+    _anchor: array = field(default_factory=lambda: array("B"))
+    _canceled: array = field(default_factory=lambda: array("i"))  # ordinal, 0 - не отменена
+
+    _customers: StringDictionary = field(default_factory=StringDictionary)
+    _plans: StringDictionary = field(default_factory=StringDictionary)
+    _promos: StringDictionary = field(default_factory=StringDictionary)
+
+    _slots: array = field(default_factory=lambda: array("i", bytes(4 * 16)))  # row + 1, 0 - пусто
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def save(self, sub: Subscription) -> None:
+        key = self._key(sub.id)
+        with self._lock:
+            self._save(key, sub)
+
+    def _save(self, key: bytes, sub: Subscription) -> None:
+        row = self._find(key)
+        customer = self._customers.encode(sub.customer_id)
+        plan = self._plans.encode(sub.plan_code)
+        promo = self._promos.encode(sub.promo_code)
+
+        if row < 0:
+            self._ids += key
+            created = sub.created_at - _EPOCH
+            self._created_us.append((created.days * 86_400 + created.seconds) * 1_000_000 + created.microseconds)
+            self._customer.append(customer)
+            self._plan.append(plan)
+            self._status.append(_STATUS_CODE[sub.status])
+            self._start.append(sub.start_date.toordinal())
+            self._period_start.append(sub.current_period_start.toordinal())
+            self._period_end.append(sub.current_period_end.toordinal())
+            self._seats.append(sub.seats)
+            self._promo.append(promo)
+            self._cycle.append(_CYCLE_CODE[sub.billing_cycle])
+            self._anchor.append(sub.anchor_day)
+            self._canceled.append(sub.canceled_on.toordinal() if sub.canceled_on else 0)
+            self._insert(key, len(self._status) - 1)
+            return
+
+        self._customer[row] = customer
+        self._plan[row] = plan
+        self._status[row] = _STATUS_CODE[sub.status]
+        self._start[row] = sub.start_date.toordinal()
+        self._period_start[row] = sub.current_period_start.toordinal()
+        self._period_end[row] = sub.current_period_end.toordinal()
+        self._seats[row] = sub.seats
+        self._promo[row] = promo
+        self._cycle[row] = _CYCLE_CODE[sub.billing_cycle]
+        self._anchor[row] = sub.anchor_day
+        self._canceled[row] = sub.canceled_on.toordinal() if sub.canceled_on else 0
+
+    def get(self, sub_id: str) -> Subscription:
+        try:
+            key = self._key(sub_id)
+        except BillingError:
+            raise SubscriptionNotFoundError(sub_id) from None
+        with self._lock:
+            row = self._find(key)
+            if row < 0:
+                raise SubscriptionNotFoundError(sub_id)
+            created_us, customer, plan, status = self._created_us[row], self._customer[row], self._plan[row], self._status[row]
+            start, period_start, period_end = self._start[row], self._period_start[row], self._period_end[row]
+            seats, promo, cycle, anchor, canceled = (
+                self._seats[row],
+                self._promo[row],
+                self._cycle[row],
+                self._anchor[row],
+                self._canceled[row],
+            )
+            customer_id, plan_code, promo_code = (
+                self._customers.decode(customer),
+                self._plans.decode(plan),
+                self._promos.decode(promo),
+            )
+
+        return Subscription.restore(
+            sub_id=sub_id,
+            created_at=_EPOCH + timedelta(microseconds=created_us),
+            customer_id=customer_id,
+            plan_code=plan_code,
+            status=_STATUSES[status],
+            start_date=date.fromordinal(start),
+            current_period_start=date.fromordinal(period_start),
+            current_period_end=date.fromordinal(period_end),
+            seats=seats,
+            promo_code=promo_code,
+            billing_cycle=_CYCLES[cycle],
+            anchor_day=anchor,
+            canceled_on=date.fromordinal(canceled) if canceled else None,
+        )
+
+    def columns(self) -> SubscriptionColumns:
+        """Колонки уже лежат в нужном виде - только копии array, без сборки Subscription."""
+        with self._lock:
+            return SubscriptionColumns(
+                plan_codes=self._plans.values(),
+                plan=array("I", self._plan),
+                seats=array("I", self._seats),
+                status=array("B", self._status),
+                start=array("i", self._start),
+                canceled=array("i", self._canceled),
+            )
+
+    @staticmethod
+    def _key(sub_id: str) -> bytes:
+        try:
+            key = bytes.fromhex(sub_id)
+        except ValueError:
+            key = b""
+        if len(key) != 16:
+            raise BillingError(f"columnar store expects 32-char hex ids, got {sub_id!r}")
+        return key
+
+    def _find(self, key: bytes) -> int:
+        slots = self._slots
+        mask = len(slots) - 1
+        i = int.from_bytes(key[:8], "little") & mask
+        ids = self._ids
+        while True:
+            ref = slots[i]
+            if ref == 0:
+                return -1
+            off = (ref - 1) * 16
+            if ids[off : off + 16] == key:
+                return ref - 1
+            i = (i + 1) & mask
+
+    def _insert(self, key: bytes, row: int) -> None:
+        if (row + 1) * 2 > len(self._slots):
+            self._rehash(len(self._slots) * 2)
+        self._place(self._slots, key, row)
+
+    @staticmethod
+    def _place(slots: array, key: bytes, row: int) -> None:
+        mask = len(slots) - 1
+        i = int.from_bytes(key[:8], "little") & mask
+        while slots[i] != 0:
+            i = (i + 1) & mask
+        slots[i] = row + 1
+
+    def _rehash(self, size: int) -> None:
+        slots = array("i", bytes(4 * size))
+        ids = self._ids
+        for row in range(len(self._status)):
+            self._place(slots, bytes(ids[row * 16 : row * 16 + 16]), row)
+        self._slots = slots
+
+    def memory_usage(self, *, sample: int = 1_000) -> list[EntityMemory]:
+        columns = (
+            self._ids,
+            self._created_us,
+            self._customer,
+            self._plan,
+            self._status,
+            self._start,
+            self._period_start,
+            self._period_end,
+            self._seats,
+            self._promo,
+            self._cycle,
+            self._anchor,
+            self._canceled,
+        )
+        with self._lock:
+            count = len(self)
+            column_bytes = sum(_array_bytes(c) for c in columns)
+            container_bytes = _array_bytes(self._slots) + self._customers.nbytes() + self._plans.nbytes() + self._promos.nbytes()
+        return [
+            EntityMemory(
+                repo="subs",
+                entity="subscription",
+                count=count,
+                sampled=count,
+                bytes_per_item=column_bytes / count if count else 0.0,
+                container_bytes=container_bytes,
+            )
+        ]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterable, Iterator
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from billing_core.application.fx import FxRates
+from billing_core.domain.errors import BillingError
+
+FX_CSV_FIELDS = ("date", "base", "quote", "rate")
+
+
+class FxRatesLoadError(BillingError):
+    """Файл курсов содержит ошибки; errors - список (номер строки, сообщение)."""
+
+    def __init__(self, source: str, errors: list[tuple[int, str]]) -> None:
+        lines = "; ".join(f"line {no}: {msg}" for no, msg in errors[:10])
+        more = f" (+{len(errors) - 10} more)" if len(errors) > 10 else ""
+        super().__init__(f"Invalid FX rates {source!r}: {lines}{more}")
+        self.source = source
+        self.errors = errors
+
+
+def _currency(raw: str) -> str:
+    code = raw.strip().upper()
+    if len(code) != 3 or not code.isalpha():
+        raise ValueError(f"invalid currency {raw!r}")
+    return code
+
+
+def iter_fx_rows(lines: Iterable[str], *, errors: list[tuple[int, str]]) -> Iterator[tuple[date, str, str, Decimal]]:
+    """CSV date,base,quote,rate (заголовок обязателен); ошибки копятся в errors."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None or tuple(h.strip().lower() for h in header) != FX_CSV_FIELDS:
+        errors.append((1, f"header must be {','.join(FX_CSV_FIELDS)}"))
+        return
+
+    for row in reader:
+        line_no = reader.line_num
+        if not row or row[0].startswith("#"):
+            continue
+        if len(row) != len(FX_CSV_FIELDS):
+            errors.append((line_no, f"expected {len(FX_CSV_FIELDS)} fields, got {len(row)}"))
+            continue
+        try:
+            day = date.fromisoformat(row[0].strip())
+            base, quote = _currency(row[1]), _currency(row[2])
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+            continue
+        try:
+            rate = Decimal(row[3].strip())
+        except InvalidOperation:
+            rate = Decimal("NaN")
+        if not rate.is_finite() or rate <= 0:
+            errors.append((line_no, f"rate must be positive, got {row[3].strip()!r}"))
+            continue
+        if base == quote:
+            errors.append((line_no, f"same currency pair {base}/{quote}"))
+            continue
+        yield day, base, quote, rate
+
+
+def load_fx_rates(path: str | Path, *, capacity: int = 4096) -> FxRates:
+    """Таблица курсов из локального CSV; при любой ошибке - FxRatesLoadError со всеми строками."""
+    errors: list[tuple[int, str]] = []
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(iter_fx_rows(f, errors=errors))
+    if errors:
+        raise FxRatesLoadError(str(path), errors)
+    return FxRates.from_rows(rows, capacity=capacity)
@@ -1,48 +1,88 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass, field
+import sys
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, replace
+from datetime import date
+from itertools import islice
 
 from billing_core.application.repositories import (
     InvoiceRepository,
+    PeriodBilling,
     PlanRepository,
     PromoRepository,
+    SubscriptionColumns,
     SubscriptionRepository,
+    UsageRepository,
 )
+from billing_core.domain.catalog import CatalogSnapshot
 from billing_core.domain.errors import (
     InvoiceNotFoundError,
     PromoCodeNotFoundError,
     SubscriptionNotFoundError,
 )
 from billing_core.domain.invoice import Invoice
-from billing_core.domain.plans import Plan, PlanNotFoundError
-from billing_core.domain.promo import PromoCode
+from billing_core.domain.plans import Plan
+from billing_core.domain.promo import PromoCode, PromoDiscount, PromoTemplate
 from billing_core.domain.subscription import Subscription
 
+from .memory_stats import EntityMemory, deep_sizeof, measure_entities
+from .redemptions import RedemptionStore
+
 
 @dataclass(slots=True)
 class InMemoryPlanRepo(PlanRepository):
-    _plans: dict[str, Plan] = field(default_factory=dict)
+    """Планы хранятся в неизменяемом снимке; add() подменяет его целиком (copy-on-write).
+
+    Замена ссылки атомарна, поэтому читатели блокировки не берут. Лок нужен
+    только писателям, чтобы параллельные add() не потеряли друг друга.
+    """
+
+    _snapshot: CatalogSnapshot = field(default_factory=CatalogSnapshot)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     def add(self, plan: Plan) -> None:
-        self._plans[plan.code] = plan
+        with self._write_lock:
+            self._snapshot = self._snapshot.with_plan(plan)
+
+    def add_many(self, plans: Iterable[Plan]) -> None:
+        with self._write_lock:
+            self._snapshot = self._snapshot.with_plans(plans)
 
     def get(self, code: str) -> Plan:
-        plan = self._plans.get(code)
-        if plan is None:
-            raise PlanNotFoundError(code)
-        return plan
+        return self._snapshot.get(code)
 
     def list(self) -> Iterable[Plan]:
-        return self._plans.values()
+        return list(self._snapshot)
+
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def memory_usage(self, *, sample: int = 1_000) -> list[EntityMemory]:
+        snap = self._snapshot
+        return [
+            measure_entities(
+                repo="plans",
+                entity="plan",
+                count=len(snap),
+                items=((p.code, p, snap.price(p.code)) for p in snap),
+                container_bytes=2 * sys.getsizeof(dict.fromkeys(p.code for p in snap)),
+                sample=sample,
+            )
+        ]
 
 
 @dataclass(slots=True)
 class InMemorySubscriptionRepo(SubscriptionRepository):
+    """Чтение по ключу без блокировки; запись и обход словаря (колонки, память) - под локом."""
+
     _subs: dict[str, Subscription] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     def save(self, sub: Subscription) -> None:
-        self._subs[sub.id] = sub
+        with self._lock:
+            self._subs[sub.id] = sub
 
     def get(self, sub_id: str) -> Subscription:
         sub = self._subs.get(sub_id)
@@ -50,13 +90,32 @@ class InMemorySubscriptionRepo(SubscriptionRepository):
             raise SubscriptionNotFoundError(sub_id)
         return sub
 
+    def columns(self) -> SubscriptionColumns:
+        with self._lock:
+            subs = list(self._subs.values())
+        return SubscriptionColumns.from_subscriptions(subs)
+
+    def memory_usage(self, *, sample: int = 1_000) -> list[EntityMemory]:
+        with self._lock:
+            count, container, items = len(self._subs), sys.getsizeof(self._subs), list(islice(self._subs.items(), sample))
+        return [
+            measure_entities(
+                repo="subs", entity="subscription", count=count, items=items, container_bytes=container, sample=sample
+            )
+        ]
+
 
 @dataclass(slots=True)
 class InMemoryInvoiceRepo(InvoiceRepository):
+    """Инвойсы и учёт открытых периодов: (sub_id, начало периода) удаляется при продлении."""
+
     _invoices: dict[str, Invoice] = field(default_factory=dict)
+    _periods: dict[tuple[str, date], PeriodBilling] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     def save(self, invoice: Invoice) -> None:
-        self._invoices[invoice.invoice_id] = invoice
+        with self._lock:
+            self._invoices[invoice.invoice_id] = invoice
 
     def get(self, invoice_id: str) -> Invoice:
         inv = self._invoices.get(invoice_id)
@@ -64,23 +123,173 @@ class InMemoryInvoiceRepo(InvoiceRepository):
             raise InvoiceNotFoundError(invoice_id)
         return inv
 
+    def list(self) -> Iterable[Invoice]:
+        with self._lock:
+            return list(self._invoices.values())
+
+    def period_billing(self, *, sub_id: str, period_start: date) -> PeriodBilling:
+        return self._periods.get((sub_id, period_start)) or PeriodBilling()
+
+    def save_period_billing(self, *, sub_id: str, period_start: date, billing: PeriodBilling) -> None:
+        with self._lock:
+            self._periods[(sub_id, period_start)] = billing
+
+    def close_period(self, *, sub_id: str, period_start: date) -> None:
+        with self._lock:
+            self._periods.pop((sub_id, period_start), None)
+
+    def memory_usage(self, *, sample: int = 1_000) -> list[EntityMemory]:
+        with self._lock:
+            count = len(self._invoices)
+            container = sys.getsizeof(self._invoices)
+            items = list(islice(self._invoices.items(), sample))
+        return [
+            measure_entities(
+                repo="invoices", entity="invoice", count=count, items=items, container_bytes=container, sample=sample
+            )
+        ]
+
 
 @dataclass(slots=True)
 class InMemoryPromoRepo(PromoRepository):
     _promos: dict[str, PromoCode] = field(default_factory=dict)
-    _used: set[tuple[str, str]] = field(default_factory=set)  # (code, customer_id)
+    _generated: dict[str, PromoTemplate] = field(default_factory=dict)  # код -> общий шаблон
+    _discounts: dict[str, PromoDiscount] = field(default_factory=dict)
+    _template_discounts: dict[PromoTemplate, PromoDiscount] = field(default_factory=dict)
+    _redemptions: RedemptionStore = field(default_factory=RedemptionStore)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     def add(self, promo: PromoCode) -> None:
-        self._promos[promo.code] = promo
+        discount = promo.compile()
+        with self._lock:
+            self._generated.pop(promo.code, None)
+            self._promos[promo.code] = promo
+            self._discounts[promo.code] = discount
+
+    def add_many(self, promos: Iterable[PromoCode]) -> None:
+        for promo in promos:
+            self.add(promo)
+
+    def add_generated(self, template: PromoTemplate, codes: Iterable[str]) -> set[str]:
+        generated = dict.fromkeys(codes, template)
+        with self._lock:
+            taken = self._promos.keys() & generated.keys() | self._generated.keys() & generated.keys()
+            for code in taken:
+                del generated[code]
+            if template not in self._template_discounts:
+                self._template_discounts[template] = template.build(template.prefix).compile()
+            self._generated.update(generated)
+        return taken
+
+    def existing_codes(self, codes: Iterable[str]) -> set[str]:
+        if not isinstance(codes, (set, frozenset)):
+            codes = set(codes)
+        with self._lock:
+            return self._promos.keys() & codes | self._generated.keys() & codes
 
     def get(self, code: str) -> PromoCode:
         promo = self._promos.get(code)
         if promo is None:
-            raise PromoCodeNotFoundError(code)
+            template = self._generated.get(code)
+            if template is None:
+                raise PromoCodeNotFoundError(code)
+            promo = template.build(code)
         return promo
 
+    def get_discount(self, code: str) -> PromoDiscount:
+        discount = self._discounts.get(code)
+        if discount is None:
+            template = self._generated.get(code)
+            if template is None:
+                raise PromoCodeNotFoundError(code)
+            discount = replace(self._template_discounts[template], code=code)
+        return discount
+
     def is_used_by_customer(self, *, code: str, customer_id: str) -> bool:
-        return (code, customer_id) in self._used
+        return self._redemptions.has_redeemed(code=code, customer_id=customer_id)
+
+    def mark_used(self, *, code: str, customer_id: str) -> bool:
+        promo = self.get(code)
+        return self._redemptions.redeem(
+            code=code,
+            customer_id=customer_id,
+            once_per_customer=promo.is_single_use,
+            max_uses=promo.max_redemptions,
+        )
+
+    def redemptions(self, code: str) -> int:
+        return self._redemptions.uses(code)
+
+    def memory_usage(self, *, sample: int = 1_000) -> list[EntityMemory]:
+        stats = self._redemptions.stats()
+        with self._lock:
+            promo_count, promo_container = len(self._promos), sys.getsizeof(self._promos)
+            promo_items = list(islice(self._promos.items(), sample))
+            generated_count, generated_container = len(self._generated), sys.getsizeof(self._generated)
+            generated_items = [(code,) for code in islice(self._generated, sample)]
+            templates = list(self._template_discounts)
+        return [
+            measure_entities(
+                repo="promos",
+                entity="promo",
+                count=promo_count,
+                items=promo_items,
+                container_bytes=promo_container,
+                sample=sample,
+            ),
+            measure_entities(
+                repo="promos",
+                entity="generated_promo",
+                count=generated_count,
+                items=generated_items,
+                container_bytes=generated_container + sum(deep_sizeof(t) for t in templates),
+                sample=sample,
+            ),
+            EntityMemory(
+                repo="promos",
+                entity="redemption",
+                count=stats.redemptions,
+                sampled=stats.redemptions,
+                bytes_per_item=0.0,
+                container_bytes=self._redemptions.nbytes(),
+            ),
+        ]
+
+
+@dataclass(slots=True)
+class InMemoryUsageRepo(UsageRepository):
+    _daily: dict[str, dict[tuple[str, int], int]] = field(default_factory=dict)  # sub_id -> (metric, day) -> qty
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_totals(self, deltas: Mapping[tuple[str, str, int], int]) -> None:
+        with self._lock:
+            for (sub_id, metric, day), qty in deltas.items():
+                per_sub = self._daily.setdefault(sub_id, {})
+                key = (metric, day)
+                per_sub[key] = per_sub.get(key, 0) + qty
+
+    def totals_for(self, *, sub_id: str, period_start: date, period_end: date) -> dict[str, int]:
+        start, end = period_start.toordinal(), period_end.toordinal()
+        totals: dict[str, int] = {}
+        with self._lock:
+            counters = list(self._daily.get(sub_id, {}).items())
+        for (metric, day), qty in counters:
+            if start <= day < end:
+                totals[metric] = totals.get(metric, 0) + qty
+        return totals
 
-    def mark_used(self, *, code: str, customer_id: str) -> None:
-        self._used.add((code, customer_id))
+    def memory_usage(self, *, sample: int = 1_000) -> list[EntityMemory]:
+        with self._lock:
+            counters = sum(len(per_sub) for per_sub in self._daily.values())
+            containers = sys.getsizeof(self._daily) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in self._daily.items())
+            items = list(islice((item for per_sub in self._daily.values() for item in per_sub.items()), sample))
+        return [
+            measure_entities(
+                repo="usage",
+                entity="usage_counter",
+                count=counters,
+                items=items,
+                container_bytes=containers,
+                sample=sample,
+            )
+        ]
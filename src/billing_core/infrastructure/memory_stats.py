@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+from typing import Any
+
+_LEAF_TYPES = (str, bytes, int, float, bool, Decimal, date, datetime, type(None))
+_slots_cache: dict[type, tuple[str, ...]] = {}
+
+
+def _slot_names(tp: type) -> tuple[str, ...]:
+    names = _slots_cache.get(tp)
+    if names is None:
+        collected: list[str] = []
+        for klass in tp.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            collected.extend(s for s in slots if s not in {"__dict__", "__weakref__"})
+        names = _slots_cache[tp] = tuple(dict.fromkeys(collected))
+    return names
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Приблизительный размер графа объектов (sys.getsizeof по всем достижимым объектам).
+
+    Объекты из seen не считаются повторно - так общие строки (plan_code,
+    валюта) распределяются по выборке. Члены Enum и классы считаются общими
+    и не учитываются.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        oid = id(o)
+        if oid in seen:
+            continue
+        seen.add(oid)
+        if isinstance(o, (Enum, type)):
+            continue
+
+        total += sys.getsizeof(o)
+        if isinstance(o, _LEAF_TYPES):
+            continue
+        if isinstance(o, Mapping):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        else:
+            for name in _slot_names(type(o)):
+                value = getattr(o, name, None)
+                if value is not None:
+                    stack.append(value)
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+    return total
+
+
+@dataclass(frozen=True, slots=True)
+class EntityMemory:
+    repo: str
+    entity: str
+    count: int
+    sampled: int
+    bytes_per_item: float
+    container_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.container_bytes + round(self.bytes_per_item * self.count)
+
+
+def measure_entities(
+    *,
+    repo: str,
+    entity: str,
+    count: int,
+    items: Iterable[tuple[Any, ...]],
+    container_bytes: int,
+    sample: int = 1_000,
+) -> EntityMemory:
+    """Меряет первые sample элементов и экстраполирует на count.
+
+    Элемент - кортеж частей одной записи (например, ключ и значение словаря);
+    сам кортеж не считается.
+    """
+    seen: set[int] = set()
+    sampled = 0
+    total = 0
+    for parts in islice(items, sample):
+        total += sum(deep_sizeof(part, seen) for part in parts)
+        sampled += 1
+
+    return EntityMemory(
+        repo=repo,
+        entity=entity,
+        count=count,
+        sampled=sampled,
+        bytes_per_item=total / sampled if sampled else 0.0,
+        container_bytes=container_bytes,
+    )
+
+
+@dataclass(slots=True)
+class MemoryTracker:
+    """История замеров для оценки роста: (время, {entity: total_bytes})."""
+
+    history: deque[tuple[float, dict[str, int]]] = field(default_factory=lambda: deque(maxlen=100))
+
+    def record(self, stats: Iterable[EntityMemory]) -> dict[str, dict[str, float]]:
+        now = time.time()
+        totals = {f"{s.repo}.{s.entity}": s.total_bytes for s in stats}
+        growth: dict[str, dict[str, float]] = {}
+        if self.history:
+            first_ts, first = self.history[0]
+            _, prev = self.history[-1]
+            for key, value in totals.items():
+                growth[key] = {
+                    "since_previous_bytes": value - prev.get(key, 0),
+                    "since_first_bytes": value - first.get(key, 0),
+                    "bytes_per_second": (value - first.get(key, 0)) / (now - first_ts) if now > first_ts else 0.0,
+                }
+        self.history.append((now, totals))
+        return growth
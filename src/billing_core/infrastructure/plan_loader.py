@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from billing_core.application.repositories import PlanRepository
+from billing_core.domain.catalog import PlanPrice
+from billing_core.domain.errors import BillingError
+from billing_core.domain.plans import InvalidPlanConfigError, Plan
+
+
+class PlanCatalogLoadError(BillingError):
+    """Файл каталога содержит ошибки; errors - список (номер строки, сообщение)."""
+
+    def __init__(self, source: str, errors: list[tuple[int, str]]) -> None:
+        lines = "; ".join(f"line {no}: {msg}" for no, msg in errors[:10])
+        more = f" (+{len(errors) - 10} more)" if len(errors) > 10 else ""
+        super().__init__(f"Invalid plan catalog {source!r}: {lines}{more}")
+        self.source = source
+        self.errors = errors
+
+
+@dataclass(slots=True)
+class PlanConfigParser:
+    """Разбор строк каталога с заранее скомпилированной таблицей типов.
+
+    Таблица (type -> класс плана, поля DSL, длина строки) строится один раз,
+    поэтому на строку приходится один split и прямой вызов _from_mapping
+    без повторного прохода через Plan.from_config/_parse_dsl.
+    """
+
+    _layouts: dict[str, tuple[type[Plan], tuple[str, ...], int]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for plan_type in Plan._REGISTRY:
+            plan_cls, fields = Plan.dsl_layout(plan_type)
+            self._layouts[plan_type] = (plan_cls, fields, 4 + len(fields))
+
+    def parse(self, raw: str) -> Plan:
+        if raw.startswith("{"):
+            return self._parse_mapping(json.loads(raw))
+        return self._parse_dsl(raw)
+
+    def _parse_mapping(self, data: Any) -> Plan:
+        if not isinstance(data, dict):
+            raise InvalidPlanConfigError("JSON plan config must be an object")
+        plan_type = str(data.get("type", "")).strip().lower()
+        layout = self._layouts.get(plan_type)
+        if layout is None:
+            raise InvalidPlanConfigError(f"Unknown plan type: {plan_type!r}")
+        return layout[0]._from_mapping(data)
+
+    def _parse_dsl(self, raw: str) -> Plan:
+        parts = [p.strip() for p in raw.split(";")]
+        plan_type = parts[0].lower()
+        layout = self._layouts.get(plan_type)
+        if layout is None:
+            raise InvalidPlanConfigError(f"Unknown DSL plan type: {plan_type!r}")
+
+        plan_cls, fields, arity = layout
+        if len(parts) != arity:
+            raise InvalidPlanConfigError(f"{plan_type} DSL expects {arity} fields, got {len(parts)}")
+
+        data = {"type": plan_type, "code": parts[1], "name": parts[2], "currency": parts[3]}
+        data.update(zip(fields, parts[4:], strict=True))
+        return plan_cls._from_mapping(data)
+
+
+def iter_plan_lines(
+    lines: Iterable[str], *, errors: list[tuple[int, str]], parser: PlanConfigParser | None = None
+) -> Iterator[Plan]:
+    """Потоковый разбор: пустые строки и комментарии (#) пропускаются, ошибки копятся в errors."""
+    parser = parser or PlanConfigParser()
+    seen: set[str] = set()
+
+    for line_no, line in enumerate(lines, start=1):
+        raw = line.strip()
+        if not raw or raw.startswith("#"):
+            continue
+        try:
+            plan = parser.parse(raw)
+            # Цена строится тут же: ошибка валюты/цены получает номер строки, а не падает в add_many.
+            PlanPrice.from_plan(plan)
+        except (BillingError, KeyError, ValueError) as e:
+            msg = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+            errors.append((line_no, msg))
+            continue
+
+        if plan.code in seen:
+            errors.append((line_no, f"duplicate plan code {plan.code!r}"))
+            continue
+        seen.add(plan.code)
+        yield plan
+
+
+def parse_plan_catalog(lines: Iterable[str], *, source: str = "<lines>") -> list[Plan]:
+    """Разбирает каталог целиком; при любой ошибке бросает PlanCatalogLoadError со всеми ошибками."""
+    errors: list[tuple[int, str]] = []
+    plans = list(iter_plan_lines(lines, errors=errors))
+    if errors:
+        raise PlanCatalogLoadError(source, errors)
+    return plans
+
+
+def load_plan_catalog(path: str | Path, repo: PlanRepository) -> int:
+    """Читает файл (JSON Lines или DSL, по одному плану на строку) и добавляет планы в repo одним вызовом."""
+    path = Path(path)
+    with path.open(encoding="utf-8") as fh:
+        plans = parse_plan_catalog(fh, source=str(path))
+
+    repo.add_many(plans)
+    return len(plans)
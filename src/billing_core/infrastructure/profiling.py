@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any
+
+from billing_core.application.tx import active_transaction, track_active_transactions
+from billing_core.domain.errors import BillingError
+
+# Листовые функции простаивающих потоков (ожидание очереди/события/селектора).
+IDLE_LEAVES = frozenset(
+    {
+        "Condition.wait",
+        "Event.wait",
+        "_PollLikeSelector.select",
+        "EpollSelector.select",
+        "KqueueSelector.select",
+        "SelectSelector.select",
+    }
+)
+
+
+class ProfilerBusyError(BillingError):
+    def __init__(self) -> None:
+        super().__init__("Another profiling session is already running")
+
+
+def _code_label(code: CodeType) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _is_idle(frame: FrameType) -> bool:
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name) in IDLE_LEAVES
+
+
+class StackSampler:
+    """Сэмплирующий профайлер: раз в interval снимает стеки всех потоков через sys._current_frames().
+
+    Результат - collapsed stacks ("root;...;leaf count"), их понимают
+    flamegraph.pl, speedscope и inferno.
+
+    attribute_transactions=True добавляет корневой кадр с именем
+    billing_transaction, активной в потоке в момент сэмпла.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        *,
+        max_depth: int = 128,
+        skip_idle: bool = True,
+        attribute_transactions: bool = False,
+    ) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.skip_idle = skip_idle
+        self.attribute_transactions = attribute_transactions
+        self.samples = 0
+        self._stacks: Counter[tuple[str, ...]] = Counter()
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> StackSampler:
+        if self._thread is not None:
+            raise RuntimeError("sampler already started")
+        if self.attribute_transactions:
+            track_active_transactions(True)
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.attribute_transactions:
+            track_active_transactions(False)
+
+    def __enter__(self) -> StackSampler:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == own or (self.skip_idle and _is_idle(frame)):
+                    continue
+                stack = self._stack_key(frame)
+                if self.attribute_transactions:
+                    stack = (f"[tx {active_transaction(tid) or '-'}]", *stack)
+                self._stacks[stack] += 1
+            self.samples += 1
+
+    def _stack_key(self, frame: FrameType | None) -> tuple[str, ...]:
+        labels: list[str] = []
+        cache = self._labels
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            label = cache.get(code)
+            if label is None:
+                label = cache[code] = _code_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    @property
+    def stacks(self) -> Counter[tuple[str, ...]]:
+        return self._stacks
+
+    def collapsed(self) -> str:
+        """Вызывать после stop()."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self._stacks.most_common())
+
+    def speedscope(self, name: str = "billing-core") -> dict[str, Any]:
+        """Профиль в формате speedscope (sampled, веса - число сэмплов)."""
+        frame_idx: dict[str, int] = {}
+        samples: list[list[int]] = []
+        weights: list[int] = []
+        for stack, count in self._stacks.most_common():
+            samples.append([frame_idx.setdefault(label, len(frame_idx)) for label in stack])
+            weights.append(count)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "billing-core",
+            "shared": {"frames": [{"name": label} for label in frame_idx]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "none",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+_session_lock = threading.Lock()
+
+
+def profile_for(seconds: float, *, interval: float = 0.005) -> StackSampler:
+    """Профилирует процесс seconds секунд с атрибуцией к транзакциям; одна сессия за раз."""
+    if not _session_lock.acquire(blocking=False):
+        raise ProfilerBusyError()
+    try:
+        with StackSampler(interval, attribute_transactions=True) as sampler:
+            time.sleep(seconds)
+        return sampler
+    finally:
+        _session_lock.release()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from datetime import date
+from itertools import islice
+
+from billing_core.domain.errors import BillingError
+from billing_core.domain.money import Money
+from billing_core.domain.promo import PromoCode, PromoTemplate
+
+PROMO_CSV_FIELDS = (
+    "code",
+    "kind",
+    "percent",
+    "fixed_amount",
+    "currency",
+    "valid_until",
+    "is_single_use",
+    "max_redemptions",
+)
+
+
+class PromoCsvLoadError(BillingError):
+    """CSV с промокодами содержит ошибки; errors - список (номер строки, сообщение)."""
+
+    def __init__(self, source: str, errors: list[tuple[int, str]]) -> None:
+        lines = "; ".join(f"line {no}: {msg}" for no, msg in errors[:10])
+        more = f" (+{len(errors) - 10} more)" if len(errors) > 10 else ""
+        super().__init__(f"Invalid promo CSV {source!r}: {lines}{more}")
+        self.source = source
+        self.errors = errors
+
+
+def _terms_row(terms: PromoCode | PromoTemplate) -> tuple[str, ...]:
+    fixed = terms.fixed_discount
+    return (
+        terms.kind,
+        "" if terms.percent is None else str(terms.percent),
+        "" if fixed is None else str(fixed.amount),
+        "" if fixed is None else fixed.currency,
+        "" if terms.valid_until is None else terms.valid_until.isoformat(),
+        "true" if terms.is_single_use else "false",
+        "" if terms.max_redemptions is None else str(terms.max_redemptions),
+    )
+
+
+def iter_promo_csv(template: PromoTemplate, codes: Iterable[str], *, chunk_size: int = 50_000) -> Iterator[str]:
+    """CSV сгенерированных кодов кусками по chunk_size строк (для StreamingResponse).
+
+    Условия шаблона сериализуются один раз, на строку остаётся только код.
+    """
+    terms = _terms_row(template)
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(PROMO_CSV_FIELDS)
+
+    it = iter(codes)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if chunk:
+            writer.writerows((code, *terms) for code in chunk)
+        out = buf.getvalue()
+        if out:
+            yield out
+        if len(chunk) < chunk_size:
+            return
+        buf.seek(0)
+        buf.truncate()
+
+
+def _parse_row(row: dict[str, str]) -> PromoCode:
+    def get(name: str) -> str:
+        return (row.get(name) or "").strip()
+
+    fixed = None
+    if get("fixed_amount"):
+        fixed = Money.of(get("fixed_amount"), get("currency"))
+    promo = PromoCode(
+        code=get("code"),
+        kind=get("kind"),
+        percent=int(get("percent")) if get("percent") else None,
+        fixed_discount=fixed,
+        valid_until=date.fromisoformat(get("valid_until")) if get("valid_until") else None,
+        is_single_use=get("is_single_use").lower() in {"1", "true", "yes"},
+        max_redemptions=int(get("max_redemptions")) if get("max_redemptions") else None,
+    )
+    if not promo.code:
+        raise BillingError("promo code must not be empty")
+    if promo.kind not in {"percent", "fixed"}:
+        raise BillingError(f"unknown kind {promo.kind!r}")
+    promo.check_terms()
+    return promo
+
+
+def parse_promo_csv(lines: Iterable[str], *, source: str = "<csv>") -> list[PromoCode]:
+    """Разбирает CSV (заголовок обязателен, нужны хотя бы code и kind); ошибки копятся и бросаются разом."""
+    reader = csv.DictReader(lines)
+    missing = {"code", "kind"} - set(reader.fieldnames or ())
+    if missing:
+        raise PromoCsvLoadError(source, [(1, f"missing columns {sorted(missing)}")])
+
+    errors: list[tuple[int, str]] = []
+    promos: list[PromoCode] = []
+    for row in reader:
+        try:
+            promos.append(_parse_row(row))
+        except (BillingError, ValueError) as e:
+            errors.append((reader.line_num, str(e)))
+    if errors:
+        raise PromoCsvLoadError(source, errors)
+    return promos
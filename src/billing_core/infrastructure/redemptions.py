@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import math
+import sys
+import threading
+from dataclasses import dataclass, field
+
+from billing_core.domain.errors import PromoNotValidError
+
+_MASK64 = (1 << 64) - 1
+
+
+@dataclass(slots=True)
+class BloomFilter:
+    """Фильтр Блума на bytearray: ложных отрицаний нет, ложные срабатывания ~error_rate.
+
+    k позиций считаются двойным хешированием из одного hash() ключа, поэтому
+    фильтр годится только внутри процесса (hash строк рандомизирован).
+    """
+
+    capacity: int
+    error_rate: float = 0.01
+    _bits: bytearray = field(init=False)
+    _m: int = field(init=False)
+    _k: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        n = max(self.capacity, 1)
+        self._m = max(64, math.ceil(-n * math.log(self.error_rate) / math.log(2) ** 2))
+        self._k = max(1, round(self._m / n * math.log(2)))
+        self._bits = bytearray((self._m + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        h = hash(key) & _MASK64
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        m = self._m
+        return [(h1 + i * h2) % m for i in range(self._k)]
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._bits)
+
+
+@dataclass(slots=True)
+class _CodeRedemptions:
+    """Код, погашенный больше одного раза: точное множество клиентов и счётчик."""
+
+    customers: set[str]
+    uses: int
+    bloom: BloomFilter | None = None  # только для кодов с числом клиентов >= bloom_threshold
+
+
+@dataclass(frozen=True, slots=True)
+class RedemptionStats:
+    lookups: int
+    bloom_negatives: int
+    codes: int
+    customers: int
+    redemptions: int
+
+
+@dataclass(slots=True)
+class RedemptionStore:
+    """Погашения промокодов в одном словаре code -> запись.
+
+    Массовые одноразовые коды гасятся по разу, поэтому запись такого кода -
+    сама строка customer_id (общая с подпиской): одна ячейка словаря на
+    погашение. Со второго погашения запись становится _CodeRedemptions
+    с точным множеством клиентов и счётчиком; когда клиентов набирается
+    bloom_threshold, перед множеством ставится фильтр Блума, и проверки
+    "клиент ещё не гасил код" отвечает он. redeem() атомарно проверяет лимит
+    и увеличивает счётчик; читатели лок не берут.
+    """
+
+    bloom_threshold: int = 1024
+    error_rate: float = 0.01
+
+    lookups: int = 0
+    bloom_negatives: int = 0
+    _codes: dict[str, str | _CodeRedemptions] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def has_redeemed(self, *, code: str, customer_id: str) -> bool:
+        entry = self._codes.get(code)
+        self.lookups += 1
+        if entry is None:
+            return False
+        if isinstance(entry, str):
+            return entry == customer_id
+        if entry.bloom is not None and customer_id not in entry.bloom:
+            self.bloom_negatives += 1
+            return False
+        return customer_id in entry.customers
+
+    def uses(self, code: str) -> int:
+        entry = self._codes.get(code)
+        if entry is None:
+            return 0
+        return 1 if isinstance(entry, str) else entry.uses
+
+    def redeem(self, *, code: str, customer_id: str, once_per_customer: bool, max_uses: int | None) -> bool:
+        """False - клиент уже погашал код (при once_per_customer); PromoNotValidError - лимит исчерпан."""
+        with self._lock:
+            entry = self._codes.get(code)
+            if entry is None:
+                if max_uses is not None and max_uses < 1:
+                    raise PromoNotValidError(code, "redemption limit reached")
+                self._codes[code] = customer_id
+                return True
+
+            if isinstance(entry, str):
+                entry = _CodeRedemptions(customers={entry}, uses=1)
+            if once_per_customer and customer_id in entry.customers:
+                return False
+            if max_uses is not None and entry.uses >= max_uses:
+                raise PromoNotValidError(code, "redemption limit reached")
+
+            entry.uses += 1
+            if customer_id not in entry.customers:
+                entry.customers.add(customer_id)
+                if entry.bloom is not None:
+                    if len(entry.customers) > entry.bloom.capacity:
+                        entry.bloom = self._bloom(entry.customers, entry.bloom.capacity * 2)
+                    else:
+                        entry.bloom.add(customer_id)
+                elif len(entry.customers) >= self.bloom_threshold:
+                    entry.bloom = self._bloom(entry.customers, self.bloom_threshold * 2)
+            # Запись подменяется целиком только после заполнения: читатели видят строку или готовый объект.
+            self._codes[code] = entry
+            return True
+
+    def _bloom(self, customers: set[str], capacity: int) -> BloomFilter:
+        bloom = BloomFilter(capacity, self.error_rate)
+        for customer_id in customers:
+            bloom.add(customer_id)
+        return bloom
+
+    def stats(self) -> RedemptionStats:
+        with self._lock:
+            entries = list(self._codes.values())
+        customers: set[str] = set()
+        redemptions = 0
+        for entry in entries:
+            if isinstance(entry, str):
+                customers.add(entry)
+                redemptions += 1
+            else:
+                customers |= entry.customers
+                redemptions += entry.uses
+        return RedemptionStats(
+            lookups=self.lookups,
+            bloom_negatives=self.bloom_negatives,
+            codes=len(entries),
+            customers=len(customers),
+            redemptions=redemptions,
+        )
+
+    def nbytes(self) -> int:
+        """Размер структур без самих строк code/customer_id (они общие с промокодами и подписками)."""
+        with self._lock:
+            total = sys.getsizeof(self._codes)
+            for entry in self._codes.values():
+                if not isinstance(entry, str):
+                    total += sys.getsizeof(entry) + sys.getsizeof(entry.customers)
+                    if entry.bloom is not None:
+                        total += entry.bloom.nbytes()
+            return total
@@ -0,0 +1,39 @@
+import threading
+from dataclasses import replace
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from billing_core.api.main import create_app
+from billing_core.api.settings import settings
+
+
+def test_profile_endpoint_is_disabled_by_default() -> None:
+    client = TestClient(create_app(replace(settings, profiler_enabled=False)))
+    assert client.get("/admin/profile", params={"seconds": 0.01}).status_code == 404
+
+
+def test_profile_attributes_samples_to_transactions() -> None:
+    app = create_app(replace(settings, profiler_enabled=True))
+    client = TestClient(app)
+    svc = app.state.service
+    stop = threading.Event()
+
+    def load() -> None:
+        i = 0
+        while not stop.is_set():
+            svc.create_subscription(customer_id=f"c{i}", plan_code="TEAM", start_date=date(2026, 1, 1), seats=3)
+            i += 1
+
+    worker = threading.Thread(target=load)
+    worker.start()
+    try:
+        collapsed = client.get("/admin/profile", params={"seconds": 0.2, "interval": 0.001}).text
+        speedscope = client.get("/admin/profile", params={"seconds": 0.05, "format": "speedscope"}).json()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert "[tx create_subscription];" in collapsed
+    assert speedscope["profiles"][0]["type"] == "sampled"
+    assert len(speedscope["profiles"][0]["samples"]) == len(speedscope["profiles"][0]["weights"])
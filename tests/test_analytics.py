@@ -0,0 +1,116 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from billing_core.api.deps import build_service  # noqa: E402
+from billing_core.api.main import create_app  # noqa: E402
+from billing_core.application.analytics import PlanRevenue, RevenueAnalytics, RevenueReport  # noqa: E402
+from billing_core.domain.money import Money  # noqa: E402
+
+
+@pytest.fixture(params=["memory", "columnar"])
+def svc(request):
+    svc = build_service(subscription_store=request.param)
+    create = svc.create_subscription
+    create(customer_id="c1", plan_code="PRO", start_date=date(2026, 1, 5))
+    create(customer_id="c2", plan_code="PRO", start_date=date(2026, 2, 10))
+    create(customer_id="c3", plan_code="TEAM", start_date=date(2026, 2, 1), seats=3)
+    create(customer_id="c4", plan_code="TEAM", start_date=date(2026, 2, 1), seats=3)
+    create(customer_id="c5", plan_code="TEAM", start_date=date(2026, 3, 1), seats=7)
+    create(customer_id="c6", plan_code="PRO", start_date=date(2026, 3, 1), trial_days=14)
+    gone, _ = create(customer_id="c7", plan_code="PRO", start_date=date(2026, 1, 20))
+    svc.cancel_subscription(sub_id=gone.id, on=date(2026, 2, 15))
+    return svc
+
+
+def test_mrr_by_plan_matches_per_subscription_prices(svc) -> None:
+    snap = svc.plans.snapshot()
+    report = RevenueAnalytics.from_columns(svc.subs.columns()).mrr(snap, as_of=date(2026, 3, 31))
+
+    pro = snap.monthly_price_for("PRO", seats=1)
+    team = snap.monthly_price_for("TEAM", seats=3) + snap.monthly_price_for("TEAM", seats=3)
+    team = team + snap.monthly_price_for("TEAM", seats=7)
+    assert [(r.plan_code, r.subscriptions, r.seats, r.mrr) for r in report.by_plan] == [
+        ("PRO", 2, 2, pro + pro),
+        ("TEAM", 3, 13, team),
+    ]
+    assert report.mrr == {"EUR": pro + pro + team}
+    assert report.arr["EUR"] == Money((pro + pro + team).amount * 12, "EUR")
+
+    early = RevenueAnalytics.from_columns(svc.subs.columns()).mrr(snap, as_of=date(2026, 1, 31))
+    assert [(r.plan_code, r.subscriptions) for r in early.by_plan] == [("PRO", 2)]  # c7 отменена позже, 15.02
+
+    on_cancel_day = RevenueAnalytics.from_columns(svc.subs.columns()).mrr(snap, as_of=date(2026, 2, 15))
+    assert [(r.plan_code, r.subscriptions) for r in on_cancel_day.by_plan] == [("PRO", 2), ("TEAM", 2)]
+
+
+def test_churn_uses_cancel_dates(svc) -> None:
+    analytics = RevenueAnalytics.from_columns(svc.subs.columns())
+
+    feb = analytics.churn(start=date(2026, 2, 1), end=date(2026, 3, 1))
+    assert (feb.active_at_start, feb.churned) == (2, 1)
+    assert feb.rate == 0.5
+    assert analytics.churn(start=date(2026, 3, 1), end=date(2026, 4, 1)).churned == 0
+
+
+def test_cohort_retention(svc) -> None:
+    cohorts = RevenueAnalytics.from_columns(svc.subs.columns()).cohorts(as_of=date(2026, 3, 15), months=3)
+
+    assert [(c.month, c.size, c.retained) for c in cohorts] == [
+        (date(2026, 1, 1), 2, (2, 1, 1)),
+        (date(2026, 2, 1), 3, (3, 3)),
+        (date(2026, 3, 1), 2, (2,)),
+    ]
+    assert cohorts[0].retention == (1.0, 0.5, 0.5)
+
+
+def test_analytics_routes() -> None:
+    client = TestClient(create_app())
+    client.post("/subscriptions", json={"customer_id": "c1", "plan_code": "PRO", "start_date": "2026-01-01"})
+
+    r = client.get("/analytics/mrr", params={"as_of": "2026-02-01"})
+    assert r.status_code == 200
+    assert r.json()["by_plan"][0]["subscriptions"] == 1
+
+    assert client.get("/analytics/churn", params={"start": "2026-01-01", "end": "2026-02-01"}).json()["churned"] == 0
+    assert len(client.get("/analytics/cohorts", params={"months": 2, "as_of": "2026-02-01"}).json()) == 2
+
+
+def test_bulk_convert_matches_scalar_conversion() -> None:
+    import numpy as np
+
+    from billing_core.application.analytics import convert_cents
+    from billing_core.application.fx import FxRates
+
+    rates = FxRates.from_rows(
+        [
+            (date(2026, 1, 1), "EUR", "USD", Decimal("1.08")),
+            (date(2026, 2, 1), "EUR", "USD", Decimal("1.11")),
+            (date(2026, 1, 1), "GBP", "EUR", Decimal("1.17")),
+        ]
+    )
+    currencies = ["EUR", "USD", "GBP"]
+    cents = np.array([1000, 1001, -333, 2500, 12345])
+    currency = np.array([0, 1, 1, 2, 1])
+    days = np.array([date(2026, d, 1).toordinal() for d in (1, 1, 2, 1, 3)])
+
+    got = convert_cents(rates, cents, currency, days, currencies=currencies, to="EUR")
+    want = [
+        rates.convert(Money(Decimal(int(c)) / 100, currencies[k]), "EUR", on=date.fromordinal(int(d))).amount * 100
+        for c, k, d in zip(cents, currency, days, strict=True)
+    ]
+    assert got.tolist() == [int(w) for w in want]
+
+    report = RevenueReport(
+        as_of=date(2026, 2, 15),
+        by_plan=(
+            PlanRevenue("PRO", "EUR", 10, 10, Money.of("100", "EUR")),
+            PlanRevenue("PRO_US", "USD", 5, 5, Money.of("55.50", "USD")),
+        ),
+    )
+    assert report.total_mrr(rates, "EUR") == Money.of("150", "EUR")
@@ -51,3 +51,30 @@ def test_create_subscription_creates_invoice_for_paid_plan() -> None:
     inv = r2.json()
     assert inv["invoice_id"] == inv_id
     assert inv["total"]["currency"] == "EUR"
+
+
+def test_as_of_header_fixes_computed_fields() -> None:
+    client = TestClient(create_app())
+    r = client.post(
+        "/subscriptions",
+        json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"},
+        headers={"X-As-Of": "2026-01-21"},
+    )
+    assert r.status_code == 200
+    sub = r.json()["subscription"]
+    assert (sub["is_active"], sub["days_left_in_period"]) == (True, 10)
+
+    r = client.get(f"/subscriptions/{sub['id']}", headers={"X-As-Of": "not-a-date"})
+    assert r.status_code == 400
+
+
+def test_as_of_header_does_not_backdate_promo_application() -> None:
+    client = TestClient(create_app())
+    client.post("/promos", json={"code": "OLD10", "kind": "percent", "percent": 10, "valid_until": "2024-12-31"})
+    sub = client.post(
+        "/subscriptions", json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": date.today().isoformat()}
+    ).json()["subscription"]
+
+    r = client.post(f"/subscriptions/{sub['id']}/apply-promo", json={"promo_code": "OLD10"}, headers={"X-As-Of": "2024-06-01"})
+    assert r.status_code == 404
+    assert r.json()["error"] == "PromoNotValidError"
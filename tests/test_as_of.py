@@ -0,0 +1,41 @@
+from datetime import date
+
+from billing_core.domain.as_of import as_of_date, evaluated_as_of
+from billing_core.domain.subscription import Subscription, computed_properties, days_left_bulk
+
+
+def _sub(start: date) -> Subscription:
+    return Subscription.create(customer_id="cust_1", plan_code="PRO", start_date=start, period_days=30)
+
+
+def test_context_fixes_date_and_nests() -> None:
+    assert as_of_date() == date.today()
+    with evaluated_as_of(date(2026, 1, 10)) as outer:
+        assert as_of_date() == outer
+        with evaluated_as_of(date(2026, 2, 1)):
+            assert as_of_date() == date(2026, 2, 1)
+        assert as_of_date() == date(2026, 1, 10)
+    assert as_of_date() == date.today()
+
+
+def test_computed_properties_read_as_of_date() -> None:
+    s = _sub(date(2026, 1, 1))
+
+    with evaluated_as_of(date(2025, 12, 31)):
+        assert (s.is_active, s.days_left_in_period) == (True, 31)
+    with evaluated_as_of(date(2026, 1, 21)):
+        assert (s.is_active, s.days_left_in_period) == (True, 10)
+    with evaluated_as_of(date(2026, 3, 1)):
+        assert s.days_left_in_period == 0
+
+
+def test_bulk_matches_properties() -> None:
+    subs = [_sub(date(2026, 1, d)) for d in (1, 10, 20, 30)]
+    subs[1].cancel()
+    day = date(2026, 1, 15)
+
+    with evaluated_as_of(day):
+        expected = [(s.is_active, s.days_left_in_period) for s in subs]
+    assert computed_properties(subs, as_of=day) == expected
+    assert expected == [(True, 16), (False, 25), (True, 35), (True, 45)]
+    assert days_left_bulk([day.toordinal() - 1, day.toordinal() + 3], as_of=day) == [0, 3]
@@ -4,6 +4,8 @@ import pytest
 
 from billing_core.application.services import BillingService
 from billing_core.domain.errors import PromoNotValidError
+from billing_core.domain.money import Money
+from billing_core.domain.periods import BillingCycle
 from billing_core.domain.plans import Plan
 from billing_core.domain.promo import PromoCode
 from billing_core.infrastructure.memory_repos import (
@@ -46,6 +48,67 @@ def test_create_paid_subscription_creates_invoice() -> None:
     assert sub.plan_code == "PRO"
 
 
+def test_calendar_month_subscription_prorates_first_partial_month() -> None:
+    svc = _service_with_default_plans()
+
+    sub, inv = svc.create_subscription(
+        customer_id="cust_1",
+        plan_code="PRO",
+        start_date=date(2026, 4, 16),
+        billing_cycle=BillingCycle.CALENDAR_MONTH,
+    )
+
+    assert inv is not None
+    assert (inv.period_start, inv.period_end) == (date(2026, 4, 16), date(2026, 5, 1))
+    assert str(inv.total) == "10.00 EUR"  # 15 из 30 дней апреля
+
+    renewal = svc.renew_subscription(sub_id=sub.id)
+    assert renewal is not None
+    assert (renewal.period_start, renewal.period_end) == (date(2026, 5, 1), date(2026, 6, 1))
+    assert str(renewal.total) == "20.00 EUR"
+
+
+def test_calendar_month_renewal_after_trial_prorates_partial_period() -> None:
+    svc = _service_with_default_plans()
+    sub, _ = svc.create_subscription(
+        customer_id="cust_1",
+        plan_code="PRO",
+        start_date=date(2026, 1, 1),
+        trial_days=14,
+        billing_cycle=BillingCycle.CALENDAR_MONTH,
+    )
+
+    renewal = svc.renew_subscription(sub_id=sub.id)
+    _, direct = svc.create_subscription(
+        customer_id="cust_2",
+        plan_code="PRO",
+        start_date=date(2026, 1, 15),
+        billing_cycle=BillingCycle.CALENDAR_MONTH,
+    )
+
+    assert renewal is not None and direct is not None
+    assert (renewal.period_start, renewal.period_end) == (direct.period_start, direct.period_end)
+    assert str(renewal.total) == str(direct.total) == "10.97 EUR"  # 17 из 31 дня января
+
+
+def test_upgrade_in_partial_first_month_prorates_over_full_cycle() -> None:
+    svc = _service_with_default_plans()
+    sub, first = svc.create_subscription(
+        customer_id="cust_1",
+        plan_code="PRO",
+        start_date=date(2026, 1, 15),
+        billing_cycle=BillingCycle.CALENDAR_MONTH,
+    )
+
+    preview = svc.preview_upgrade(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 20))
+    inv = svc.upgrade_subscription(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 20))
+
+    # Оплачено 17/31 от 20.00; за оставшиеся 12 из 31 дня: кредит 20*12/31, доплата TEAM 15*12/31.
+    assert str(first.total) == "10.97 EUR"
+    assert [str(li.amount) for li in inv] == ["-7.74 EUR", "5.81 EUR"]
+    assert str(preview.total) == str(inv.total) == "-1.93 EUR"
+
+
 def test_create_free_subscription_no_invoice() -> None:
     svc = _service_with_default_plans()
 
@@ -106,6 +169,39 @@ def test_change_seats_creates_proration_invoice() -> None:
     assert str(inv.total) == "5.00 EUR"
 
 
+def test_proration_uses_the_promo_discounted_price() -> None:
+    svc = _service_with_default_plans()
+    svc.promos.add(PromoCode(code="HALF", kind="percent", percent=50))
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+    svc.apply_promo(sub_id=sub.id, promo_code="HALF", today=date(2026, 1, 1))
+    paid = svc.renew_subscription(sub_id=sub.id)
+    change_date = paid.period_start + timedelta(days=15)
+
+    preview = svc.preview_upgrade(sub_id=sub.id, new_plan_code="TEAM", change_date=change_date)
+    inv = svc.upgrade_subscription(sub_id=sub.id, new_plan_code="TEAM", change_date=change_date)
+
+    # Оплачено 10.00 за период: кредит -5.00 (не -10.00), доплата за TEAM (15) со скидкой 3.75 (не 7.50).
+    assert str(paid.total) == "10.00 EUR"
+    assert [(li.description, str(li.amount)) for li in inv] == [
+        ("Proration credit (unused old plan)", "-10.00 EUR"),
+        ("Proration charge (remaining new plan)", "7.50 EUR"),
+        ("Promo HALF", "1.25 EUR"),
+    ]
+    assert str(inv.total) == str(preview.total) == "-1.25 EUR"
+
+
+def test_fixed_promo_reduces_proration_charge_once_per_period() -> None:
+    svc = _service_with_default_plans()
+    svc.promos.add(PromoCode(code="F3", kind="fixed", fixed_discount=Money.of("3", "EUR")))
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="TEAM", start_date=date(2026, 1, 1), seats=2)
+    svc.apply_promo(sub_id=sub.id, promo_code="F3", today=date(2026, 1, 1))
+
+    first = svc.change_seats(sub_id=sub.id, new_seats=4, change_date=date(2026, 1, 16))  # +5.00
+    second = svc.change_seats(sub_id=sub.id, new_seats=6, change_date=date(2026, 1, 16))  # +5.00
+
+    assert (str(first.total), str(second.total)) == ("2.00 EUR", "5.00 EUR")
+
+
 def test_apply_single_use_promo_marks_used() -> None:
     svc = _service_with_default_plans()
     svc.promos.add(PromoCode(code="ONCE10", kind="percent", percent=10, is_single_use=True))
@@ -120,3 +216,91 @@ def test_apply_single_use_promo_marks_used() -> None:
 
     with pytest.raises(PromoNotValidError):
         svc.apply_promo(sub_id=sub.id, promo_code="ONCE10", today=date(2026, 1, 2))
+
+
+def test_promo_redemption_limit_rejects_and_keeps_previous_code() -> None:
+    svc = _service_with_default_plans()
+    svc.promos.add(PromoCode(code="FIRST2", kind="percent", percent=10, max_redemptions=2))
+
+    subs = [svc.create_subscription(customer_id=f"cust_{i}", plan_code="PRO", start_date=date(2026, 1, 1))[0] for i in range(3)]
+    for sub in subs[:2]:
+        svc.apply_promo(sub_id=sub.id, promo_code="FIRST2", today=date(2026, 1, 2))
+
+    with pytest.raises(PromoNotValidError, match="redemption limit"):
+        svc.apply_promo(sub_id=subs[2].id, promo_code="FIRST2", today=date(2026, 1, 2))
+    assert svc.subs.get(subs[2].id).promo_code is None
+    assert svc.promos.redemptions("FIRST2") == 2
+
+
+def test_renewal_invoice_applies_subscription_promo() -> None:
+    svc = _service_with_default_plans()
+    svc.promos.add(PromoCode(code="P25", kind="percent", percent=25))
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+    svc.apply_promo(sub_id=sub.id, promo_code="P25", today=date(2026, 1, 2))
+
+    inv = svc.renew_subscription(sub_id=sub.id)
+
+    assert inv is not None
+    assert (inv.period_start, inv.period_end) == (date(2026, 1, 31), date(2026, 3, 2))
+    assert [str(li.amount) for li in inv] == ["20.00 EUR", "-5.00 EUR"]
+    assert str(inv.total) == "15.00 EUR"
+
+
+def test_batch_renewal_discounts_only_promo_subscriptions() -> None:
+    svc = _service_with_default_plans()
+    svc.promos.add(PromoCode(code="F5", kind="fixed", fixed_discount=Money.of("5", "EUR"), valid_until=date(2026, 2, 15)))
+    subs = [
+        svc.create_subscription(customer_id=f"cust_{i}", plan_code="TEAM", start_date=date(2026, 1, 1), seats=i + 1)[0]
+        for i in range(4)
+    ]
+    for sub in subs[:2]:
+        svc.apply_promo(sub_id=sub.id, promo_code="F5", today=date(2026, 1, 2))
+
+    invoices = svc.renew_subscriptions(sub_ids=[s.id for s in subs])
+    assert [str(inv.total) for inv in invoices] == ["10.00 EUR", "15.00 EUR", "25.00 EUR", "30.00 EUR"]
+
+    # Промокод истёк к началу следующего периода.
+    invoices = svc.renew_subscriptions(sub_ids=[subs[0].id])
+    assert str(invoices[0].total) == "15.00 EUR"
+
+
+def test_fixed_promo_in_other_currency_is_rejected_and_never_half_renews() -> None:
+    svc = _service_with_default_plans()
+    svc.plans.add(Plan.from_config("flat;PRO_US;Pro US;USD;25"))
+    svc.promos.add(PromoCode(code="F5", kind="fixed", fixed_discount=Money.of("5", "EUR")))
+    us, _ = svc.create_subscription(customer_id="cust_us", plan_code="PRO_US", start_date=date(2026, 1, 1))
+    eu, _ = svc.create_subscription(customer_id="cust_eu", plan_code="PRO", start_date=date(2026, 1, 1))
+
+    with pytest.raises(PromoNotValidError, match="currency"):
+        svc.apply_promo(sub_id=us.id, promo_code="F5", today=date(2026, 1, 2))
+
+    # Состояние из обхода проверки (например, до неё): продление падает, ничего не меняя.
+    us.apply_promo("F5")
+    invoices_before = len(list(svc.invoices.list()))
+    with pytest.raises(PromoNotValidError):
+        svc.renew_subscriptions(sub_ids=[eu.id, us.id])
+    assert svc.subs.get(us.id).current_period_start == date(2026, 1, 1)
+    assert svc.subs.get(eu.id).current_period_start == date(2026, 1, 1)
+    assert len(list(svc.invoices.list())) == invoices_before
+
+
+def test_upgrade_to_tiered_plan_prorates_with_tier_price() -> None:
+    svc = _service_with_default_plans()
+    svc.plans.add(Plan.from_config("tiered;GRAD;Graduated;EUR;2:10,*:5"))
+
+    sub, _ = svc.create_subscription(
+        customer_id="cust_1",
+        plan_code="TEAM",
+        start_date=date(2026, 1, 1),
+        seats=4,  # TEAM: 10 + 5*4 = 30
+    )
+
+    # GRAD seats=4: 2*10 + 2*5 = 30 -> на середине периода кредит -15, начисление +15
+    inv = svc.upgrade_subscription(
+        sub_id=sub.id,
+        new_plan_code="GRAD",
+        change_date=date(2026, 1, 1) + timedelta(days=15),
+    )
+
+    assert inv is not None
+    assert str(inv.total) == "0.00 EUR"
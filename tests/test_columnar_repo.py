@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from billing_core.api.deps import build_service
+from billing_core.domain.errors import BillingError, SubscriptionNotFoundError
+from billing_core.domain.periods import BillingCycle
+from billing_core.domain.subscription import Subscription, SubscriptionStatus
+from billing_core.infrastructure.columnar_repos import ColumnarSubscriptionRepo
+
+
+def _sub(i: int, **kwargs) -> Subscription:
+    return Subscription.create(customer_id=f"cust_{i}", plan_code="PRO", start_date=date(2026, 1, 1), **kwargs)
+
+
+def test_round_trip_preserves_all_fields() -> None:
+    repo = ColumnarSubscriptionRepo()
+    sub = _sub(1, seats=3, trial_days=7)
+    repo.save(sub)
+
+    got = repo.get(sub.id)
+    assert got is not sub
+    assert (got.id, got.created_at, got.customer_id, got.plan_code, got.status) == (
+        sub.id,
+        sub.created_at,
+        sub.customer_id,
+        sub.plan_code,
+        SubscriptionStatus.TRIALING,
+    )
+    assert (got.start_date, got.current_period_start, got.current_period_end) == (
+        sub.start_date,
+        sub.current_period_start,
+        sub.current_period_end,
+    )
+    assert (got.seats, got.promo_code) == (3, None)
+    assert (got.billing_cycle, got.anchor_day) == (sub.billing_cycle, sub.anchor_day)
+
+
+def test_round_trip_preserves_billing_cycle() -> None:
+    repo = ColumnarSubscriptionRepo()
+    sub = _sub(1, billing_cycle=BillingCycle.ANNIVERSARY)
+    repo.save(sub)
+
+    got = repo.get(sub.id)
+    got.renew()
+    assert (got.billing_cycle, got.anchor_day) == (BillingCycle.ANNIVERSARY, 1)
+    assert got.current_period_end == date(2026, 3, 1)
+
+
+def test_save_updates_existing_row() -> None:
+    repo = ColumnarSubscriptionRepo()
+    sub = _sub(1)
+    repo.save(sub)
+
+    got = repo.get(sub.id)
+    got.cancel()
+    repo.save(got)
+
+    assert len(repo) == 1
+    assert repo.get(sub.id).status == SubscriptionStatus.CANCELED
+
+
+def test_index_grows_and_keeps_all_rows() -> None:
+    repo = ColumnarSubscriptionRepo()
+    subs = [_sub(i) for i in range(500)]
+    for sub in subs:
+        repo.save(sub)
+
+    assert len(repo) == 500
+    assert all(repo.get(s.id).customer_id == s.customer_id for s in subs)
+
+
+def test_concurrent_saves_keep_rows_aligned() -> None:
+    repo = ColumnarSubscriptionRepo()
+
+    def worker(t: int) -> list[Subscription]:
+        subs = [_sub(t * 10_000 + i, seats=t + 1) for i in range(2_000)]
+        for sub in subs:
+            repo.save(sub)
+        return subs
+
+    with ThreadPoolExecutor(8) as pool:
+        subs = [sub for batch in pool.map(worker, range(8)) for sub in batch]
+
+    assert len(repo) == len(subs)
+    assert all((got := repo.get(s.id)).customer_id == s.customer_id and got.seats == s.seats for s in subs)
+
+
+def test_more_than_65535_plan_codes() -> None:
+    repo = ColumnarSubscriptionRepo()
+    subs = [Subscription.create(customer_id="c", plan_code=f"P{i}", start_date=date(2026, 1, 1)) for i in range(70_000)]
+    for sub in subs:
+        repo.save(sub)
+    assert repo.get(subs[-1].id).plan_code == "P69999"
+
+
+def test_unknown_or_malformed_id_is_not_found() -> None:
+    repo = ColumnarSubscriptionRepo()
+    repo.save(_sub(1))
+
+    with pytest.raises(SubscriptionNotFoundError):
+        repo.get("0" * 32)
+    with pytest.raises(SubscriptionNotFoundError):
+        repo.get("not-a-hex-id")
+
+
+def test_rejects_non_uuid_ids_on_save() -> None:
+    sub = Subscription.restore(
+        sub_id="sub_1",
+        created_at=_sub(1).created_at,
+        customer_id="cust_1",
+        plan_code="PRO",
+        status=SubscriptionStatus.ACTIVE,
+        start_date=date(2026, 1, 1),
+        current_period_start=date(2026, 1, 1),
+        current_period_end=date(2026, 1, 31),
+        seats=1,
+        promo_code=None,
+    )
+    with pytest.raises(BillingError):
+        ColumnarSubscriptionRepo().save(sub)
+
+
+def test_service_works_on_columnar_store() -> None:
+    svc = build_service(subscription_store="columnar")
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+    svc.change_seats(sub_id=sub.id, new_seats=5, change_date=date(2026, 1, 10))
+
+    assert svc.subs.get(sub.id).seats == 5
+    (stats,) = svc.subs.memory_usage()
+    assert stats.count == 1
@@ -0,0 +1,64 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from billing_core.application.fx import FxRates
+from billing_core.domain.errors import CurrencyMismatchError, FxRateNotFoundError
+from billing_core.domain.money import Money
+from billing_core.infrastructure.fx_loader import FxRatesLoadError, load_fx_rates
+
+
+def _rates(**kwargs) -> FxRates:
+    return FxRates.from_rows(
+        [
+            (date(2026, 3, 1), "EUR", "USD", Decimal("1.10")),
+            (date(2026, 1, 1), "EUR", "USD", Decimal("1.08")),
+            (date(2026, 1, 1), "GBP", "EUR", Decimal("1.17")),
+        ],
+        **kwargs,
+    )
+
+
+def test_rate_is_latest_quote_on_or_before_date() -> None:
+    rates = _rates()
+    assert rates.rate("EUR", "USD", on=date(2026, 1, 1)) == Decimal("1.08")
+    assert rates.rate("EUR", "USD", on=date(2026, 2, 28)) == Decimal("1.08")
+    assert rates.rate("EUR", "USD", on=date(2026, 3, 1)) == Decimal("1.10")
+    assert rates.rate("EUR", "EUR", on=date(2000, 1, 1)) == 1
+    with pytest.raises(FxRateNotFoundError):
+        rates.rate("EUR", "USD", on=date(2025, 12, 31))
+    with pytest.raises(FxRateNotFoundError):
+        rates.rate("EUR", "JPY", on=date(2026, 3, 1))
+
+
+def test_convert_is_explicit_and_keeps_money_invariant() -> None:
+    rates = _rates()
+    usd = Money.of("110", "USD")
+    eur = rates.convert(usd, "eur", on=date(2026, 3, 15))  # обратная пара: 1 / 1.10
+    assert eur == Money.of("100", "EUR")
+    assert rates.convert(Money.of("10", "GBP"), "EUR", on=date(2026, 3, 15)) == Money.of("11.70", "EUR")
+    with pytest.raises(CurrencyMismatchError):
+        usd + eur
+    total = rates.total([usd, Money.of("10", "GBP"), Money.of("1", "EUR")], "EUR", on=date(2026, 3, 15))
+    assert total == Money.of("112.70", "EUR")
+
+
+def test_recent_lookups_are_cached_with_lru_eviction() -> None:
+    rates = _rates(capacity=2)
+    for day in (date(2026, 1, 5), date(2026, 1, 5), date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 5)):
+        rates.rate("EUR", "USD", on=day)
+    assert (rates.hits, rates.misses) == (1, 4)
+
+
+def test_load_rates_from_csv(tmp_path) -> None:
+    path = tmp_path / "rates.csv"
+    path.write_text("date,base,quote,rate\n2026-01-01,eur,usd,1.08\n# праздники\n\n2026-01-05,EUR,USD,1.09\n")
+    rates = load_fx_rates(path)
+    assert len(rates) == 2
+    assert rates.rate("EUR", "USD", on=date(2026, 1, 6)) == Decimal("1.09")
+
+    path.write_text("date,base,quote,rate\n2026-13-01,EUR,USD,1\n2026-01-01,EUR,US,1\n2026-01-01,EUR,USD,-1\n")
+    with pytest.raises(FxRatesLoadError) as exc:
+        load_fx_rates(path)
+    assert [no for no, _ in exc.value.errors] == [2, 3, 4]
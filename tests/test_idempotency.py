@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.idempotency import IdempotencyCache, IdempotencyConflictError
+from billing_core.api.main import create_app
+
+
+def test_cache_replays_result_and_counts_hits() -> None:
+    cache = IdempotencyCache()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert cache.run("k", "fp", fn) == {"n": 1}
+    assert cache.run("k", "fp", fn) == {"n": 1}
+    assert len(calls) == 1
+    assert cache.hit_rate == 0.5
+
+    with pytest.raises(IdempotencyConflictError):
+        cache.run("k", "other-body", fn)
+
+
+def test_cache_is_bounded_and_expires() -> None:
+    cache = IdempotencyCache(capacity=2, ttl_seconds=0.05)
+    for k in ("a", "b", "c"):
+        cache.run(k, "", lambda k=k: k)
+    assert len(cache) == 2
+
+    time.sleep(0.06)
+    assert cache.run("c", "", lambda: "fresh") == "fresh"
+
+
+def test_failed_call_is_not_cached() -> None:
+    cache = IdempotencyCache()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.run("k", "", boom)
+    assert cache.run("k", "", lambda: "ok") == "ok"
+
+
+def test_concurrent_retries_wait_for_first_execution() -> None:
+    cache = IdempotencyCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return "done"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.run("k", "", slow)))
+    first.start()
+    started.wait(1)
+    retries = [threading.Thread(target=lambda: results.append(cache.run("k", "", slow))) for _ in range(3)]
+    for t in retries:
+        t.start()
+    release.set()
+    for t in [first, *retries]:
+        t.join(1)
+
+    assert results == ["done"] * 4
+    assert len(calls) == 1
+
+
+def test_retried_create_subscription_returns_same_subscription() -> None:
+    client = TestClient(create_app())
+    body = {"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"}
+    headers = {"Idempotency-Key": "req-1"}
+
+    r1 = client.post("/subscriptions", json=body, headers=headers)
+    r2 = client.post("/subscriptions", json=body, headers=headers)
+    assert r1.status_code == r2.status_code == 200
+    assert r1.json() == r2.json()
+
+    r3 = client.post("/subscriptions", json={**body, "plan_code": "TEAM"}, headers=headers)
+    assert r3.status_code == 409
+
+    sub_id = r1.json()["subscription"]["id"]
+    upgrade = {"new_plan_code": "TEAM", "change_date": "2026-01-16"}
+    u1 = client.post(f"/subscriptions/{sub_id}/upgrade", json=upgrade, headers={"Idempotency-Key": "up-1"})
+    u2 = client.post(f"/subscriptions/{sub_id}/upgrade", json=upgrade, headers={"Idempotency-Key": "up-1"})
+    assert u1.status_code == 200
+    assert u1.json() == u2.json()
+
+    metrics = client.get("/metrics").text
+    assert 'billing_idempotency_requests_total{result="hit"} 2' in metrics
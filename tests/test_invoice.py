@@ -10,6 +10,7 @@ from billing_core.domain.invoice import (
     LineItem,
 )
 from billing_core.domain.money import Money
+from billing_core.infrastructure.memory_repos import InMemoryInvoiceRepo
 
 
 def test_invoice_total_len_iter() -> None:
@@ -67,3 +68,18 @@ def test_invoice_issue_and_pay_transitions() -> None:
 
     with pytest.raises(InvalidStateTransitionError):
         inv.issue()
+
+
+def test_invoice_id_is_own_id_not_customer_id() -> None:
+    repo = InMemoryInvoiceRepo()
+    first, second = (
+        Invoice(customer_id="cust_1", period_start=date(2026, 1, 1), period_end=date(2026, 2, 1), currency="EUR")
+        for _ in range(2)
+    )
+    repo.save(first)
+    repo.save(second)
+
+    assert first.invoice_id == first.id != "cust_1"
+    assert first.invoice_id != second.invoice_id
+    assert repo.get(first.invoice_id) is first
+    assert len(list(repo.list())) == 2
@@ -0,0 +1,101 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.log_config import configure_logging, shutdown_logging
+from billing_core.api.main import create_app
+from billing_core.application.tx import billing_transaction
+from billing_core.domain.errors import BillingError
+
+
+@pytest.fixture()
+def log_stream():
+    stream = io.StringIO()
+    configure_logging("info", sample_every=2, stream_handler=logging.StreamHandler(stream))
+    yield stream
+    shutdown_logging()
+    pkg = logging.getLogger("billing_core")
+    pkg.setLevel(logging.NOTSET)
+    pkg.propagate = True
+
+
+def _records(stream: io.StringIO) -> list[dict]:
+    shutdown_logging()  # дождаться, пока listener допишет очередь
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_sampled_structured_begin_commit(log_stream) -> None:
+    for _ in range(4):
+        with billing_transaction("create_subscription"):
+            pass
+
+    records = _records(log_stream)
+    assert [r["event"] for r in records] == ["begin", "commit", "begin", "commit"]
+    assert all(r["use_case"] == "create_subscription" for r in records)
+    assert all(r["duration_ms"] >= 0 for r in records if r["event"] == "commit")
+
+
+def test_rollback_is_always_logged_with_traceback(log_stream) -> None:
+    for _ in range(2):
+        with pytest.raises(BillingError), billing_transaction("pay_invoice"):
+            raise BillingError("boom")
+
+    rollbacks = [r for r in _records(log_stream) if r["event"] == "rollback"]
+    assert len(rollbacks) == 2
+    assert rollbacks[0]["level"] == "error"
+    assert "BillingError: boom" in rollbacks[0]["exc_info"]
+
+
+def test_second_app_keeps_logging_after_first_shuts_down() -> None:
+    first, stream = io.StringIO(), io.StringIO()
+    h1 = configure_logging("info", stream_handler=logging.StreamHandler(first))
+    h2 = configure_logging("info", stream_handler=logging.StreamHandler(stream))
+    try:
+        shutdown_logging(h1)
+        assert h2.listener is not None
+        with billing_transaction("create_subscription"):
+            pass
+        shutdown_logging(h2)
+        assert [json.loads(line)["event"] for line in stream.getvalue().splitlines()] == ["begin", "commit"]
+        assert first.getvalue() == ""
+    finally:
+        shutdown_logging()
+        pkg = logging.getLogger("billing_core")
+        pkg.setLevel(logging.NOTSET)
+        pkg.propagate = True
+
+
+def test_sampling_rate_belongs_to_handler() -> None:
+    dense, sparse = io.StringIO(), io.StringIO()
+    h1 = configure_logging("info", sample_every=1, stream_handler=logging.StreamHandler(dense))
+    configure_logging("info", sample_every=1000, stream_handler=logging.StreamHandler(sparse))
+    pkg = logging.getLogger("billing_core")
+    pkg.addHandler(h1)  # оба обработчика активны, у каждого своя частота
+    try:
+        for _ in range(3):
+            with billing_transaction("create_subscription"):
+                pass
+        shutdown_logging()
+        assert len(dense.getvalue().splitlines()) == 6
+        assert len(sparse.getvalue().splitlines()) <= 2
+    finally:
+        shutdown_logging()
+        pkg.setLevel(logging.NOTSET)
+        pkg.propagate = True
+
+
+def test_listener_thread_starts_with_lifespan_only() -> None:
+    before = threading.active_count()
+    apps = [create_app() for _ in range(5)]
+    assert threading.active_count() == before
+    assert all(app.state.log_handler is None for app in apps)
+
+    with TestClient(apps[0]) as client:
+        handler = client.app.state.log_handler
+        assert handler is not None and handler.listener is not None
+    assert handler.listener is None
+    assert apps[0].state.log_handler is None
@@ -0,0 +1,70 @@
+import sys
+import threading
+from dataclasses import replace
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from billing_core.api.main import create_app
+from billing_core.api.settings import settings
+from billing_core.domain.subscription import Subscription
+from billing_core.infrastructure.memory_repos import InMemorySubscriptionRepo
+from billing_core.infrastructure.memory_stats import deep_sizeof
+
+
+def test_deep_sizeof_follows_slots_and_shares_seen_objects() -> None:
+    sub = Subscription.create(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+    size = deep_sizeof(sub)
+
+    assert size > sys.getsizeof(sub) + sys.getsizeof(sub.id)
+    assert deep_sizeof(sub, seen={id(sub)}) == 0
+
+
+def test_subscription_repo_memory_usage_extrapolates_from_sample() -> None:
+    repo = InMemorySubscriptionRepo()
+    for i in range(50):
+        repo.save(Subscription.create(customer_id=f"cust_{i}", plan_code="PRO", start_date=date(2026, 1, 1)))
+
+    (stats,) = repo.memory_usage(sample=10)
+    assert (stats.entity, stats.count, stats.sampled) == ("subscription", 50, 10)
+    assert stats.bytes_per_item > 200
+    assert stats.total_bytes >= stats.container_bytes + 50 * 200
+
+
+def test_memory_usage_while_saving_concurrently() -> None:
+    repo = InMemorySubscriptionRepo()
+    stop = threading.Event()
+
+    def writer() -> None:
+        i = 0
+        while not stop.is_set():
+            repo.save(Subscription.create(customer_id=f"cust_{i}", plan_code="PRO", start_date=date(2026, 1, 1)))
+            i += 1
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        for _ in range(200):
+            repo.memory_usage(sample=50)
+            repo.columns()
+    finally:
+        stop.set()
+        t.join()
+
+
+def test_debug_memory_requires_profiler_flag() -> None:
+    client = TestClient(create_app(replace(settings, profiler_enabled=False)))
+    assert client.get("/debug/memory").status_code == 404
+
+
+def test_debug_memory_reports_growth() -> None:
+    client = TestClient(create_app(replace(settings, profiler_enabled=True)))
+    first = client.get("/debug/memory").json()
+    client.post("/subscriptions", json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"})
+    second = client.get("/debug/memory").json()
+
+    counts = {e["entity"]: e["count"] for e in second["entities"]}
+    assert counts["subscription"] == 1
+    assert counts["invoice"] == 1
+    assert first["growth"] == {}
+    assert second["growth"]["subs.subscription"]["since_previous_bytes"] > 0
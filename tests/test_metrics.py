@@ -0,0 +1,73 @@
+from dataclasses import replace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.main import create_app
+from billing_core.api.settings import settings
+from billing_core.application.metrics import BillingMetrics, LatencyHistogram, TimedRepository
+from billing_core.application.tx import billing_transaction
+from billing_core.domain.errors import BillingError
+from billing_core.infrastructure.memory_repos import InMemoryInvoiceRepo
+
+
+def test_histogram_percentiles_within_bucket_precision() -> None:
+    h = LatencyHistogram()
+    for us in range(1, 10_001):
+        h.record(us)
+
+    assert h.count == 10_000
+    assert h.percentile(0.5) == pytest.approx(5_000, rel=0.04)
+    assert h.percentile(0.99) == pytest.approx(9_900, rel=0.04)
+    assert h.percentile(1.0) == 10_000
+
+
+def test_transaction_records_latency_and_errors() -> None:
+    metrics = BillingMetrics()
+    with billing_transaction("ok_case", metrics):
+        pass
+    with pytest.raises(BillingError), billing_transaction("bad_case", metrics):
+        raise BillingError("nope")
+
+    assert metrics.latency["ok_case"].count == 1
+    assert metrics.latency["bad_case"].count == 1
+    assert metrics.errors == {("bad_case", "BillingError"): 1}
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    metrics = BillingMetrics(enabled=False)
+    with billing_transaction("off_case", metrics):
+        pass
+    assert "off_case" not in metrics.latency
+
+
+def test_timed_repository_reuses_wrapper_per_method() -> None:
+    metrics = BillingMetrics()
+    repo = TimedRepository(InMemoryInvoiceRepo(), "invoices", metrics)
+
+    assert repo.list is repo.list
+    repo.list()
+    repo.list()
+    assert metrics.repo_calls[("invoices", "list")].count == 2
+
+
+def test_metrics_endpoint_exposes_use_cases_and_repo_calls() -> None:
+    client = TestClient(create_app())
+    client.post("/subscriptions", json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"})
+
+    body = client.get("/metrics").text
+    assert 'billing_use_case_duration_seconds_count{use_case="create_subscription"} 1' in body
+    assert 'billing_use_case_duration_seconds{use_case="create_subscription",quantile="0.99"}' in body
+    assert 'billing_repository_calls_total{repository="subs",method="save"} 1' in body
+
+
+def test_each_app_has_its_own_metrics_registry() -> None:
+    on = TestClient(create_app())
+    off = TestClient(create_app(replace(settings, metrics_enabled=False)))
+    on.post("/subscriptions", json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"})
+    off.post("/subscriptions", json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"})
+
+    assert on.app.state.metrics is not off.app.state.metrics
+    assert on.app.state.metrics.enabled  # второе приложение не выключило метрики первому
+    assert 'use_case="create_subscription"} 1' in on.get("/metrics").text
+    assert "create_subscription" not in off.get("/metrics").text
@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from billing_core.domain.errors import BillingError
+from billing_core.domain.periods import BillingCycle, cycle_days, month_index, month_period, period_end
+from billing_core.domain.subscription import Subscription
+
+
+def test_anniversary_clamps_to_month_end_and_recovers_anchor() -> None:
+    ends = []
+    start = date(2027, 1, 31)
+    for _ in range(4):
+        start = period_end(BillingCycle.ANNIVERSARY, start=start, anchor_day=31)
+        ends.append(start)
+
+    assert ends == [date(2027, 2, 28), date(2027, 3, 31), date(2027, 4, 30), date(2027, 5, 31)]
+
+
+def test_leap_year_february() -> None:
+    assert month_period(30, month_index(date(2028, 1, 1))) == (date(2028, 1, 30), date(2028, 2, 29))
+    assert month_period(29, month_index(date(2027, 2, 1))) == (date(2027, 2, 28), date(2027, 3, 29))
+
+
+def test_calendar_month_first_period_is_partial() -> None:
+    start = date(2026, 1, 15)
+
+    assert period_end(BillingCycle.CALENDAR_MONTH, start=start, anchor_day=1) == date(2026, 2, 1)
+    assert cycle_days(BillingCycle.CALENDAR_MONTH, start=start, anchor_day=1) == 31
+    assert period_end(BillingCycle.CALENDAR_MONTH, start=date(2026, 12, 1), anchor_day=1) == date(2027, 1, 1)
+
+
+def test_days_cycle_keeps_fixed_length() -> None:
+    assert period_end(BillingCycle.DAYS, start=date(2026, 1, 31), anchor_day=31, period_days=30) == date(2026, 3, 2)
+    with pytest.raises(BillingError):
+        period_end(BillingCycle.DAYS, start=date(2026, 1, 1), anchor_day=1, period_days=0)
+
+
+def test_invalid_anchor_rejected() -> None:
+    with pytest.raises(BillingError):
+        month_period(32, month_index(date(2026, 1, 1)))
+
+
+def test_subscription_renews_on_calendar_months_after_trial() -> None:
+    s = Subscription.create(
+        customer_id="cust_1",
+        plan_code="PRO",
+        start_date=date(2026, 1, 24),
+        trial_days=7,
+        billing_cycle=BillingCycle.ANNIVERSARY,
+    )
+    assert (s.current_period_end, s.anchor_day) == (date(2026, 1, 31), 31)
+
+    s.renew()
+    assert (s.current_period_start, s.current_period_end) == (date(2026, 1, 31), date(2026, 2, 28))
+    s.renew()
+    assert (s.current_period_start, s.current_period_end) == (date(2026, 2, 28), date(2026, 3, 31))
+    assert s.full_cycle_days == s.full_period_days == 31
@@ -0,0 +1,60 @@
+import pytest
+
+from billing_core.infrastructure.memory_repos import InMemoryPlanRepo
+from billing_core.infrastructure.plan_loader import (
+    PlanCatalogLoadError,
+    load_plan_catalog,
+    parse_plan_catalog,
+)
+
+
+def test_load_mixed_dsl_and_jsonl(tmp_path) -> None:
+    path = tmp_path / "plans.txt"
+    path.write_text(
+        "# regional plans\n"
+        "flat;PRO_US;Pro US;USD;25\n"
+        "\n"
+        '{"type": "per_seat", "code": "TEAM_US", "name": "Team US", "currency": "USD", "base": "12", "per_seat": "6"}\n'
+        "free;FREE_US;Free US;USD\n",
+        encoding="utf-8",
+    )
+    repo = InMemoryPlanRepo()
+
+    assert load_plan_catalog(path, repo) == 3
+    assert str(repo.get("PRO_US").monthly_price) == "25.00 USD"
+    assert str(repo.snapshot().monthly_price_for("TEAM_US", seats=2)) == "24.00 USD"
+    assert repo.snapshot().version == 1
+
+
+def test_parse_reports_all_errors_with_line_numbers() -> None:
+    lines = [
+        "flat;PRO;Pro;EUR;20",
+        "flat;BAD;Bad;EUR",
+        "weird;X;X;EUR",
+        '{"type": "flat", "name": "No code", "currency": "EUR", "monthly_price": "1"}',
+        "flat;PRO;Pro again;EUR;30",
+        "{not json",
+    ]
+
+    with pytest.raises(PlanCatalogLoadError) as exc_info:
+        parse_plan_catalog(lines)
+
+    assert [no for no, _ in exc_info.value.errors] == [2, 3, 4, 5, 6]
+    assert "duplicate" in exc_info.value.errors[3][1]
+
+
+def test_failed_load_leaves_repo_untouched(tmp_path) -> None:
+    path = tmp_path / "plans.txt"
+    path.write_text("flat;OK;Ok;EUR;1\nflat;BAD;Bad;EUR;abc\n", encoding="utf-8")
+    repo = InMemoryPlanRepo()
+
+    with pytest.raises(PlanCatalogLoadError):
+        load_plan_catalog(path, repo)
+    assert len(repo.snapshot()) == 0
+
+
+def test_invalid_currency_is_reported_at_its_line() -> None:
+    with pytest.raises(PlanCatalogLoadError) as exc_info:
+        parse_plan_catalog(["flat;PRO;Pro;EUR;20", "free;FREE;Free;EURO"])
+
+    assert exc_info.value.errors == [(2, "Invalid currency: 'EURO'")]
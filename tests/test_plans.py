@@ -7,9 +7,12 @@ from billing_core.domain.errors import BillingError
 from billing_core.domain.plans import (
     FlatMonthlyPlan,
     FreePlan,
+    InvalidPlanConfigError,
     PerSeatMonthlyPlan,
     Plan,
     PlanNotFoundError,
+    TieredSeatPlan,
+    VolumeSeatPlan,
 )
 
 
@@ -46,3 +49,56 @@ def test_catalog_getitem_and_not_found() -> None:
 
     with pytest.raises(PlanNotFoundError):
         _ = cat["NOPE"]
+
+
+def test_catalog_snapshot_copy_on_write() -> None:
+    cat = PlanCatalog.load_defaults()
+    before = cat.snapshot()
+
+    cat.add(Plan.from_config("flat;BIZ;Business;EUR;99"))
+    after = cat.snapshot()
+
+    assert "BIZ" not in before
+    assert len(before) == 3
+    assert after["BIZ"].code == "BIZ"
+    assert after.version == before.version + 1
+
+
+def test_catalog_snapshot_prices_match_plans() -> None:
+    snap = PlanCatalog.load_defaults().snapshot()
+
+    for plan in snap:
+        price = snap.price(plan.code)
+        assert price.requires_seats is plan.requires_seats
+        assert price.currency == plan.currency
+        for seats in (1, 2, 7):
+            assert snap.monthly_price_for(plan.code, seats=seats) == plan.monthly_price_for(seats=seats)
+
+    with pytest.raises(BillingError):
+        _ = snap.monthly_price_for("TEAM", seats=0)
+    with pytest.raises(PlanNotFoundError):
+        _ = snap.price("NOPE")
+
+
+@pytest.mark.parametrize(("seats", "expected"), [(1, "5.00"), (10, "50.00"), (11, "54.00"), (50, "210.00"), (51, "213.00")])
+def test_tiered_plan_graduated_pricing(seats: int, expected: str) -> None:
+    p = Plan.from_config("tiered;GRAD;Graduated;EUR;10:5,50:4,*:3")
+    assert isinstance(p, TieredSeatPlan)
+    assert p.requires_seats is True
+    assert p.monthly_price_for(seats=seats).amount == Decimal(expected)
+
+
+def test_volume_plan_from_json_prices_all_seats_by_tier() -> None:
+    p = Plan.from_config(
+        '{"type": "volume", "code": "VOL", "name": "Volume", "currency": "EUR",'
+        ' "tiers": [{"up_to": 10, "unit_price": "5"}, {"up_to": null, "unit_price": "3"}]}'
+    )
+    assert isinstance(p, VolumeSeatPlan)
+    assert str(p.monthly_price_for(seats=10)) == "50.00 EUR"
+    assert str(p.monthly_price_for(seats=11)) == "33.00 EUR"
+
+
+@pytest.mark.parametrize("tiers", ["10:5,5:4,*:3", "10:5,20:4", "10:-1,*:3", "10:5,*:4,20:3,*:2", "abc"])
+def test_tiered_plan_rejects_invalid_tiers(tiers: str) -> None:
+    with pytest.raises(InvalidPlanConfigError):
+        Plan.from_config(f"tiered;BAD;Bad;EUR;{tiers}")
@@ -0,0 +1,26 @@
+import threading
+import time
+
+from billing_core.infrastructure.profiling import StackSampler
+
+
+def _busy_billing_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collects_collapsed_stacks_of_busy_threads() -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_billing_work, args=(stop,))
+    worker.start()
+    try:
+        with StackSampler(interval=0.001) as sampler:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sampler.samples > 0
+    lines = sampler.collapsed().splitlines()
+    assert any("_busy_billing_work (test_profiling.py" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
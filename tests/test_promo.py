@@ -59,3 +59,34 @@ def test_invalid_percent_range_rejected() -> None:
     promo = PromoCode(code="BAD", kind="percent", percent=120)
     with pytest.raises(PromoNotValidError):
         promo.validate_for(today=date.today(), customer_id="cust_1", already_used=False)
+
+
+@pytest.mark.parametrize("percent", [0, 7, 15, 33, 100])
+def test_compiled_discount_matches_promo_apply(percent: int) -> None:
+    promo = PromoCode(code="P", kind="percent", percent=percent)
+    discount = promo.compile()
+    subtotals = [Money.of(a, "EUR") for a in ("0.01", "0.05", "19.99", "1234.57", "10")]
+
+    expected = [promo.apply(subtotal=m) for m in subtotals]
+    assert [discount.apply(m) for m in subtotals] == expected
+    assert discount.apply_many(subtotals) == expected
+
+
+def test_compiled_fixed_discount_caps_at_zero_and_checks_currency() -> None:
+    discount = PromoCode(code="F5", kind="fixed", fixed_discount=Money.of("5", "EUR")).compile()
+
+    assert discount.apply_many([Money.of("20", "EUR"), Money.of("3", "EUR")]) == [
+        Money.of("15", "EUR"),
+        Money.of("0", "EUR"),
+    ]
+    with pytest.raises(PromoNotValidError):
+        discount.apply(Money.of("20", "USD"))
+
+
+def test_compile_rejects_invalid_terms() -> None:
+    with pytest.raises(PromoNotValidError):
+        PromoCode(code="BAD", kind="percent", percent=120).compile()
+    with pytest.raises(PromoNotValidError):
+        PromoCode(code="BAD", kind="fixed").compile()
+    with pytest.raises(PromoNotValidError):
+        PromoCode(code="BAD", kind="bogus").compile()
@@ -0,0 +1,133 @@
+import csv
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.deps import build_service
+from billing_core.api.main import create_app
+from billing_core.domain.errors import BillingError
+from billing_core.domain.promo import PromoCode, PromoTemplate, generate_promo_codes
+from billing_core.infrastructure.memory_repos import InMemoryPromoRepo
+from billing_core.infrastructure.promo_csv import PromoCsvLoadError, iter_promo_csv, parse_promo_csv
+
+
+def test_generated_codes_are_unique_and_follow_template() -> None:
+    template = PromoTemplate(kind="percent", percent=10, prefix="SPRING-", alphabet="ABC", length=12)
+    codes = generate_promo_codes(template, 5_000)
+
+    assert len(set(codes)) == 5_000
+    assert all(c.startswith("SPRING-") and len(c) == 19 and set(c[7:]) <= set("ABC") for c in codes)
+
+
+def test_generation_skips_taken_codes() -> None:
+    template = PromoTemplate(kind="percent", percent=10, alphabet="AB", length=4)
+    taken = {"AAAA", "BBBB", "ABAB"}
+    codes = generate_promo_codes(template, 8, taken=lambda batch: batch & taken)
+
+    assert len(set(codes)) == 8
+    assert not taken & set(codes)
+
+
+def test_template_rejects_impossible_or_invalid_requests() -> None:
+    with pytest.raises(BillingError):
+        generate_promo_codes(PromoTemplate(kind="percent", percent=10, alphabet="AB", length=4), 9)
+    with pytest.raises(BillingError):
+        generate_promo_codes(PromoTemplate(kind="percent", percent=150), 1)
+    with pytest.raises(BillingError):
+        generate_promo_codes(PromoTemplate(kind="bogus"), 1)
+
+
+def test_service_generates_and_resolves_codes_lazily() -> None:
+    svc = build_service()
+    codes = svc.generate_promos(PromoTemplate(kind="percent", percent=20, prefix="X-"), count=1_000)
+
+    promo = svc.promos.get(codes[0])
+    assert (promo.code, promo.percent, promo.is_single_use) == (codes[0], 20, True)
+    assert svc.promos.existing_codes([codes[1], "NOPE"]) == {codes[1]}
+
+
+def test_generated_code_taken_after_the_check_is_not_overwritten() -> None:
+    repo = InMemoryPromoRepo()
+    explicit = PromoCode(code="AAAA", kind="percent", percent=5)
+    repo.add(explicit)
+    template = PromoTemplate(kind="percent", percent=20, alphabet="AB", length=4)
+
+    assert repo.add_generated(template, ["AAAA", "BBBB"]) == {"AAAA"}
+    assert repo.get("AAAA") is explicit
+    assert repo.add_generated(template, ["BBBB"]) == {"BBBB"}
+
+
+def test_service_replaces_generated_codes_that_clash_on_write() -> None:
+    class RacingRepo(InMemoryPromoRepo):
+        """Первая проверка устарела: занятые между ней и записью коды она не видит."""
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.stale = True
+
+        def existing_codes(self, codes):
+            if self.stale:
+                self.stale = False
+                return set()
+            return super().existing_codes(codes)
+
+    svc = build_service()
+    svc.promos = RacingRepo()
+    template = PromoTemplate(kind="percent", percent=20, alphabet="AB", length=4)
+    everything = {f"{i:04b}".replace("0", "A").replace("1", "B") for i in range(16)}
+    svc.promos.add_many(PromoCode(code=c, kind="percent", percent=5) for c in sorted(everything - {"BABA"}))
+
+    assert svc.generate_promos(template, count=1) == ["BABA"]
+    assert all(svc.promos.get(c).percent == 5 for c in everything - {"BABA"})
+
+
+def test_csv_round_trip_and_import_skips_duplicates() -> None:
+    template = PromoTemplate(kind="percent", percent=15, max_redemptions=3)
+    text = "".join(iter_promo_csv(template, ["A1", "A2", "A3"], chunk_size=2))
+    rows = list(csv.DictReader(text.splitlines()))
+    assert [r["code"] for r in rows] == ["A1", "A2", "A3"]
+
+    promos = parse_promo_csv(text.splitlines())
+    assert promos[0] == PromoCode(code="A1", kind="percent", percent=15, is_single_use=True, max_redemptions=3)
+
+    svc = build_service()
+    svc.promos.add(PromoCode(code="A2", kind="percent", percent=5))
+    res = svc.import_promos([*promos, promos[0]])
+    assert (res.created, res.duplicates) == (2, 2)
+    assert svc.promos.get("A2").percent == 5
+
+
+def test_parse_collects_row_errors() -> None:
+    with pytest.raises(PromoCsvLoadError) as exc_info:
+        parse_promo_csv(["code,kind,percent", "OK,percent,10", "BAD,percent,500", ",percent,1"])
+    assert [no for no, _ in exc_info.value.errors] == [3, 4]
+
+
+def test_generate_endpoint_streams_csv() -> None:
+    client = TestClient(create_app())
+    r = client.post("/promos:generate", json={"count": 100, "kind": "fixed", "fixed_amount": "5", "currency": "EUR"})
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(r.text.splitlines()))
+    assert len(rows) == 100 == int(r.headers["x-promo-count"])
+    assert rows[0]["fixed_amount"] == "5.00"
+
+    imported = client.post("/promos:import", content=r.text, headers={"Content-Type": "text/csv"})
+    assert imported.json() == {"created": 0, "duplicates": 100}
+
+
+def test_invalid_promo_terms_are_rejected_with_422() -> None:
+    client = TestClient(create_app())
+
+    r = client.post("/promos", json={"code": "HUGE", "kind": "percent", "percent": 150})
+    assert r.status_code == 422
+    assert r.json()["error"] == "InvalidPromoTermsError"
+
+    r = client.post("/promos:generate", json={"count": 10, "kind": "bogus"})
+    assert r.status_code == 422
+    assert r.json()["error"] == "InvalidPromoTermsError"
+
+    # CSV проверяется построчно при разборе: ошибки строк - 400, не 404.
+    r = client.post("/promos:import", content="code,kind,percent\nBAD,percent,101\n", headers={"Content-Type": "text/csv"})
+    assert r.status_code == 400
@@ -0,0 +1,133 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.deps import build_service
+from billing_core.api.main import create_app
+from billing_core.application.promotions import PromotionEngine
+from billing_core.domain.errors import BillingError
+from billing_core.domain.money import Money
+from billing_core.domain.promo import PromoCode
+from billing_core.domain.promotions import Promotion, months_since
+
+EUR20 = Money.of("20", "EUR")
+
+
+def _percent(code: str, percent: int, **kwargs) -> Promotion:
+    return Promotion(code=code, discount=PromoCode(code=code, kind="percent", percent=percent).compile(), **kwargs)
+
+
+def _fixed(code: str, amount: str, currency: str = "EUR", **kwargs) -> Promotion:
+    discount = PromoCode(code=code, kind="fixed", fixed_discount=Money.of(amount, currency)).compile()
+    return Promotion(code=code, discount=discount, **kwargs)
+
+
+def test_lookup_uses_plan_currency_and_date_window() -> None:
+    engine = PromotionEngine()
+    engine.add(_percent("ALL", 5))
+    engine.add(_percent("PRO_ONLY", 10, plan_codes=frozenset({"PRO"})))
+    engine.add(_percent("TEAM_ONLY", 10, plan_codes=frozenset({"TEAM"})))
+    engine.add(_percent("USD", 10, currency="USD"))
+    engine.add(_percent("SPRING", 10, starts_on=date(2026, 3, 1), ends_on=date(2026, 5, 31)))
+    for i in range(1_000):
+        engine.add(_percent(f"OTHER{i}", 1, plan_codes=frozenset({f"PLAN{i}"})))
+
+    def codes(on: date) -> list[str]:
+        return [p.code for p in engine.applicable(plan_code="PRO", currency="EUR", on=on)]
+
+    assert codes(date(2026, 1, 15)) == ["ALL", "PRO_ONLY"]
+    assert codes(date(2026, 4, 1)) == ["ALL", "PRO_ONLY", "SPRING"]
+    assert codes(date(2026, 6, 1)) == ["ALL", "PRO_ONLY"]
+
+
+def test_stacking_is_deterministic_and_exclusive_stops_chain() -> None:
+    engine = PromotionEngine()
+    engine.add(_fixed("F2", "2", priority=20))
+    engine.add(_percent("P10", 10, priority=10))
+    q = engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=date(2026, 1, 1))
+    # 20 * 0.9 = 18, затем -2
+    assert [code for code, _ in q.applied] == ["P10", "F2"]
+    assert q.total == Money.of("16", "EUR")
+
+    engine.add(_percent("VIP", 50, priority=0, exclusive=True))
+    q = engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=date(2026, 1, 1))
+    assert [code for code, _ in q.applied] == ["VIP"]
+    assert q.total == Money.of("10", "EUR")
+
+
+def test_first_months_limits_promotion_to_subscription_age() -> None:
+    engine = PromotionEngine()
+    engine.add(_percent("INTRO", 50, first_months=2))
+    start = date(2026, 1, 15)
+
+    def total(on: date) -> Money:
+        return engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=on, start_date=start).total
+
+    assert months_since(start, date(2026, 3, 14)) == 1
+    assert total(date(2026, 1, 15)) == Money.of("10", "EUR")
+    assert total(date(2026, 3, 14)) == Money.of("10", "EUR")
+    assert total(date(2026, 3, 15)) == EUR20
+
+
+def test_evaluation_cache_hits_and_is_reset_on_add() -> None:
+    engine = PromotionEngine()
+    engine.add(_percent("P10", 10))
+    for _ in range(10):
+        engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=date(2026, 1, 1))
+    assert (engine.hits, engine.misses) == (9, 1)
+
+    engine.add(_percent("P5", 5))
+    q = engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=date(2026, 1, 1))
+    assert engine.misses == 2
+    assert len(q.applied) == 2
+
+    with pytest.raises(BillingError):
+        engine.add(_percent("P5", 5))
+
+
+def test_expired_campaigns_are_not_scanned_and_days_share_cache_bucket() -> None:
+    engine = PromotionEngine()
+    for i in range(20_000):
+        start = date(2020, 1, 1) + timedelta(days=i % 1_000)
+        engine.add(_percent(f"OLD{i}", 5, starts_on=start, ends_on=start + timedelta(days=10)))
+    engine.add(_percent("NOW", 10, starts_on=date(2026, 1, 1), ends_on=date(2026, 1, 31)))
+
+    # Закончившиеся окна лежат в других узлах дерева: спуск читает только действующие.
+    t0 = time.perf_counter()
+    for _ in range(1_000):
+        assert [p.code for p in engine.applicable(plan_code="PRO", currency="EUR", on=date(2026, 1, 10))] == ["NOW"]
+    assert time.perf_counter() - t0 < 0.5
+    for day in (date(2020, 1, 1), date(2020, 1, 5), date(2021, 6, 1), date(2022, 9, 30)):
+        want = sorted(f"OLD{i}" for i in range(20_000) if 0 <= (day - date(2020, 1, 1)).days - i % 1_000 <= 10)
+        assert sorted(p.code for p in engine.applicable(plan_code="PRO", currency="EUR", on=day)) == want
+
+    for day in range(1, 32):
+        engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=date(2026, 1, day))
+    assert engine.misses == 1
+    engine.evaluate(plan_code="PRO", seats=1, subtotal=EUR20, on=date(2026, 2, 1))
+    assert engine.misses == 2
+
+
+def test_service_invoices_include_promotion_lines() -> None:
+    svc = build_service()
+    svc.promotions.add(_percent("INTRO", 50, plan_codes=frozenset({"PRO"}), first_months=1))
+    sub, inv = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+
+    assert [str(li.amount) for li in inv] == ["20.00 EUR", "-10.00 EUR"]
+    # 30-дневные периоды: продление 31 января ещё в первом месяце подписки.
+    assert str(svc.renew_subscription(sub_id=sub.id).total) == "10.00 EUR"
+    assert str(svc.renew_subscription(sub_id=sub.id).total) == "20.00 EUR"
+
+
+def test_quote_endpoint() -> None:
+    client = TestClient(create_app())
+    r = client.post("/promotions", json={"code": "TEAM10", "kind": "percent", "percent": 10, "plan_codes": ["TEAM"]})
+    assert r.status_code == 200
+
+    r = client.get("/promotions/quote", params={"plan_code": "TEAM", "seats": 3, "on": "2026-01-01"})
+    body = r.json()
+    assert body["subtotal"]["amount"] == "25.00"
+    assert body["total"]["amount"] == "22.50"
+    assert [a["code"] for a in body["applied"]] == ["TEAM10"]
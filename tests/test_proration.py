@@ -5,7 +5,7 @@ import pytest
 
 from billing_core.domain.errors import BillingError, CurrencyMismatchError
 from billing_core.domain.money import Money
-from billing_core.domain.proration import proration_line_items
+from billing_core.domain.proration import proration_fraction, proration_line_items
 
 
 def _d(d: str) -> Decimal:
@@ -133,3 +133,40 @@ def test_proration_rejects_currency_mismatch() -> None:
             period_end=end,
             change_date=change,
         )
+
+
+def test_fraction_table_matches_exact_division() -> None:
+    for full in (*range(1, 32), 365, 366, 45, 400):
+        for remaining in range(1, full + 1):
+            assert proration_fraction(remaining, full) == Decimal(remaining) / Decimal(full)
+
+
+@pytest.mark.parametrize("amount", ["0.01", "9.99", "20", "33.33", "1234.56"])
+def test_cached_proration_rounds_like_exact_computation(amount: str) -> None:
+    start = date(2026, 1, 1)
+    monthly = Money.of(amount, "EUR")
+    for full in (28, 29, 30, 31, 45):
+        end = start + timedelta(days=full)
+        for offset in range(full):
+            items = proration_line_items(
+                old_monthly=monthly,
+                new_monthly=monthly,
+                period_start=start,
+                period_end=end,
+                change_date=start + timedelta(days=offset),
+            )
+            remaining = full - offset
+            expected = Money.round(monthly.amount * (Decimal(remaining) / Decimal(full)))
+            assert [li.amount.amount for li in items] == ([-expected, expected] if expected else [])
+
+
+def test_full_days_overrides_period_length_for_partial_first_month() -> None:
+    items = proration_line_items(
+        old_monthly=Money.of("20", "EUR"),
+        new_monthly=Money.of("15", "EUR"),
+        period_start=date(2026, 1, 15),
+        period_end=date(2026, 2, 1),
+        change_date=date(2026, 1, 20),
+        full_days=31,
+    )
+    assert [str(li.amount) for li in items] == ["-7.74 EUR", "5.81 EUR"]
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.deps import build_service
+from billing_core.api.main import create_app
+from billing_core.domain.errors import InvalidStateTransitionError
+from billing_core.domain.plans import Plan
+
+
+def test_preview_upgrade_has_no_side_effects_and_matches_real_upgrade() -> None:
+    svc = build_service()
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1), seats=2)
+
+    quote = svc.preview_upgrade(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 16))
+    assert svc.subs.get(sub.id).plan_code == "PRO"
+
+    inv = svc.upgrade_subscription(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 16))
+    assert list(inv) == list(quote.items)
+    assert inv.total == quote.total
+
+
+def test_repeated_previews_hit_cache() -> None:
+    svc = build_service()
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="TEAM", start_date=date(2026, 1, 1))
+
+    for seats in (2, 3, 2, 3, 2):
+        svc.preview_seat_change(sub_id=sub.id, new_seats=seats, change_date=date(2026, 1, 10))
+    assert (svc.quotes.hits, svc.quotes.misses) == (3, 2)
+    assert svc.subs.get(sub.id).seats == 1
+
+
+def test_catalog_change_invalidates_cached_quotes() -> None:
+    svc = build_service()
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+    before = svc.preview_upgrade(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 1))
+
+    svc.plans.add(Plan.from_config("per_seat;TEAM;Team;EUR;40;5"))
+    after = svc.preview_upgrade(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 1))
+    assert after.new_monthly.amount > before.new_monthly.amount
+
+
+def test_preview_rejects_canceled_subscription() -> None:
+    svc = build_service()
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+    svc.cancel_subscription(sub_id=sub.id)
+
+    with pytest.raises(InvalidStateTransitionError):
+        svc.preview_upgrade(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 2))
+
+
+def test_preview_endpoints() -> None:
+    client = TestClient(create_app())
+    sub = client.post("/subscriptions", json={"customer_id": "cust_1", "plan_code": "TEAM", "start_date": "2026-01-01"}).json()[
+        "subscription"
+    ]
+
+    params = {"new_seats": 3, "change_date": "2026-01-16"}
+    first = client.get(f"/subscriptions/{sub['id']}/change-seats/preview", params=params).json()
+    second = client.get(f"/subscriptions/{sub['id']}/change-seats/preview", params=params).json()
+    assert first["total"] == {"amount": "5.00", "currency": "EUR"}
+    assert second["cache_hit_rate"] == 0.5
+
+    r = client.get(f"/subscriptions/{sub['id']}/upgrade/preview", params={"new_plan_code": "PRO", "change_date": "2026-01-16"})
+    assert r.status_code == 200
+    assert client.get(f"/subscriptions/{sub['id']}").json()["seats"] == 1
@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.deps import build_service
+from billing_core.api.main import create_app
+from billing_core.application.receivables import ReceivablesLedger
+from billing_core.domain.errors import BillingError
+from billing_core.domain.invoice import Invoice, LineItem
+from billing_core.domain.money import Money
+
+AS_OF = date(2026, 6, 30)
+
+
+def _invoice(customer_id: str, amount: str, issued_days_ago: int, currency: str = "EUR") -> Invoice:
+    inv = Invoice(customer_id=customer_id, period_start=date(2026, 1, 1), period_end=date(2026, 2, 1), currency=currency)
+    inv.add_line_item(LineItem("charge", Money.of(amount, currency)))
+    inv.issue(on=AS_OF - timedelta(days=issued_days_ago))
+    return inv
+
+
+def test_aging_buckets_by_customer_and_currency() -> None:
+    ledger = ReceivablesLedger()
+    for inv in [
+        _invoice("c1", "10", 0),
+        _invoice("c1", "5", 30),
+        _invoice("c1", "20", 31),
+        _invoice("c1", "40", 90),
+        _invoice("c1", "80", 91),
+        _invoice("c2", "7", 400),
+        _invoice("c2", "3", 1, currency="USD"),
+    ]:
+        ledger.add(inv)
+
+    rows = {(r.customer_id, r.currency): r for r in ledger.aging(as_of=AS_OF)}
+    assert [str(m) for m in rows[("c1", "EUR")].buckets] == ["15.00 EUR", "20.00 EUR", "40.00 EUR", "80.00 EUR"]
+    assert str(rows[("c1", "EUR")].total) == "155.00 EUR"
+    assert [m.amount for m in rows[("c2", "EUR")].buckets][-1] == Money.of("7", "EUR").amount
+    assert str(rows[("c2", "USD")].buckets[0]) == "3.00 USD"
+
+
+def test_paid_invoices_leave_the_ledger() -> None:
+    ledger = ReceivablesLedger()
+    old, new = _invoice("c1", "10", 100), _invoice("c1", "10", 5)
+    ledger.add(old)
+    ledger.add(new)
+
+    assert ledger.remove(old.invoice_id) is True
+    assert ledger.remove(old.invoice_id) is False
+    assert [e.invoice_id for e in ledger.open_invoices()] == [new.invoice_id]
+
+    with pytest.raises(BillingError):
+        ledger.add(Invoice(customer_id="c1", period_start=AS_OF, period_end=AS_OF + timedelta(days=1), currency="EUR"))
+
+
+def test_service_tracks_issue_and_pay() -> None:
+    svc = build_service()
+    _, a = svc.create_subscription(customer_id="c1", plan_code="PRO", start_date=date(2026, 1, 1))
+    _, b = svc.create_subscription(customer_id="c1", plan_code="PRO", start_date=date(2026, 2, 1))
+    svc.issue_invoice(invoice_id=a.invoice_id, on=date(2026, 1, 1))
+    svc.issue_invoice(invoice_id=b.invoice_id, on=date(2026, 2, 1))
+    svc.pay_invoice(invoice_id=b.invoice_id)
+
+    (row,) = svc.receivables.aging(as_of=date(2026, 3, 15))
+    assert [bool(m) for m in row.buckets] == [False, False, True, False]
+
+
+def test_aging_csv_route() -> None:
+    client = TestClient(create_app())
+    inv_id = client.post("/subscriptions", json={"customer_id": "c1", "plan_code": "PRO", "start_date": "2026-01-01"}).json()[
+        "invoice_id"
+    ]
+    # X-As-Of не переносит дату выставления: отсчёт aging идёт от сегодняшнего дня.
+    client.post(f"/invoices/{inv_id}/issue", headers={"X-As-Of": "2026-01-01"})
+    today = date.today()
+
+    r = client.get("/receivables/aging.csv", params={"as_of": (today + timedelta(days=10)).isoformat()})
+    assert r.status_code == 200
+    header, row = r.text.splitlines()
+    assert header == "customer_id,currency,0-30,31-60,61-90,90+,total"
+    assert row.startswith("c1,EUR,20.00,0.00,")
+    later = client.get("/receivables/aging", params={"as_of": (today + timedelta(days=100)).isoformat()}).json()
+    assert later[0]["buckets"]["90+"]["amount"] != "0.00"
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from billing_core.domain.errors import PromoNotValidError
+from billing_core.infrastructure.redemptions import BloomFilter, RedemptionStore
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives() -> None:
+    bloom = BloomFilter(1_000, error_rate=0.01)
+    for i in range(1_000):
+        bloom.add(f"cust_{i}")
+
+    assert all(f"cust_{i}" in bloom for i in range(1_000))
+    false_positives = sum(f"other_{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_single_use_redemption_and_bloom_fast_path() -> None:
+    store = RedemptionStore(bloom_threshold=16)
+    for i in range(100):
+        assert store.redeem(code="ONCE", customer_id=f"cust_{i}", once_per_customer=True, max_uses=None)
+
+    assert not store.redeem(code="ONCE", customer_id="cust_7", once_per_customer=True, max_uses=None)
+    assert all(store.has_redeemed(code="ONCE", customer_id=f"cust_{i}") for i in range(100))
+    assert not store.has_redeemed(code="ONCE", customer_id="new_customer")
+    assert not store.has_redeemed(code="OTHER", customer_id="cust_1")
+
+    stats = store.stats()
+    assert (stats.codes, stats.customers, stats.redemptions) == (1, 100, 100)
+    assert stats.bloom_negatives >= 1
+
+
+def test_multi_use_code_counts_every_redemption() -> None:
+    store = RedemptionStore()
+    for _ in range(3):
+        assert store.redeem(code="MULTI", customer_id="cust_1", once_per_customer=False, max_uses=None)
+    assert store.uses("MULTI") == 3
+
+
+def test_redemption_limit_is_atomic_under_contention() -> None:
+    store = RedemptionStore()
+    granted: list[str] = []
+    rejected: list[str] = []
+
+    def worker(n: int) -> None:
+        for i in range(50):
+            cid = f"cust_{n}_{i}"
+            try:
+                store.redeem(code="LIMITED", customer_id=cid, once_per_customer=True, max_uses=100)
+                granted.append(cid)
+            except PromoNotValidError:
+                rejected.append(cid)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(granted) == 100
+    assert len(rejected) == 300
+    assert store.uses("LIMITED") == 100
+    with pytest.raises(PromoNotValidError):
+        store.redeem(code="LIMITED", customer_id="late", once_per_customer=False, max_uses=100)
+
+
+def test_single_redemption_per_code_is_stored_as_the_customer_id() -> None:
+    store = RedemptionStore()
+    for i in range(1_000):
+        assert store.redeem(code=f"MASS{i}", customer_id=f"cust_{i}", once_per_customer=True, max_uses=1)
+
+    assert store.has_redeemed(code="MASS5", customer_id="cust_5")
+    assert not store.has_redeemed(code="MASS5", customer_id="cust_6")
+    assert not store.redeem(code="MASS5", customer_id="cust_5", once_per_customer=True, max_uses=1)
+    with pytest.raises(PromoNotValidError):
+        store.redeem(code="MASS5", customer_id="cust_6", once_per_customer=True, max_uses=1)
+    assert store.uses("MASS5") == 1
+    assert store.stats().redemptions == 1_000
@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from billing_core.api.deps import build_service  # noqa: E402
+from billing_core.application.revrec import Granularity, RecognitionSchedule, recognize  # noqa: E402
+from billing_core.domain.invoice import Invoice, LineItem  # noqa: E402
+from billing_core.domain.money import Money  # noqa: E402
+
+
+def _paid(amount: str, start: date, end: date, *items: LineItem) -> Invoice:
+    inv = Invoice(customer_id="c1", period_start=start, period_end=end, currency="EUR")
+    inv.add_line_item(LineItem("charge", Money.of(amount, "EUR")))
+    for li in items:
+        inv.add_line_item(li)
+    inv.issue(on=start)
+    inv.pay()
+    return inv
+
+
+def _by_period(schedule: RecognitionSchedule) -> dict[date, str]:
+    return {day: str(m.amount) for (day, _), m in sorted(schedule.totals().items())}
+
+
+def test_monthly_split_is_proportional_and_exact() -> None:
+    inv = _paid("100", date(2026, 1, 16), date(2026, 2, 15))  # 16 дней января + 14 февраля
+
+    schedule = recognize([inv], Granularity.MONTHLY)
+
+    assert _by_period(schedule) == {date(2026, 1, 1): "53.33", date(2026, 2, 1): "46.67"}
+    assert int(schedule.cents.sum()) == 10_000
+
+
+def test_daily_split_sums_to_line_amount() -> None:
+    inv = _paid("10", date(2026, 3, 1), date(2026, 3, 4))
+
+    schedule = recognize([inv], Granularity.DAILY)
+
+    assert list(_by_period(schedule).values()) == ["3.33", "3.33", "3.34"]
+
+
+def test_proration_lines_use_their_own_service_period() -> None:
+    svc = build_service()
+    sub, first = svc.create_subscription(customer_id="c1", plan_code="PRO", start_date=date(2026, 1, 1))
+    upgrade = svc.upgrade_subscription(sub_id=sub.id, new_plan_code="TEAM", change_date=date(2026, 1, 21))
+    draft, _ = svc.create_subscription(customer_id="c2", plan_code="PRO", start_date=date(2026, 1, 1))
+    for inv in (first, upgrade):
+        svc.issue_invoice(invoice_id=inv.invoice_id, on=date(2026, 1, 1))
+        svc.pay_invoice(invoice_id=inv.invoice_id)
+
+    schedule = recognize(svc.invoices.list(), Granularity.DAILY)
+
+    totals = schedule.totals()
+    assert len(schedule.invoice_ids) == 2  # неоплаченный инвойс c2 не попадает
+    jan_10, jan_25 = totals[(date(2026, 1, 10), "EUR")], totals[(date(2026, 1, 25), "EUR")]
+    assert jan_25.amount - jan_10.amount == (upgrade.total.amount / 10).quantize(jan_10.amount)
+    assert sum(m.amount for m in totals.values()) == first.total.amount + upgrade.total.amount
+
+
+def test_schedule_round_trips_through_columnar_file(tmp_path) -> None:
+    schedule = recognize([_paid("100", date(2026, 1, 16), date(2026, 2, 15))])
+    path = tmp_path / "revrec.npz"
+    schedule.write(path)
+
+    loaded = RecognitionSchedule.read(path)
+    assert loaded.granularity is Granularity.MONTHLY
+    assert loaded.totals() == schedule.totals()
+    assert loaded.customers.tolist() == [b"c1"]
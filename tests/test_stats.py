@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.deps import build_service
+from billing_core.api.main import create_app
+from billing_core.application.stats import Contribution
+from billing_core.domain.money import Money
+
+
+@pytest.fixture(params=["memory", "columnar"])
+def svc(request):
+    return build_service(subscription_store=request.param)
+
+
+def _by_plan(svc) -> dict[str, tuple[int, int, int, Money]]:
+    return {r.plan_code: (r.active, r.trialing, r.seats, r.mrr) for r in svc.stats.snapshot()}
+
+
+def test_mutations_keep_aggregates_in_sync_with_full_recompute(svc) -> None:
+    snap = svc.plans.snapshot()
+    start = date(2026, 1, 1)
+    a, _ = svc.create_subscription(customer_id="c1", plan_code="PRO", start_date=start)
+    b, _ = svc.create_subscription(customer_id="c2", plan_code="TEAM", start_date=start, seats=3)
+    t, _ = svc.create_subscription(customer_id="c3", plan_code="PRO", start_date=start, trial_days=7)
+    assert _by_plan(svc)["PRO"] == (1, 1, 1, snap.monthly_price_for("PRO", seats=1))
+
+    svc.upgrade_subscription(sub_id=a.id, new_plan_code="TEAM", change_date=date(2026, 1, 10))
+    svc.change_seats(sub_id=b.id, new_seats=5, change_date=date(2026, 1, 10))
+    svc.renew_subscription(sub_id=t.id)
+    svc.cancel_subscription(sub_id=b.id)
+
+    team = snap.monthly_price_for("TEAM", seats=1)
+    pro = snap.monthly_price_for("PRO", seats=1)
+    assert _by_plan(svc) == {"PRO": (1, 0, 1, pro), "TEAM": (1, 0, 1, team)}
+    assert svc.stats.mrr() == {"EUR": pro + team}
+    assert svc.reconcile_stats().ok
+
+
+def test_reconcile_reports_and_fixes_drift(svc) -> None:
+    svc.create_subscription(customer_id="c1", plan_code="PRO", start_date=date(2026, 1, 1))
+    svc.stats.move(None, Contribution("PRO", 2, Money.of("5", "EUR")))
+
+    report = svc.reconcile_stats()
+    assert not report.ok and not report.fixed
+    got, want = report.mismatches[("PRO", "EUR")]
+    assert (got.active, want.active) == (2, 1)
+
+    assert svc.reconcile_stats(fix=True).fixed
+    assert svc.reconcile_stats().ok
+
+
+def test_stats_routes() -> None:
+    client = TestClient(create_app())
+    client.post("/subscriptions", json={"customer_id": "c1", "plan_code": "TEAM", "start_date": "2026-01-01", "seats": 4})
+
+    body = client.get("/stats").json()
+    assert [(r["plan_code"], r["active"], r["seats"]) for r in body["by_plan"]] == [("TEAM", 1, 4)]
+    assert client.post("/stats/reconcile").json()["ok"] is True
@@ -2,6 +2,7 @@ from datetime import date, timedelta
 
 import pytest
 
+from billing_core.domain.as_of import evaluated_as_of
 from billing_core.domain.errors import BillingError, InvalidStateTransitionError
 from billing_core.domain.subscription import Subscription, SubscriptionStatus
 
@@ -96,3 +97,24 @@ def test_mixins_generate_id_and_created_at() -> None:
     s = Subscription.create(customer_id="cust_1", plan_code="PRO", start_date=date.today())
     assert isinstance(s.id, str) and len(s.id) > 10
     assert s.created_at is not None
+
+
+def test_renew_moves_to_next_period_and_ends_trial() -> None:
+    s = Subscription.create(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1), trial_days=7)
+    s.renew(period_days=30)
+
+    assert s.status == SubscriptionStatus.ACTIVE
+    assert (s.current_period_start, s.current_period_end) == (date(2026, 1, 8), date(2026, 2, 7))
+
+    s.cancel()
+    with pytest.raises(InvalidStateTransitionError):
+        s.renew()
+
+
+def test_cancel_defaults_to_today_not_as_of_context() -> None:
+    s = Subscription.create(customer_id="cust_1", plan_code="PRO", start_date=date(2026, 1, 1))
+
+    with evaluated_as_of(date(2026, 1, 5)):
+        s.cancel()
+
+    assert s.canceled_on == date.today()
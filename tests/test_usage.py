@@ -0,0 +1,165 @@
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from billing_core.api.main import create_app
+from billing_core.application.repositories import PeriodBilling
+from billing_core.application.services import BillingService
+from billing_core.application.usage import UsageAggregator
+from billing_core.domain.errors import SubscriptionNotFoundError
+from billing_core.domain.money import Money
+from billing_core.domain.plans import InvalidPlanConfigError, MeteredPlan, Plan
+from billing_core.domain.promo import PromoCode
+from billing_core.domain.usage import UsageEvent
+from billing_core.infrastructure.memory_repos import (
+    InMemoryInvoiceRepo,
+    InMemoryPlanRepo,
+    InMemoryPromoRepo,
+    InMemorySubscriptionRepo,
+    InMemoryUsageRepo,
+)
+
+T0 = datetime(2026, 1, 5, 12, 0, tzinfo=UTC)
+
+
+def _service() -> BillingService:
+    plans = InMemoryPlanRepo()
+    plans.add(Plan.from_config("metered;API;Api;EUR;10;api_calls:0.002,gb:0.5"))
+    return BillingService(
+        plans=plans,
+        subs=InMemorySubscriptionRepo(),
+        invoices=InMemoryInvoiceRepo(),
+        promos=InMemoryPromoRepo(),
+        usage=UsageAggregator(InMemoryUsageRepo(), flush_every=2),
+    )
+
+
+def test_metered_plan_from_dsl() -> None:
+    p = Plan.from_config("metered;API;Api;EUR;10;api_calls:0.002,gb:0.5")
+    assert isinstance(p, MeteredPlan)
+    assert str(p.monthly_price) == "10.00 EUR"
+    items = p.usage_line_items({"api_calls": 2500, "gb": 3, "unknown": 7})
+    assert [str(li.amount) for li in items] == ["5.00 EUR", "1.50 EUR"]
+
+
+def test_metered_plan_rates_from_json_object_only() -> None:
+    p = Plan.from_config({"type": "metered", "code": "API", "name": "Api", "currency": "EUR", "rates": {"gb": "0.5"}})
+    assert p.usage_line_items({"gb": 4})[0].amount == Money.of("2", "EUR")
+    with pytest.raises(InvalidPlanConfigError):
+        Plan.from_config({"type": "metered", "code": "API", "name": "Api", "currency": "EUR", "rates": ["gb", "0.5"]})
+    with pytest.raises(InvalidPlanConfigError):
+        Plan.from_config("metered;API;Api;EUR;10;gb:NaN")
+
+
+def test_aggregator_deduplicates_by_idempotency_key_and_bounds_keys() -> None:
+    repo = InMemoryUsageRepo()
+    meter = UsageAggregator(repo, dedup_capacity=2)
+
+    res = meter.record(
+        [
+            UsageEvent("s1", "api_calls", 10, T0, idempotency_key="a"),
+            UsageEvent("s1", "api_calls", 10, T0, idempotency_key="a"),
+            UsageEvent("s1", "api_calls", 5, T0),
+        ]
+    )
+    assert (res.accepted, res.duplicates) == (2, 1)
+
+    meter.record([UsageEvent("s1", "api_calls", 1, T0, idempotency_key=k) for k in ("b", "c")])
+    assert meter.record([UsageEvent("s1", "api_calls", 1, T0, idempotency_key="a")]).accepted == 1
+
+    meter.flush()
+    totals = repo.totals_for(sub_id="s1", period_start=date(2026, 1, 1), period_end=date(2026, 2, 1))
+    assert totals == {"api_calls": 18}
+
+
+def test_invoice_usage_bills_current_period_only() -> None:
+    svc = _service()
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="API", start_date=date(2026, 1, 1))
+
+    svc.ingest_usage(
+        [
+            UsageEvent(sub.id, "api_calls", 1000, T0, idempotency_key="e1"),
+            UsageEvent(sub.id, "api_calls", 1500, T0 + timedelta(days=3), idempotency_key="e2"),
+            UsageEvent(sub.id, "api_calls", 9999, T0 + timedelta(days=40)),
+        ]
+    )
+
+    inv = svc.invoice_usage(sub_id=sub.id)
+    assert inv is not None
+    assert str(inv.total) == "5.00 EUR"
+    assert svc.invoice_usage(sub_id=sub.id) is None  # новое потребление не поступало
+    assert sorted(str(i.total) for i in svc.invoices.list()) == ["10.00 EUR", "5.00 EUR"]  # подписка + потребление
+
+
+def test_usage_after_invoice_is_billed_later_in_period_and_on_renewal() -> None:
+    svc = _service()
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="API", start_date=date(2026, 1, 1))
+
+    svc.ingest_usage([UsageEvent(sub.id, "api_calls", 2500, T0)])
+    first = svc.invoice_usage(sub_id=sub.id)
+    svc.ingest_usage([UsageEvent(sub.id, "api_calls", 3500, T0 + timedelta(days=1)), UsageEvent(sub.id, "gb", 2, T0)])
+    second = svc.invoice_usage(sub_id=sub.id)
+    svc.ingest_usage([UsageEvent(sub.id, "api_calls", 500, T0 + timedelta(days=2))])
+    renewal = svc.renew_subscription(sub_id=sub.id)
+
+    assert [str(li.amount) for li in first] == ["5.00 EUR"]
+    assert [str(li.amount) for li in second] == ["7.00 EUR", "1.00 EUR"]
+    assert [(li.description, str(li.amount), li.service_start) for li in renewal] == [
+        ("Subscription charge", "10.00 EUR", None),
+        ("Usage api_calls: 500 x 0.002", "1.00 EUR", date(2026, 1, 1)),
+    ]
+    assert (renewal.period_start, renewal.period_end) == (date(2026, 1, 31), date(2026, 3, 2))
+    # Закрытый период больше не хранится и не выставляется повторно.
+    assert svc.invoices.period_billing(sub_id=sub.id, period_start=date(2026, 1, 1)) == PeriodBilling()
+    assert svc.invoice_usage(sub_id=sub.id) is None
+
+
+def test_fixed_promo_is_deducted_once_per_period() -> None:
+    svc = _service()
+    svc.promos.add(PromoCode(code="F3", kind="fixed", fixed_discount=Money.of("3", "EUR")))
+    sub, _ = svc.create_subscription(customer_id="cust_1", plan_code="API", start_date=date(2026, 1, 1))
+    svc.apply_promo(sub_id=sub.id, promo_code="F3", today=date(2026, 1, 1))
+
+    renewal = svc.renew_subscription(sub_id=sub.id)
+    svc.ingest_usage([UsageEvent(sub.id, "api_calls", 1000, datetime(2026, 2, 5, tzinfo=UTC))])
+    usage = svc.invoice_usage(sub_id=sub.id)
+
+    assert str(renewal.total) == "7.00 EUR"
+    assert str(usage.total) == "2.00 EUR"
+
+
+def test_ingest_rejects_unknown_subscription() -> None:
+    svc = _service()
+    with pytest.raises(SubscriptionNotFoundError):
+        svc.ingest_usage([UsageEvent("nope", "api_calls", 1, T0)])
+
+
+def test_usage_batch_endpoint() -> None:
+    client = TestClient(create_app())
+    sub_id = client.post(
+        "/subscriptions",
+        json={"customer_id": "cust_1", "plan_code": "PRO", "start_date": "2026-01-01"},
+    ).json()["subscription"]["id"]
+
+    event = {
+        "subscription_id": sub_id,
+        "metric": "api_calls",
+        "quantity": 3,
+        "timestamp": T0.isoformat(),
+        "idempotency_key": "k1",
+    }
+    r = client.post("/usage:batch", json={"events": [event, event]})
+
+    assert r.status_code == 200
+    assert r.json() == {"accepted": 1, "duplicates": 1}
+
+
+def test_create_metered_plan_via_api() -> None:
+    client = TestClient(create_app())
+    r = client.post(
+        "/plans",
+        json={"type": "metered", "code": "API", "name": "Api", "currency": "EUR", "rates": {"api_calls": "0.002"}},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["monthly_price"] == {"amount": "0.00", "currency": "EUR"}